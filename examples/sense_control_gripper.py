@@ -2,37 +2,37 @@
 # -*- coding: utf-8 -*-
 
 """
-Pika Sense 示例代码
-演示如何使用 Pika Sense 设备的基本功能
+Pika Sense 控制 Pika Gripper 示例代码
+演示如何使用遥操作桥接(pika.teleop)将 Sense 的开合实时映射到 Gripper：
+每收到一帧 Sense 编码器数据立即向 Gripper 发送设定值，不再以固定周期轮询
 """
 
 import time
-import cv2
-import numpy as np
 from pika import sense
 # 从 pika.gripper 模块导入 Gripper 类
-from pika.gripper import Gripper 
+from pika.gripper import Gripper
+from pika.teleop import TeleopBridge, TeleopMode
 
 def main():
     # 创建 Sense 对象并连接
     print("正在连接 Pika Sense 设备...")
     my_sense = sense('/dev/ttyUSB0')  # 请根据实际情况修改串口路径,默认参数为：/dev/ttyUSB0
-    
+
     if not my_sense.connect():
         print("连接 Pika Sense 设备失败，请检查设备连接和串口路径")
         return
-    
+
     print("成功连接到 Pika Sense 设备")
-    
+
     # 创建 Gripper 对象并连接
     print("正在连接 Pika Gripper 设备...")
     # 使用 Gripper 类进行实例化
     my_gripper = Gripper("/dev/ttyUSB1")  # 请根据实际情况修改串口路径,默认参数为：/dev/ttyUSB0
-    
+
     if not my_gripper.connect():
         print("连接 Pika Gripper 设备失败，请检查设备连接和串口路径")
         return
-    
+
     print("成功连接到 Pika Gripper 设备")
 
     # 启用电机
@@ -42,36 +42,40 @@ def main():
     else:
         print("电机启用失败")
         # 如果启用失败，后续操作可能无意义，可以考虑退出或增加处理
-    
+
     # 等待电机启用
     time.sleep(1)
-    
-    while True:
-        # angle 控制方式
-        # 获取编码器数据
-        encoder_data = my_sense.get_encoder_data()
-        
-        gripper_value = my_sense.get_gripper_distance()
-        
-        print(f"sense gripper 张开距离: {gripper_value:.2f} mm")
-        
-        motor_data = my_gripper.get_motor_data()
-        print(f"电流: {motor_data['Current']} mA")
-
-        # 将sense弧度直接发送给gripper
-        my_gripper.set_motor_angle(encoder_data['rad'])
-        
-        # 等待一段时间
-        time.sleep(0.03)
-        
-        # # gripper 控制方式
-        # # 获取 sense 夹爪张开距离
-        # gripper_value = my_sense.get_gripper_distance()
-        # # 将值映射给 gripper 夹爪
-        # my_gripper.set_gripper_distance(gripper_value)
-        # # 等待一段时间
-        # time.sleep(0.03)
-    
+
+    # angle 控制方式：将 sense 弧度直接作为 gripper 电机弧度
+    # 变化不超过死区(rad)时不重复发送
+    bridge = TeleopBridge(my_sense, my_gripper, mode=TeleopMode.ANGLE, deadband=0.002)
+
+    # gripper 控制方式：按开合距离映射，可设置缩放和范围(mm)
+    # bridge = TeleopBridge(my_sense, my_gripper, mode=TeleopMode.DISTANCE, scale=1.0,
+    #                       min_value=0.0, max_value=90.0, deadband=0.1)
+
+    if not bridge.start():
+        print("启动遥操作桥接失败")
+        return
+
+    try:
+        while True:
+            # 桥接在后台运行，这里只定期打印状态
+            time.sleep(1.0)
+            stats = bridge.get_stats()
+            print(f"sense gripper 张开距离: {my_sense.get_gripper_distance():.2f} mm, "
+                  f"电流: {my_gripper.get_motor_current()} mA, "
+                  f"已发送: {stats['commands']}, 死区内: {stats['suppressed']}, "
+                  f"延迟p99: {stats['latency_ms']['p99']:.3f} ms, "
+                  f"发送抖动: {stats['interval_ms']['std']:.3f} ms")
+    except KeyboardInterrupt:
+        print("\n正在停止...")
+    finally:
+        bridge.stop()
+        my_gripper.disable()
+        my_gripper.disconnect()
+        my_sense.disconnect()
+
 
 if __name__ == "__main__":
     main()
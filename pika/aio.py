@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+asyncio异步接口模块，基于事件循环的文件描述符监听实现串口读写，无需独立的读取线程
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import serial
+from .serial_comm import SerialComm, DeliveryMode
+from .gripper import Gripper
+from .sense import Sense
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger('pika.aio')
+
+
+class AsyncSerialComm(SerialComm):
+    """
+    基于asyncio事件循环的串口通信类
+
+    通过loop.add_reader监听串口文件描述符，数据到达时在事件循环线程中完成解析和交付；
+    send_data不再阻塞等待数据发送完毕，可通过drain()等待写缓冲区清空。
+    除事件循环外的线程调用send_data时会自动转交给事件循环执行。
+
+    参数与SerialComm相同。
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop = None
+        self._loop_thread_id = None
+        self._fd = None
+        self._write_buffer = bytearray()
+        self._writer_registered = False
+        self._drain_waiters = []
+        self._update_waiters = []
+        self._streams = []
+
+    def start_reading_thread(self, callback=None):
+        """
+        在当前事件循环中注册串口读取，不创建读取线程，需在事件循环中调用
+
+        参数:
+            callback (callable): 数据回调函数，接收解析后的JSON对象
+
+        异常:
+            OSError: 串口没有可供事件循环监听的文件描述符
+        """
+        if self._loop is not None:
+            logger.warning("串口读取已经注册到事件循环")
+            return
+        fd = self._get_fileno()
+        if fd is None:
+            raise OSError(f"串口{self.port}没有可监听的文件描述符，无法使用asyncio接口")
+
+        self.callback = callback
+        self.stop_thread = False
+        self._resume_dispatcher()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._fd = fd
+        self._loop.add_reader(fd, self._on_readable)
+
+    def stop_reading_thread(self):
+        """
+        从事件循环中移除串口读写监听，并结束所有等待者和数据流
+        """
+        self.stop_thread = True
+        if self._loop is None:
+            return
+        self._remove_watchers()
+        self._close_waiters(ConnectionError("串口读取已停止"))
+        self._loop = None
+
+    def _remove_watchers(self):
+        """
+        从事件循环中移除串口文件描述符的读写监听
+        """
+        try:
+            self._loop.remove_reader(self._fd)
+            if self._writer_registered:
+                self._loop.remove_writer(self._fd)
+        except Exception:
+            pass
+        self._writer_registered = False
+
+    def _close_waiters(self, exc):
+        """
+        以异常结束所有等待者，并通知所有数据流结束
+        """
+        for waiters in (self._update_waiters, self._drain_waiters):
+            for fut in waiters:
+                if not fut.done():
+                    fut.set_exception(exc)
+            waiters.clear()
+        for queue in self._streams:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def _on_readable(self):
+        """
+        串口可读回调，在事件循环线程中执行
+        """
+        try:
+            data = self.serial.read(max(1, self.serial.in_waiting))
+        except (serial.SerialException, OSError) as e:
+            self._handle_link_lost(e)
+            return
+        if data:
+            try:
+                self._process_data(data, time.monotonic_ns())
+            except Exception as e:
+                logger.error(f"处理串口数据异常: {e}")
+
+    def _handle_link_lost(self, error):
+        """
+        读取出错时按SerialComm的方式处理链路断开（通知LOST事件），
+        开启自动重连时在事件循环中定时重新打开串口，否则停止读取
+        """
+        self._remove_watchers()
+        self._write_buffer.clear()
+        self._on_link_lost(error)
+        if self.auto_reconnect:
+            self._loop.call_later(self.RECONNECT_POLL_INTERVAL, self._retry_reconnect, self.RECONNECT_INITIAL_DELAY)
+        else:
+            self.stop_reading_thread()
+
+    def _retry_reconnect(self, delay):
+        """
+        在事件循环中尝试重新打开串口，设备节点不存在时以较短间隔等待，打开失败时按指数退避重试
+        """
+        if self._loop is None or self.stop_thread:
+            return
+        if self._try_reopen():
+            self._fd = self._get_fileno()
+            self._loop.add_reader(self._fd, self._on_readable)
+        elif not os.path.exists(self.port):
+            self._loop.call_later(self.RECONNECT_POLL_INTERVAL, self._retry_reconnect, delay)
+        else:
+            self._loop.call_later(delay, self._retry_reconnect, min(delay * 2, self.RECONNECT_MAX_DELAY))
+
+    def _deliver(self, frames):
+        """
+        交付数据帧后唤醒等待最新数据的协程，并推送给所有数据流
+        """
+        super()._deliver(frames)
+        latest = self.latest_data
+        if self._update_waiters:
+            for fut in self._update_waiters:
+                if not fut.done():
+                    fut.set_result(latest)
+            self._update_waiters.clear()
+        if self._streams:
+            delivered = frames if self.delivery_mode == DeliveryMode.EVERY_FRAME else [latest]
+            for queue in self._streams:
+                for frame in delivered:
+                    if queue.full():
+                        # 消费者过慢时丢弃最旧的帧
+                        queue.get_nowait()
+                    queue.put_nowait(frame)
+
+    async def wait_for_update(self, timeout=None):
+        """
+        等待下一帧数据
+
+        参数:
+            timeout (float): 超时时间（秒），为None时一直等待
+
+        返回:
+            dict: 最新的数据帧
+
+        异常:
+            asyncio.TimeoutError: 等待超时
+        """
+        if self._loop is None:
+            raise ConnectionError("串口读取未启动")
+        fut = self._loop.create_future()
+        self._update_waiters.append(fut)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            if fut in self._update_waiters:
+                self._update_waiters.remove(fut)
+
+    async def stream(self, maxsize=64):
+        """
+        以异步迭代器的形式逐帧获取数据，串口读取停止后迭代结束
+
+        参数:
+            maxsize (int): 缓冲帧数，消费者过慢时丢弃最旧的帧，默认为64
+
+        返回:
+            异步迭代器，每次产生一个数据帧(dict)
+        """
+        queue = asyncio.Queue(maxsize=maxsize)
+        self._streams.append(queue)
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._streams.remove(queue)
+
+    def send_data(self, data, coalesce_key=None):
+        """
+        发送数据到串口，不阻塞等待发送完成
+
+        参数:
+            data (bytes): 要发送的数据
+            coalesce_key: 未使用，与SerialComm.send_data保持一致
+
+        返回:
+            bool: 数据是否已进入发送缓冲区
+        """
+        if not self.is_connected or not self.serial or self._loop is None:
+            logger.error("串口未连接，无法发送数据")
+            return False
+        if threading.get_ident() != self._loop_thread_id:
+            self._loop.call_soon_threadsafe(self.send_data, bytes(data))
+            return True
+        self._write_buffer += data
+        self._flush_writes()
+        return True
+
+    def _flush_writes(self):
+        """
+        尽可能写出发送缓冲区中的数据，写不完时注册可写回调
+        """
+        try:
+            while self._write_buffer:
+                written = os.write(self._fd, self._write_buffer)
+                del self._write_buffer[:written]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            logger.error(f"发送数据失败: {e}")
+            self._write_buffer.clear()
+            for fut in self._drain_waiters:
+                if not fut.done():
+                    fut.set_exception(e)
+            self._drain_waiters.clear()
+
+        if self._write_buffer:
+            if not self._writer_registered:
+                self._loop.add_writer(self._fd, self._flush_writes)
+                self._writer_registered = True
+            return
+        if self._writer_registered:
+            self._loop.remove_writer(self._fd)
+            self._writer_registered = False
+        for fut in self._drain_waiters:
+            if not fut.done():
+                fut.set_result(None)
+        self._drain_waiters.clear()
+
+    async def drain(self):
+        """
+        等待发送缓冲区中的数据全部写入串口
+        """
+        if not self._write_buffer or self._loop is None:
+            return
+        fut = self._loop.create_future()
+        self._drain_waiters.append(fut)
+        await fut
+
+
+class _AsyncDevice:
+    """
+    异步设备基类，包装同步设备对象，未覆盖的属性和方法直接转发给被包装的设备
+    """
+    def __init__(self, device):
+        self.device = device
+
+    def __getattr__(self, name):
+        return getattr(self.device, name)
+
+    async def connect(self, timeout=0.5):
+        """
+        连接设备并在当前事件循环中注册串口读取
+
+        参数:
+            timeout (float): 等待首帧数据的超时时间（秒），为0时不等待，默认为0.5
+
+        返回:
+            bool: 连接是否成功
+        """
+        device = self.device
+        if device.is_connected:
+            logger.warning("设备已经连接")
+            return True
+        if not device.serial_comm.connect():
+            logger.error("连接设备失败")
+            return False
+        try:
+            device.serial_comm.start_reading_thread(callback=device._data_callback)
+        except OSError as e:
+            logger.error(f"连接设备失败: {e}")
+            device.serial_comm.disconnect()
+            return False
+        device.is_connected = True
+        logger.info(f"成功连接到设备: {device.port}")
+        if timeout:
+            try:
+                await self.wait_for_update(timeout)
+            except asyncio.TimeoutError:
+                logger.warning("等待初始数据超时")
+        return True
+
+    def stream(self, maxsize=64):
+        """
+        以异步迭代器的形式逐帧获取数据
+
+        参数:
+            maxsize (int): 缓冲帧数，消费者过慢时丢弃最旧的帧，默认为64
+        """
+        return self.device.serial_comm.stream(maxsize)
+
+    async def wait_for_update(self, timeout=None):
+        """
+        等待下一帧数据
+
+        参数:
+            timeout (float): 超时时间（秒），为None时一直等待
+
+        返回:
+            dict: 最新的数据帧
+        """
+        return await self.device.serial_comm.wait_for_update(timeout)
+
+    async def _command(self, result):
+        """
+        等待命令数据写入串口并返回命令结果
+        """
+        if result:
+            await self.device.serial_comm.drain()
+        return result
+
+    async def get_version(self):
+        """
+        查询设备版本信息，版本信息随后在数据帧中返回
+        """
+        return await self._command(self.device.get_version())
+
+
+class AsyncGripper(_AsyncDevice):
+    """
+    Pika Gripper设备的asyncio接口，命令方法均为协程，在数据写入串口后返回
+
+    参数:
+        port (str): 串口设备路径，默认为'/dev/ttyUSB0'
+        delivery_mode (str): 数据帧交付模式，默认为DeliveryMode.EVERY_FRAME
+        history_capacity (int): 遥测历史环形缓冲区容量，默认为4096
+        auto_reconnect (bool): 链路断开后是否在事件循环中自动重连，默认为False
+    """
+    def __init__(self, port='/dev/ttyUSB0', delivery_mode=DeliveryMode.EVERY_FRAME, history_capacity=4096,
+                 auto_reconnect=False):
+        comm = AsyncSerialComm(port=port, delivery_mode=delivery_mode, auto_reconnect=auto_reconnect)
+        device = Gripper(port, history_capacity=history_capacity, serial_comm=comm)
+        super().__init__(device)
+
+    async def enable(self):
+        return await self._command(self.device.enable())
+
+    async def disable(self):
+        return await self._command(self.device.disable())
+
+    async def set_zero(self):
+        return await self._command(self.device.set_zero())
+
+    async def set_motor_angle(self, rad):
+        return await self._command(self.device.set_motor_angle(rad))
+
+    async def set_motor_torque(self, current):
+        return await self._command(self.device.set_motor_torque(current))
+
+    async def set_gripper_distance(self, target_gripper_distance_mm, show_debug=False):
+        return await self._command(self.device.set_gripper_distance(target_gripper_distance_mm, show_debug))
+
+    async def set_velocity(self, velocity):
+        return await self._command(self.device.set_velocity(velocity))
+
+    async def set_effort(self, effort):
+        return await self._command(self.device.set_effort(effort))
+
+
+class AsyncSense(_AsyncDevice):
+    """
+    Pika Sense设备的asyncio接口，命令方法均为协程，在数据写入串口后返回
+
+    参数:
+        port (str): 串口设备路径，默认为'/dev/ttyUSB0'
+        delivery_mode (str): 数据帧交付模式，默认为DeliveryMode.EVERY_FRAME
+        history_capacity (int): 遥测历史环形缓冲区容量，默认为4096
+        auto_reconnect (bool): 链路断开后是否在事件循环中自动重连，默认为False
+    """
+    def __init__(self, port='/dev/ttyUSB0', delivery_mode=DeliveryMode.EVERY_FRAME, history_capacity=4096,
+                 auto_reconnect=False):
+        comm = AsyncSerialComm(port=port, delivery_mode=delivery_mode, auto_reconnect=auto_reconnect)
+        device = Sense(port, history_capacity=history_capacity, serial_comm=comm)
+        super().__init__(device)
+
+    async def light_ctrl(self, light_id):
+        return await self._command(self.device.light_ctrl(light_id))
+
+    async def vibrate_ctrl(self, mode):
+        return await self._command(self.device.vibrate_ctrl(mode))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+二进制遥测协议模块，定义与JSON帧字段相同的紧凑二进制帧格式
+
+帧格式（多字节字段均为小端序）:
+    同步字节 0xA5 0x5A | 帧类型(1字节) | 负载长度(1字节) | 负载 | CRC16(2字节)
+CRC为CRC-16/CCITT-FALSE（多项式0x1021，初值0xFFFF），覆盖帧类型、负载长度和负载。
+Gripper帧31字节、Sense帧54字节，约为对应JSON帧的六分之一，解码结果与JSON帧结构一致。
+"""
+
+import struct
+from binascii import crc_hqx
+from .metrics import RunningStats
+
+SYNC = b'\xA5\x5A'
+HEADER_SIZE = 4
+CRC_SIZE = 2
+MAX_PAYLOAD = 250
+
+# 帧类型
+class FrameType:
+    GRIPPER = 0x01  # Gripper电机数据和电机状态
+    SENSE = 0x02    # Sense命令状态、编码器和IMU数据
+    INFO = 0x7F     # 设备信息，负载为UTF-8版本字符串
+
+# Gripper负载: Speed, Current, Position, Voltage, DriverTemp, MotorTemp, Status, BusCurrent
+_GRIPPER_PAYLOAD = struct.Struct('<fiffhhBi')
+# Sense负载: Command, angle, rad, acc[3], gyr[3], pitch, roll, yaw
+_SENSE_PAYLOAD = struct.Struct('<iff3f3ffff')
+
+# 固定长度帧类型的负载长度，用于在校验CRC之前提前拒绝损坏的帧头
+PAYLOAD_SIZES = {
+    FrameType.GRIPPER: _GRIPPER_PAYLOAD.size,
+    FrameType.SENSE: _SENSE_PAYLOAD.size
+}
+
+
+def _crc(data):
+    return crc_hqx(data, 0xFFFF)
+
+
+def encode_frame(frame_type, payload):
+    """
+    将负载封装为完整的二进制帧
+
+    参数:
+        frame_type (int): 帧类型
+        payload (bytes): 负载数据，长度不超过MAX_PAYLOAD
+
+    返回:
+        bytes: 完整帧
+    """
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"负载长度超出限制: {len(payload)}")
+    body = bytes((frame_type, len(payload))) + payload
+    return SYNC + body + _crc(body).to_bytes(CRC_SIZE, 'little')
+
+
+def encode_gripper_frame(speed, current, position, voltage, driver_temp, motor_temp, status, bus_current):
+    """
+    编码Gripper遥测帧
+    """
+    return encode_frame(FrameType.GRIPPER, _GRIPPER_PAYLOAD.pack(
+        speed, int(current), position, voltage, int(driver_temp), int(motor_temp), int(status) & 0xFF,
+        int(bus_current)))
+
+
+def encode_sense_frame(command, angle, rad, acc, gyr, pitch, roll, yaw):
+    """
+    编码Sense遥测帧
+    """
+    return encode_frame(FrameType.SENSE, _SENSE_PAYLOAD.pack(
+        int(command), angle, rad, *acc, *gyr, pitch, roll, yaw))
+
+
+def encode_info_frame(version):
+    """
+    编码设备信息帧
+    """
+    return encode_frame(FrameType.INFO, version.encode('utf-8')[:MAX_PAYLOAD])
+
+
+def decode_binary_frame(frame):
+    """
+    解码二进制扫描器切分出的完整帧（已通过CRC校验）
+
+    参数:
+        frame (bytes): 完整帧
+
+    返回:
+        dict: 与JSON帧json.loads结果结构一致的数据，未知帧类型返回None
+    """
+    frame_type = frame[2]
+    if frame_type == FrameType.GRIPPER:
+        speed, current, position, voltage, driver_temp, motor_temp, status, bus_current = \
+            _GRIPPER_PAYLOAD.unpack_from(frame, HEADER_SIZE)
+        return {
+            'motor': {
+                'Speed': speed,
+                'Current': current,
+                'Position': position
+            },
+            'motorstatus': {
+                'Voltage': voltage,
+                'DriverTemp': driver_temp,
+                'MotorTemp': motor_temp,
+                'Status': "0x%02X" % status,
+                'BusCurrent': bus_current
+            }
+        }
+    if frame_type == FrameType.SENSE:
+        values = _SENSE_PAYLOAD.unpack_from(frame, HEADER_SIZE)
+        return {
+            'Command': values[0],
+            'AS5047': {
+                'angle': values[1],
+                'rad': values[2]
+            },
+            'IMU': {
+                'acc': list(values[3:6]),
+                'gyr': list(values[6:9]),
+                'pitch': values[9],
+                'roll': values[10],
+                'yaw': values[11]
+            }
+        }
+    if frame_type == FrameType.INFO:
+        return {'Version': frame[HEADER_SIZE:-CRC_SIZE].decode('utf-8', errors='ignore')}
+    return None
+
+
+def find_binary_frame(buffer):
+    """
+    在缓冲区中查找一个通过CRC校验的完整二进制帧，用于协议自动检测
+
+    返回:
+        bool: 是否找到
+    """
+    start = buffer.find(SYNC)
+    while start != -1:
+        if len(buffer) - start >= HEADER_SIZE:
+            length = buffer[start + 3]
+            end = start + HEADER_SIZE + length + CRC_SIZE
+            if end <= len(buffer) and _crc(buffer[start + 2:end - CRC_SIZE]) == \
+                    int.from_bytes(buffer[end - CRC_SIZE:end], 'little'):
+                return True
+        start = buffer.find(SYNC, start + 1)
+    return False
+
+
+class BinaryFrameScanner:
+    """
+    二进制帧扫描器，接口与JsonFrameScanner一致
+
+    按同步字节定位帧头，帧类型与负载长度不符时直接跳过，不等待整帧到达；
+    CRC校验失败时从下一个同步字节重新开始，每个字节至多被检查一次。
+
+    参数:
+        max_buffer_len (int): 与JsonFrameScanner保持一致，二进制帧长度有上限，不需要额外限制
+    """
+    def __init__(self, max_buffer_len=4096):
+        self.max_buffer_len = max_buffer_len
+        self.buffer = bytearray()
+        # 统计
+        self.bytes_per_frame = RunningStats()
+        self.frames = 0
+        self.bytes_discarded = 0
+        self.crc_errors = 0         # CRC校验失败的帧数
+        self.header_errors = 0      # 帧类型与负载长度不符、被提前拒绝的帧头数
+        self._consumed = 0
+
+    def feed(self, data):
+        """
+        向扫描器追加新读取的字节
+        """
+        self.buffer += data
+
+    def rewind(self, frame):
+        """
+        二进制帧在切分时已完成校验，无需放回；保留该接口以与JsonFrameScanner一致
+        """
+
+    def _discard(self, count):
+        del self.buffer[:count]
+        self.bytes_discarded += count
+        self._consumed += count
+
+    def next_frame(self):
+        """
+        从缓冲区中取出下一个完整且通过CRC校验的帧
+
+        返回:
+            bytes: 完整帧的原始字节，如果没有完整帧则返回None
+        """
+        buf = self.buffer
+        while True:
+            start = buf.find(SYNC)
+            if start == -1:
+                # 保留末尾可能是同步字节前半部分的一个字节
+                keep = 1 if buf and buf[-1] == SYNC[0] else 0
+                if len(buf) > keep:
+                    self._discard(len(buf) - keep)
+                return None
+            if start > 0:
+                self._discard(start)
+            if len(buf) < HEADER_SIZE:
+                return None
+            length = buf[3]
+            expected = PAYLOAD_SIZES.get(buf[2])
+            if (expected is not None and length != expected) or length > MAX_PAYLOAD:
+                self.header_errors += 1
+                self._discard(len(SYNC))
+                continue
+            end = HEADER_SIZE + length + CRC_SIZE
+            if len(buf) < end:
+                return None
+            if _crc(buf[2:end - CRC_SIZE]) != int.from_bytes(buf[end - CRC_SIZE:end], 'little'):
+                self.crc_errors += 1
+                self._discard(len(SYNC))
+                continue
+            frame = bytes(buf[:end])
+            del buf[:end]
+            self._consumed += end
+            self.bytes_per_frame.add(self._consumed)
+            self._consumed = 0
+            self.frames += 1
+            return frame
+
+    def get_stats(self):
+        """
+        获取扫描器统计信息
+
+        返回:
+            dict: 包含frames, bytes_discarded, buffered, bytes_per_frame, crc_errors, header_errors字段
+        """
+        return {
+            'frames': self.frames,
+            'bytes_discarded': self.bytes_discarded,
+            'buffered': len(self.buffer),
+            'bytes_per_frame': self.bytes_per_frame.as_dict(),
+            'crc_errors': self.crc_errors,
+            'header_errors': self.header_errors
+        }
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口原始数据录制与回放模块
+
+录制文件为紧凑的二进制格式：8字节文件头PIKACAP1，随后每次读取对应一条记录，
+记录由小端序的int64读取时间戳(time.monotonic_ns())、uint32数据长度和原始字节组成。
+"""
+
+import time
+import struct
+import logging
+import threading
+from .serial_comm import SerialComm
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.capture")
+
+CAPTURE_MAGIC = b'PIKACAP1'
+_RECORD_HEADER = struct.Struct('<qI')
+
+
+class CaptureWriter:
+    """
+    串口原始数据录制器，线程安全
+
+    参数:
+        path (str): 录制文件路径
+    """
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._file.write(CAPTURE_MAGIC)
+
+    def write(self, recv_ns, data):
+        """
+        写入一次读取的数据
+
+        参数:
+            recv_ns (int): 读取时间戳，time.monotonic_ns()
+            data (bytes): 读取到的原始数据
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD_HEADER.pack(recv_ns, len(data)))
+            self._file.write(data)
+            self.records += 1
+            self.bytes += len(data)
+
+    def close(self):
+        """
+        关闭录制文件
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_capture(path):
+    """
+    读取录制文件
+
+    参数:
+        path (str): 录制文件路径
+
+    返回:
+        list: [(recv_ns, data), ...]，按录制顺序排列
+
+    异常:
+        ValueError: 文件格式不正确
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if not content.startswith(CAPTURE_MAGIC):
+        raise ValueError(f"不是有效的串口录制文件: {path}")
+    records = []
+    offset = len(CAPTURE_MAGIC)
+    header_size = _RECORD_HEADER.size
+    while offset + header_size <= len(content):
+        recv_ns, length = _RECORD_HEADER.unpack_from(content, offset)
+        offset += header_size
+        if offset + length > len(content):
+            logger.warning("录制文件末尾记录不完整，已忽略")
+            break
+        records.append((recv_ns, content[offset:offset + length]))
+        offset += length
+    return records
+
+
+class ReplaySerialComm(SerialComm):
+    """
+    串口录制回放类，可替代SerialComm用于构建Sense和Gripper，无需硬件即可复现现场数据
+
+    回放按录制时的读取间隔将数据交给读取线程，解析和回调流程与真实串口完全相同；
+    发送的命令不会写出，而是记录在sent_data列表中。
+
+    参数:
+        path (str): 录制文件路径
+        speed (float): 回放速度倍数，1.0为实时，为0或None时尽可能快地回放，默认为1.0
+        loop (bool): 回放结束后是否从头循环，默认为False
+        其余参数与SerialComm相同
+    """
+    def __init__(self, path, speed=1.0, loop=False, **kwargs):
+        super().__init__(port=path, **kwargs)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.sent_data = []
+        self._records = []
+        self._index = 0
+        self._start_ns = None
+        self._finished = threading.Event()
+
+    def connect(self):
+        """
+        加载录制文件
+
+        返回:
+            bool: 加载是否成功
+        """
+        try:
+            self._records = read_capture(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"加载录制文件失败: {e}")
+            self.is_connected = False
+            return False
+        self._rewind()
+        self.is_connected = True
+        logger.info(f"已加载录制文件: {self.path}，共{len(self._records)}条记录")
+        return True
+
+    def disconnect(self):
+        """
+        停止回放
+        """
+        self.stop_reading_thread()
+        self.stop_writer_thread()
+        self.subscriptions.close()
+        self.stop_dispatcher()
+        self.is_connected = False
+
+    def _rewind(self):
+        """
+        回到录制文件开头
+        """
+        self._index = 0
+        self._start_ns = None
+        self._finished.clear()
+
+    def wait_finished(self, timeout=None):
+        """
+        等待回放结束
+
+        参数:
+            timeout (float): 超时时间（秒），为None时一直等待
+
+        返回:
+            bool: 回放是否已结束
+        """
+        return self._finished.wait(timeout)
+
+    def _wait_and_read(self, timeout):
+        """
+        等待下一条记录到达回放时间并返回其数据
+        """
+        if self._index >= len(self._records):
+            if self.loop and self._records:
+                self._rewind()
+            else:
+                self._finished.set()
+                time.sleep(timeout)
+                return b''
+
+        recv_ns, data = self._records[self._index]
+        if self.speed:
+            now = time.monotonic_ns()
+            if self._start_ns is None:
+                self._start_ns = now - int((recv_ns - self._records[0][0]) / self.speed)
+            due = self._start_ns + int((recv_ns - self._records[0][0]) / self.speed)
+            delay = (due - now) / 1e9
+            if delay > timeout:
+                time.sleep(timeout)
+                return b''
+            if delay > 0:
+                time.sleep(delay)
+        self._index += 1
+        return data
+
+    def read_data(self, raise_errors=False):
+        """
+        轮询模式下读取已到达回放时间的数据
+        """
+        return self._wait_and_read(0)
+
+    def _get_fileno(self):
+        return None
+
+    def _write_now(self, data):
+        """
+        记录发送的数据而不写出
+        """
+        self.sent_data.append(bytes(data))
+        return True
+
+    def send_data(self, data, coalesce_key=None):
+        """
+        记录发送的数据，回放模式下不需要真实串口
+        """
+        if not self.is_connected:
+            logger.error("回放未开始，无法发送数据")
+            return False
+        if self.writer and self.writer.is_running():
+            return self.writer.submit(bytes(data), coalesce_key)
+        return self._write_now(data)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口命令写线程模块，提供带有界队列和设定值合并的非阻塞命令发送
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from .metrics import RunningStats
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.command_writer")
+
+
+class _PendingWrite:
+    """
+    队列中等待写出的数据
+    """
+    __slots__ = ('key', 'data', 'enqueue_ns')
+
+    def __init__(self, key, data, enqueue_ns):
+        self.key = key
+        self.data = data
+        self.enqueue_ns = enqueue_ns
+
+
+class CommandWriter:
+    """
+    命令写线程
+
+    调用方线程只负责入队，由独立线程完成串口写入和flush。带有合并键(key)的数据
+    在队尾已有同键且尚未发送的数据时直接替换它（后到者生效），其余数据严格按入队顺序发送。
+
+    参数:
+        write_func (callable): 实际执行写入的函数，接收bytes并返回是否成功
+        max_queue (int): 队列最大长度，默认为64
+        put_timeout (float): 队列已满时入队的最长等待时间（秒），默认为0.1
+    """
+    def __init__(self, write_func, max_queue=64, put_timeout=0.1):
+        self.write_func = write_func
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        # 统计
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.write_latency_ms = RunningStats()  # 入队到写入完成的时间
+        self.write_time_ms = RunningStats()     # 单次写入+flush耗时
+
+    def start(self):
+        """
+        启动写线程
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="pika-command-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        停止写线程，队列中剩余的数据会在超时前尽量写出
+
+        参数:
+            timeout (float): 等待写线程退出的最长时间（秒），默认为1.0
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_running(self):
+        """
+        写线程是否在运行
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, data, key=None):
+        """
+        将数据加入发送队列
+
+        参数:
+            data (bytes): 要发送的数据
+            key: 合并键，为None时该数据不参与合并，严格保序发送
+
+        返回:
+            bool: 是否成功入队（或合并），队列持续满时返回False
+        """
+        now = time.monotonic_ns()
+        with self._cond:
+            self.submitted += 1
+            queue = self._queue
+            if key is not None and queue and queue[-1].key == key:
+                # 队尾同类设定值尚未发送，直接用新值替换
+                tail = queue[-1]
+                tail.data = data
+                tail.enqueue_ns = now
+                self.coalesced += 1
+                return True
+            if len(queue) >= self.max_queue:
+                deadline = time.monotonic() + self.put_timeout
+                while len(queue) >= self.max_queue:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._stopping:
+                        self.dropped += 1
+                        logger.warning("命令发送队列已满，丢弃命令")
+                        return False
+                    self._cond.wait(remaining)
+            queue.append(_PendingWrite(key, data, now))
+            if len(queue) > self.max_depth:
+                self.max_depth = len(queue)
+            self._cond.notify_all()
+            return True
+
+    def _run(self):
+        """
+        写线程函数
+        """
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    break
+                entry = self._queue.popleft()
+                self._cond.notify_all()
+            start = time.monotonic_ns()
+            ok = self.write_func(entry.data)
+            end = time.monotonic_ns()
+            if ok:
+                self.written += 1
+            else:
+                self.failed += 1
+            self.write_time_ms.add((end - start) / 1e6)
+            self.write_latency_ms.add((end - entry.enqueue_ns) / 1e6)
+
+    def get_stats(self):
+        """
+        获取写线程统计信息
+
+        返回:
+            dict: 包含queue_depth, max_depth, submitted, coalesced, written, failed, dropped,
+                  write_latency_ms, write_time_ms字段
+        """
+        return {
+            'queue_depth': len(self._queue),
+            'max_depth': self.max_depth,
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'write_latency_ms': self.write_latency_ms.as_dict(),
+            'write_time_ms': self.write_time_ms.as_dict()
+        }
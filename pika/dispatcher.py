@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回调分发模块，在读取线程之外执行用户回调函数
+
+读取线程只负责入队，回调由独立的分发线程（串行模式）或线程池（逐帧模式）执行，
+慢速回调不会延误串口数据的解析。待处理帧数超过高水位时触发背压信号，
+队列满时丢弃最旧的帧并计数，读取线程始终不会被阻塞。
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .metrics import RunningStats
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.dispatcher")
+
+
+class DispatchMode:
+    """
+    回调分发模式
+    """
+    SERIAL = 'serial'           # 单个分发线程，所有回调按帧顺序依次执行
+    PER_FRAME = 'per_frame'     # 每帧作为一个任务提交到线程池，不同帧的回调可并发执行
+
+
+class CallbackHandle:
+    """
+    已注册的回调函数及其耗时统计
+    """
+    def __init__(self, func, name, slow_ms):
+        self.func = func
+        self.name = name or getattr(func, '__name__', repr(func))
+        self.slow_ms = slow_ms
+        self.calls = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.time_ms = RunningStats()
+        self._lock = threading.Lock()
+
+    def __call__(self, frame):
+        start = time.monotonic_ns()
+        try:
+            self.func(frame)
+            failed = False
+        except Exception as e:
+            logger.error(f"回调函数{self.name}执行异常: {e}")
+            failed = True
+        elapsed_ms = (time.monotonic_ns() - start) / 1e6
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+            if self.slow_ms is not None and elapsed_ms > self.slow_ms:
+                self.slow_calls += 1
+            self.time_ms.add(elapsed_ms)
+
+    def get_stats(self):
+        """
+        获取回调统计信息
+
+        返回:
+            dict: 包含name, calls, errors, slow_calls, time_ms字段
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'calls': self.calls,
+                'errors': self.errors,
+                'slow_calls': self.slow_calls,
+                'time_ms': self.time_ms.as_dict()
+            }
+
+
+class CallbackDispatcher:
+    """
+    回调分发器
+
+    参数:
+        mode (str): 分发模式，DispatchMode.SERIAL或DispatchMode.PER_FRAME，默认为串行
+        max_pending (int): 最多等待执行的帧数，超出时丢弃最旧的帧，默认为256
+        workers (int): 逐帧模式下的线程池大小，默认为4
+        high_watermark (int): 触发背压信号的待处理帧数，默认为max_pending的一半
+        on_backpressure (callable): 背压状态变化时调用，参数为(active, stats)；
+                                    在读取线程或分发线程中执行，应尽量轻量
+        slow_ms (float): 单次回调耗时超过该值（毫秒）时计为慢回调，默认为None不统计
+    """
+    def __init__(self, mode=DispatchMode.SERIAL, max_pending=256, workers=4,
+                 high_watermark=None, on_backpressure=None, slow_ms=None):
+        if mode not in (DispatchMode.SERIAL, DispatchMode.PER_FRAME):
+            raise ValueError(f"不支持的回调分发模式: {mode}")
+        if max_pending <= 0:
+            raise ValueError("待处理帧数上限必须大于0")
+        self.mode = mode
+        self.max_pending = max_pending
+        self.workers = workers
+        self.high_watermark = high_watermark or max(1, max_pending // 2)
+        self.low_watermark = self.high_watermark // 2
+        self.on_backpressure = on_backpressure
+        self.slow_ms = slow_ms
+        self.backpressure = threading.Event()
+        self._pressure_lock = threading.Lock()
+        self._callbacks = ()
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._executor = None
+        self._pending = 0   # 逐帧模式下已提交未完成的帧数
+        self._stopping = False
+        # 统计
+        self.dispatched = 0
+        self.completed = 0
+        self.dropped = 0
+        self.backpressure_events = 0
+        self.max_depth = 0
+        self.queue_delay_ms = RunningStats()    # 入队到开始执行回调的时间
+
+    def add_callback(self, func, name=None):
+        """
+        注册回调函数
+
+        参数:
+            func (callable): 回调函数，接收数据帧(dict)
+            name (str): 回调名称，用于统计信息，默认为函数名
+
+        返回:
+            CallbackHandle: 回调句柄，可用于remove_callback
+        """
+        handle = CallbackHandle(func, name, self.slow_ms)
+        with self._cond:
+            self._callbacks = self._callbacks + (handle,)
+        return handle
+
+    def remove_callback(self, handle):
+        """
+        移除回调函数
+
+        参数:
+            handle (CallbackHandle): add_callback()返回的回调句柄
+        """
+        with self._cond:
+            self._callbacks = tuple(h for h in self._callbacks if h is not handle)
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def start(self):
+        """
+        启动分发线程或线程池
+        """
+        if self.is_running():
+            return
+        self._stopping = False
+        if self.mode == DispatchMode.SERIAL:
+            self._thread = threading.Thread(target=self._run, name="pika-dispatcher")
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pika-dispatcher")
+            with self._cond:
+                self._executor = executor
+
+    def stop(self, timeout=1.0):
+        """
+        停止分发，尚未执行的帧被丢弃
+
+        参数:
+            timeout (float): 等待分发线程退出的最长时间（秒），默认为1.0
+        """
+        with self._cond:
+            self._stopping = True
+            self._queue.clear()
+            # 与dispatch在同一把锁下取走线程池，之后不会再有帧提交到已关闭的线程池
+            executor, self._executor = self._executor, None
+            self._cond.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        if executor:
+            executor.shutdown(wait=False)
+        self._update_backpressure(0)
+
+    def is_running(self):
+        """
+        分发器是否在运行
+        """
+        if self.mode == DispatchMode.SERIAL:
+            return self._thread is not None and self._thread.is_alive()
+        return self._executor is not None
+
+    def dispatch(self, frame):
+        """
+        提交一个数据帧（由读取线程调用，不会阻塞）
+
+        参数:
+            frame (dict): 数据帧
+        """
+        if not self._callbacks or self._stopping:
+            return
+        now = time.monotonic_ns()
+        with self._cond:
+            executor = self._executor
+            if self._stopping or (self.mode == DispatchMode.PER_FRAME and executor is None):
+                # 与stop()并发时分发器已停止，丢弃该帧
+                return
+            self.dispatched += 1
+            if self.mode == DispatchMode.SERIAL:
+                if len(self._queue) >= self.max_pending:
+                    self._queue.popleft()
+                    self.dropped += 1
+                self._queue.append((now, frame))
+                depth = len(self._queue)
+                self._cond.notify()
+            else:
+                if self._pending >= self.max_pending:
+                    # 线程池中的任务无法撤回，丢弃新帧
+                    self.dropped += 1
+                    depth = self._pending
+                else:
+                    self._pending += 1
+                    depth = self._pending
+                    executor.submit(self._run_frame, now, frame)
+            if depth > self.max_depth:
+                self.max_depth = depth
+        self._update_backpressure(depth)
+
+    def _update_backpressure(self, depth):
+        """
+        根据待处理帧数更新背压状态，状态变化时通知
+        """
+        with self._pressure_lock:
+            if not self.backpressure.is_set():
+                if depth < self.high_watermark:
+                    return
+                self.backpressure.set()
+                self.backpressure_events += 1
+                active = True
+            else:
+                if depth > self.low_watermark:
+                    return
+                self.backpressure.clear()
+                active = False
+        if active:
+            logger.warning(f"回调处理落后，待处理帧数: {depth}")
+        if self.on_backpressure:
+            try:
+                self.on_backpressure(active, self.get_stats())
+            except Exception as e:
+                logger.error(f"背压回调执行异常: {e}")
+
+    def _call_all(self, enqueue_ns, frame):
+        """
+        依次执行全部回调
+        """
+        delay_ms = (time.monotonic_ns() - enqueue_ns) / 1e6
+        with self._cond:
+            self.queue_delay_ms.add(delay_ms)
+        for handle in self._callbacks:
+            handle(frame)
+
+    def _run(self):
+        """
+        串行模式下的分发线程函数
+        """
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    break
+                enqueue_ns, frame = self._queue.popleft()
+                depth = len(self._queue)
+            self._update_backpressure(depth)
+            self._call_all(enqueue_ns, frame)
+            self.completed += 1
+
+    def _run_frame(self, enqueue_ns, frame):
+        """
+        逐帧模式下线程池执行的任务
+        """
+        try:
+            if not self._stopping:
+                self._call_all(enqueue_ns, frame)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self.completed += 1
+                depth = self._pending
+            self._update_backpressure(depth)
+
+    def get_stats(self):
+        """
+        获取分发统计信息
+
+        返回:
+            dict: 包含mode, pending, max_depth, dispatched, completed, dropped, backpressure,
+                  backpressure_events, queue_delay_ms以及各回调统计callbacks字段
+        """
+        pending = len(self._queue) if self.mode == DispatchMode.SERIAL else self._pending
+        return {
+            'mode': self.mode,
+            'pending': pending,
+            'max_depth': self.max_depth,
+            'dispatched': self.dispatched,
+            'completed': self.completed,
+            'dropped': self.dropped,
+            'backpressure': self.backpressure.is_set(),
+            'backpressure_events': self.backpressure_events,
+            'queue_delay_ms': self.queue_delay_ms.as_dict(),
+            'callbacks': [h.get_stats() for h in self._callbacks]
+        }
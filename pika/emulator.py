@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基于伪终端(pty)的虚拟设备模块，模拟Sense和Gripper的串口协议
+
+虚拟设备打开一对伪终端，在主端按设定频率输出与固件相同布局的遥测帧，并解析写入的
+控制命令；Sense和Gripper类直接以从端路径(emulator.port)作为串口连接，无需真实硬件。
+可注入数值噪声和帧损坏，用于压力测试和CI。仅支持提供pty的平台（Linux/macOS）。
+"""
+
+import os
+import tty
+import time
+import math
+import random
+import select
+import struct
+import logging
+import threading
+from .serial_comm import Protocol
+from .gripper import CommandType as GripperCommandType
+from .sense import CommandType as SenseCommandType
+from .binary_protocol import encode_gripper_frame, encode_sense_frame, encode_info_frame
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.emulator")
+
+_COMMAND_SIZE = 7
+_COMMAND_END = b'\r\n'
+_GET_INFO = b'GET_INFO\r\n'
+
+GRIPPER_FRAME_TEMPLATE = ('{\r\n"motor":{\r\n"Speed":%.3f,\r\n"Current":%d,\r\n"Position":%.4f\r\n}\r\n,\r\n'
+                          '"motorstatus":{\r\n"Voltage":%.2f,\r\n"DriverTemp":%d,\r\n"MotorTemp":%d,\r\n'
+                          '"Status":"0x%02X",\r\n"BusCurrent":%d\r\n}\r\n\r\n}\r\n')
+SENSE_FRAME_TEMPLATE = ('{\r\n"Command":%d,\r\n"AS5047":{\r\n"angle":%.2f,\r\n"rad":%.4f\r\n},\r\n\r\n'
+                        '"IMU":{\r\n"acc":[%.3f,%.3f,%.3f],\r\n"gyr":[%.4f,%.4f,%.4f],\r\n'
+                        '"pitch":%.2f,\r\n"roll":%.2f,\r\n"yaw":%.2f\r\n}\r\n\r\n}\r\n')
+
+
+class Corruption:
+    """
+    帧损坏方式
+    """
+    FLIP = 'flip'           # 随机改写帧内一个字节
+    TRUNCATE = 'truncate'   # 截断帧尾，与下一帧粘连
+    GARBAGE = 'garbage'     # 在帧前插入随机字节
+
+
+class DeviceEmulator:
+    """
+    虚拟设备基类，负责伪终端管理、定时输出和命令接收
+
+    参数:
+        rate (float): 遥测帧输出频率(Hz)，默认为100.0
+        noise (float): 叠加在浮点字段上的高斯噪声标准差，默认为0.0
+        corruption_rate (float): 每帧被损坏的概率，默认为0.0
+        corruption_modes (tuple): 可选的损坏方式，默认为Corruption中的全部方式
+        embed_counter (bool): 是否将帧计数写入帧中（具体字段由子类决定），供基准测试
+                              计算端到端延迟，默认为False
+        seed (int): 随机数种子，默认为None
+        version (str): GET_INFO命令返回的版本信息
+        send_log_size (int): 保留发送时间戳的帧数，供get_send_ns()查询，默认为65536
+        protocol (str): 输出的遥测帧协议，Protocol.JSON或Protocol.BINARY，默认为Protocol.JSON
+        link (str): 指向伪终端从端的符号链接路径（模拟udev固定链接），设置后port为该路径，
+                    unplug()/replug()可模拟设备拔出和重新插入，默认为None
+    """
+    def __init__(self, rate=100.0, noise=0.0, corruption_rate=0.0,
+                 corruption_modes=(Corruption.FLIP, Corruption.TRUNCATE, Corruption.GARBAGE),
+                 embed_counter=False, seed=None, version='emulator-1.0', send_log_size=65536,
+                 protocol=Protocol.JSON, link=None):
+        if protocol not in (Protocol.JSON, Protocol.BINARY):
+            raise ValueError(f"虚拟设备不支持的遥测帧协议: {protocol}")
+        self.rate = rate
+        self.protocol = protocol
+        self.noise = noise
+        self.corruption_rate = corruption_rate
+        self.corruption_modes = tuple(corruption_modes)
+        self.embed_counter = embed_counter
+        self.version = version
+        self.link = link
+        self.port = None
+        self._random = random.Random(seed)
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stopping = False
+        self._rx_buffer = bytearray()
+        self._send_log = [None] * send_log_size
+        self.state_lock = threading.Lock()
+        # 统计
+        self.frames_sent = 0
+        self.frames_corrupted = 0   # 注入损坏或只写出一部分（接收端看到截断帧）的帧数
+        self.frames_dropped = 0     # 从端未及时读取、伪终端缓冲区已满时整帧丢弃的帧数
+        self.bytes_sent = 0
+        self.commands_received = 0
+        self.commands_invalid = 0
+        self.last_commands = []     # 最近收到的命令(command_type, value)，最多保留256条
+
+    def start(self):
+        """
+        创建伪终端并启动输出线程
+
+        返回:
+            str: 从端设备路径，可直接作为Sense/Gripper的port参数
+        """
+        if self._thread and self._thread.is_alive():
+            return self.port
+        self._master, self._slave = os.openpty()
+        # 两端均设为原始模式，避免回显和换行转换
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        if self.link:
+            # 先创建临时链接再替换，链接路径始终指向有效的从端或不存在
+            temporary = f"{self.link}.{os.getpid()}.tmp"
+            os.symlink(self.port, temporary)
+            os.replace(temporary, self.link)
+            self.port = self.link
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="pika-emulator")
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"虚拟设备已启动: {self.port}，输出频率{self.rate}Hz")
+        return self.port
+
+    def stop(self):
+        """
+        停止输出线程并关闭伪终端
+        """
+        self._stopping = True
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = None
+        self._slave = None
+        if self.link:
+            try:
+                os.unlink(self.link)
+            except OSError:
+                pass
+
+    def unplug(self):
+        """
+        模拟设备拔出：关闭伪终端并删除符号链接，已连接的串口读取时出错
+        """
+        self.stop()
+        logger.info("虚拟设备已拔出")
+
+    def replug(self):
+        """
+        模拟设备重新插入：创建新的伪终端，符号链接指向新的从端，设备状态保持不变
+
+        返回:
+            str: 设备路径
+        """
+        if not self.link:
+            raise ValueError("未设置link时重新插入后设备路径会改变，无法模拟重新插入")
+        return self.start()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def get_send_ns(self, counter):
+        """
+        获取指定帧计数的发送时间戳
+
+        参数:
+            counter (int): 帧计数
+
+        返回:
+            int: 开始写入伪终端前的time.monotonic_ns()，未完整写出或超出记录窗口时返回None
+        """
+        entry = self._send_log[counter % len(self._send_log)]
+        if entry is None or entry[0] != counter:
+            return None
+        return entry[1]
+
+    def get_stats(self):
+        """
+        获取虚拟设备统计信息
+
+        返回:
+            dict: 包含frames_sent, frames_corrupted, frames_dropped, bytes_sent,
+                  commands_received, commands_invalid字段
+        """
+        return {
+            'frames_sent': self.frames_sent,
+            'frames_corrupted': self.frames_corrupted,
+            'frames_dropped': self.frames_dropped,
+            'bytes_sent': self.bytes_sent,
+            'commands_received': self.commands_received,
+            'commands_invalid': self.commands_invalid
+        }
+
+    def generate(self, count):
+        """
+        不经过伪终端，直接生成count帧数据流（按corruption_rate注入损坏），用于离线基准测试和模糊测试
+
+        参数:
+            count (int): 帧数
+
+        返回:
+            tuple: (数据流bytes, 被损坏的帧计数集合)
+        """
+        chunks = []
+        corrupted = set()
+        period = 1.0 / self.rate
+        with self.state_lock:
+            for counter in range(count):
+                self._step(period)
+                data = self._build_frame(counter)
+                if self.corruption_rate and self._random.random() < self.corruption_rate:
+                    data = self._corrupt(data)
+                    corrupted.add(counter)
+                chunks.append(data)
+        return b''.join(chunks), corrupted
+
+    def _run(self):
+        """
+        输出线程函数：按截止时间输出遥测帧，空闲时等待命令数据
+        """
+        period = 1.0 / self.rate
+        next_due = time.monotonic()
+        last = next_due
+        while not self._stopping:
+            now = time.monotonic()
+            timeout = max(0.0, next_due - now)
+            try:
+                readable, _, _ = select.select([self._master], [], [], min(timeout, 0.1))
+            except (OSError, ValueError):
+                break
+            if readable:
+                self._read_commands()
+            now = time.monotonic()
+            if now < next_due:
+                continue
+            with self.state_lock:
+                self._step(now - last)
+                frame = self._build_frame(self.frames_sent)
+            last = now
+            self._write_frame(frame)
+            next_due += period
+            if now - next_due > 1.0:
+                # 落后超过1秒时不再追赶，避免突发输出大量帧
+                next_due = now
+
+    def _read_commands(self):
+        """
+        读取并解析主端收到的命令数据
+        """
+        try:
+            data = os.read(self._master, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            # 从端关闭时主端读取会返回EIO
+            time.sleep(0.01)
+            return
+        self._rx_buffer += data
+        buffer = self._rx_buffer
+        while buffer:
+            if buffer.startswith(_GET_INFO):
+                del buffer[:len(_GET_INFO)]
+                if self.protocol == Protocol.BINARY:
+                    self._write_raw(encode_info_frame(self.version))
+                else:
+                    self._write_raw(('{\r\n"Version":"%s"\r\n}\r\n' % self.version).encode('utf-8'))
+                continue
+            if _GET_INFO.startswith(bytes(buffer[:len(_GET_INFO)])):
+                break
+            if len(buffer) < _COMMAND_SIZE:
+                break
+            if buffer[5:_COMMAND_SIZE] != _COMMAND_END:
+                # 命令边界错位，丢弃一个字节后重新对齐
+                del buffer[0]
+                self.commands_invalid += 1
+                continue
+            command = bytes(buffer[:_COMMAND_SIZE])
+            del buffer[:_COMMAND_SIZE]
+            command_type, value = self._decode_command(command)
+            self.commands_received += 1
+            self.last_commands.append((command_type, value))
+            if len(self.last_commands) > 256:
+                del self.last_commands[0]
+            with self.state_lock:
+                self._apply_command(command_type, value)
+
+    def _write_frame(self, frame):
+        """
+        对帧进行损坏注入后写入主端
+        """
+        counter = self.frames_sent
+        data = frame
+        corrupted = False
+        if self.corruption_rate and self._random.random() < self.corruption_rate:
+            data = self._corrupt(data)
+            corrupted = True
+        # 发送时间取写入之前，避免另一进程中的读取端先于此处标记接收时间
+        send_ns = time.monotonic_ns()
+        written = self._write_raw(data)
+        if written == len(data):
+            self._send_log[counter % len(self._send_log)] = (counter, send_ns)
+        elif written:
+            # 部分字节已经写出，接收端看到的是截断帧
+            corrupted = True
+        else:
+            self.frames_dropped += 1
+        if corrupted:
+            self.frames_corrupted += 1
+        self.frames_sent += 1
+
+    def _write_raw(self, data):
+        """
+        写入主端，伪终端缓冲区已满时放弃本次数据（可能只写出一部分）
+
+        返回:
+            int: 实际写出的字节数
+        """
+        try:
+            written = os.write(self._master, data)
+        except (BlockingIOError, InterruptedError):
+            return 0
+        except OSError:
+            return 0
+        self.bytes_sent += written
+        return written
+
+    def _corrupt(self, data):
+        """
+        按随机选择的损坏方式修改帧数据
+        """
+        mode = self._random.choice(self.corruption_modes)
+        rng = self._random
+        if mode == Corruption.FLIP:
+            data = bytearray(data)
+            data[rng.randrange(len(data))] = rng.randrange(256)
+            return bytes(data)
+        if mode == Corruption.TRUNCATE:
+            return data[:rng.randrange(1, len(data))]
+        garbage = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 16)))
+        return garbage + data
+
+    def _jitter(self, value):
+        """
+        叠加高斯噪声
+        """
+        if self.noise:
+            return value + self._random.gauss(0.0, self.noise)
+        return value
+
+    def _decode_command(self, command):
+        """
+        解析7字节命令，返回(command_type, value)
+        """
+        raise NotImplementedError
+
+    def _apply_command(self, command_type, value):
+        """
+        根据命令更新设备状态（持有state_lock时调用）
+        """
+        raise NotImplementedError
+
+    def _step(self, dt):
+        """
+        将设备状态推进dt秒（持有state_lock时调用）
+        """
+
+    def _build_frame(self, counter):
+        """
+        根据当前状态按协议构造一帧遥测数据（持有state_lock时调用）
+
+        返回:
+            bytes: 帧数据
+        """
+        raise NotImplementedError
+
+
+class GripperEmulator(DeviceEmulator):
+    """
+    虚拟Gripper设备
+
+    支持ENABLE/DISABLE/SET_ZERO以及POSITION_CTRL/VELOCITY_CTRL/EFFORT_CTRL/CURRENT命令，
+    位置控制下电机以max_speed向目标位置运动。embed_counter为True时帧计数写入
+    motorstatus.BusCurrent字段。
+
+    参数:
+        max_speed (float): 位置控制时的最大转速(rad/s)，默认为10.0
+        其余参数与DeviceEmulator相同
+    """
+    _VALUE = struct.Struct('<f')
+
+    def __init__(self, max_speed=10.0, **kwargs):
+        super().__init__(**kwargs)
+        self.max_speed = max_speed
+        self.enabled = False
+        self.mode = GripperCommandType.POSITION_CTRL
+        self.position = 0.0
+        self.speed = 0.0
+        self.current = 0
+        self.target_position = 0.0
+        self.target_velocity = 0.0
+        self.effort = 0.0
+        self.voltage = 24.0
+        self.driver_temp = 35
+        self.motor_temp = 37
+        self.status = 0
+
+    def _decode_command(self, command):
+        return command[0], self._VALUE.unpack_from(command, 1)[0]
+
+    def _apply_command(self, command_type, value):
+        if command_type == GripperCommandType.ENABLE:
+            self.enabled = True
+        elif command_type == GripperCommandType.DISABLE:
+            self.enabled = False
+            self.speed = 0.0
+        elif command_type == GripperCommandType.SET_ZERO:
+            self.position = 0.0
+            self.target_position = 0.0
+        elif command_type == GripperCommandType.POSITION_CTRL:
+            self.mode = command_type
+            self.target_position = value
+        elif command_type == GripperCommandType.VELOCITY_CTRL:
+            self.mode = command_type
+            self.target_velocity = value
+        elif command_type == GripperCommandType.EFFORT_CTRL:
+            self.effort = value
+        elif command_type == GripperCommandType.CURRENT:
+            self.current = int(value)
+        else:
+            self.commands_invalid += 1
+
+    def _step(self, dt):
+        if not self.enabled or dt <= 0:
+            self.speed = 0.0
+            return
+        if self.mode == GripperCommandType.VELOCITY_CTRL:
+            self.speed = self.target_velocity
+        else:
+            error = self.target_position - self.position
+            step = max(-self.max_speed * dt, min(self.max_speed * dt, error))
+            self.speed = step / dt
+        self.position += self.speed * dt
+
+    def _build_frame(self, counter):
+        bus_current = counter if self.embed_counter else abs(self.current) // 4
+        values = (self._jitter(self.speed), self.current, self._jitter(self.position),
+                  self._jitter(self.voltage), self.driver_temp, self.motor_temp, self.status, bus_current)
+        if self.protocol == Protocol.BINARY:
+            return encode_gripper_frame(*values)
+        return (GRIPPER_FRAME_TEMPLATE % values).encode('ascii')
+
+
+class SenseEmulator(DeviceEmulator):
+    """
+    虚拟Sense设备
+
+    支持LIGHT_CTRL/VIBRATE_CTRL命令，编码器角度可通过set_encoder()设置，
+    sweep_period大于0时编码器在0到sweep_amplitude弧度之间按正弦规律往复运动。
+    embed_counter为True时帧计数写入Command字段。
+
+    参数:
+        sweep_period (float): 编码器往复运动周期（秒），为0时保持静止，默认为0.0
+        sweep_amplitude (float): 编码器往复运动幅度(rad)，默认为1.0
+        其余参数与DeviceEmulator相同
+    """
+    _VALUE = struct.Struct('>i')
+
+    def __init__(self, sweep_period=0.0, sweep_amplitude=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.sweep_period = sweep_period
+        self.sweep_amplitude = sweep_amplitude
+        self.rad = 0.0
+        self.command = 0
+        self.light = 0
+        self.vibrate = 0
+        self.pitch = 0.0
+        self.roll = 0.0
+        self.yaw = 0.0
+        self._elapsed = 0.0
+
+    def set_encoder(self, rad):
+        """
+        设置编码器弧度
+
+        参数:
+            rad (float): 编码器弧度
+        """
+        with self.state_lock:
+            self.rad = rad
+
+    def _decode_command(self, command):
+        return command[0], self._VALUE.unpack_from(command, 1)[0]
+
+    def _apply_command(self, command_type, value):
+        if command_type == SenseCommandType.LIGHT_CTRL:
+            self.light = value
+        elif command_type == SenseCommandType.VIBRATE_CTRL:
+            self.vibrate = value
+        else:
+            self.commands_invalid += 1
+
+    def _step(self, dt):
+        if self.sweep_period > 0:
+            self._elapsed += dt
+            phase = 2 * math.pi * self._elapsed / self.sweep_period
+            self.rad = self.sweep_amplitude * (1 - math.cos(phase)) / 2
+
+    def _build_frame(self, counter):
+        jitter = self._jitter
+        rad = jitter(self.rad)
+        command = counter if self.embed_counter else self.command
+        acc = (jitter(0.0), jitter(0.0), jitter(9.81))
+        gyr = (jitter(0.0), jitter(0.0), jitter(0.0))
+        if self.protocol == Protocol.BINARY:
+            return encode_sense_frame(command, math.degrees(rad), rad, acc, gyr,
+                                      jitter(self.pitch), jitter(self.roll), jitter(self.yaw))
+        return (SENSE_FRAME_TEMPLATE % (
+            command, math.degrees(rad), rad, *acc, *gyr,
+            jitter(self.pitch), jitter(self.roll), jitter(self.yaw))).encode('ascii')
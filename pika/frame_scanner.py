@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口数据帧扫描模块，负责从字节流中增量地切分出完整的JSON数据帧
+
+数据损坏时扫描器直接跳到下一个合理的帧起始（'{'后紧跟键名，设置了start_keys时
+还需是约定的首个键），已扫描过的字节不会被反复扫描；字符串中出现换行、
+帧长度超过上限、帧内出现新的帧起始等情况都会被提前判定为损坏。
+"""
+
+import re
+from .metrics import RunningStats
+
+# 完整的JSON字符串（展开循环写法，避免回溯爆炸），JSON字符串中不允许出现换行
+_STRING = rb'"[^"\\\r\n]*(?:\\.[^"\\\r\n]*)*"'
+# 不含嵌套的完整JSON对象
+_FLAT_OBJECT = rb'\{[^{}"]*(?:' + _STRING + rb'[^{}"]*)*\}'
+# 非字符串状态下一次跳过所有普通字节、完整字符串和完整的单层对象，
+# 停在未能整体跳过的括号、未闭合字符串的起始引号或缓冲区末尾
+_SKIP_RUN = re.compile(rb'[^{}\[\]"]*(?:(?:' + _STRING + rb'|' + _FLAT_OBJECT + rb')[^{}\[\]"]*)*', re.DOTALL)
+# 字符串状态下需要关注的字符：双引号、反斜杠，以及说明字符串已损坏的换行
+_STRING_CHARS = re.compile(rb'["\\\r\n]')
+# 帧起始与首个键名之间允许的最大空白字节数
+_MAX_START_GAP = 8
+# 合理的帧起始：'{'后紧跟（可有少量空白）键名的起始引号
+_PLAUSIBLE_START = re.compile(rb'\{[ \t\r\n]{0,%d}"' % _MAX_START_GAP)
+_WHITESPACE = b' \t\r\n'
+_OPEN_OBJECT = 0x7B   # '{'
+_OPEN_ARRAY = 0x5B    # '['
+# 容器闭合字符对应的起始字符
+_CLOSING = {0x7D: _OPEN_OBJECT, 0x5D: _OPEN_ARRAY}
+
+
+class JsonFrameScanner:
+    """
+    增量JSON帧扫描器
+
+    在bytearray上工作，并在多次读取之间保留未闭合的括号、字符串和转义状态，
+    每次只扫描新到达的字节，避免对缓冲区的重复扫描和字符串拷贝。
+    帧内的括号按JSON语法检查（对象和数组只能作为值出现、括号必须配对），
+    判定帧损坏后从尚未排除的最早位置查找下一个合理的帧起始，已扫描过的字节不会被再次扫描。
+
+    参数:
+        max_buffer_len (int): 缓冲区最大长度，超过后丢弃较早的数据，默认为4096
+        max_frame_len (int): 单帧最大长度，未闭合的帧超过该长度即判定为损坏，默认与max_buffer_len相同
+        start_keys (tuple): 可选的合法首个键名（含引号的字节串，如b'"motor"'），设置后只接受以这些键
+                            开头的帧，帧内出现以这些键开头的对象时判定前一帧不完整并从该处重新开始
+    """
+    def __init__(self, max_buffer_len=4096, max_frame_len=None, start_keys=()):
+        self.max_buffer_len = max_buffer_len
+        self.max_frame_len = max_frame_len or max_buffer_len
+        self.set_start_keys(start_keys)
+        self.buffer = bytearray()
+        # 统计：每帧扫描的字节数（包含帧前被丢弃的噪声字节）
+        self.bytes_per_frame = RunningStats()
+        self.frames = 0
+        self.bytes_discarded = 0
+        # 损坏统计
+        self.starts_rejected = 0    # 因帧起始不合理而跳过的次数
+        self.frames_resynced = 0    # 帧内出现新的帧起始或不合法的括号、被截断丢弃的帧
+        self.frames_invalid = 0     # 字符串中出现换行的帧
+        self.frames_oversize = 0    # 超过max_frame_len仍未闭合的帧
+        self.frames_rejected = 0    # 切分后未能通过解析、被丢弃的帧
+        self._reset_state()
+        self._consumed = 0
+
+    def _reset_state(self):
+        """
+        重置扫描状态，回到帧外
+        """
+        self._pos = 0
+        self._stack = bytearray()   # 未闭合的'{'和'['
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+
+    def set_start_keys(self, keys):
+        """
+        设置合法的首个键名，为空时只要求'{'后紧跟键名
+        """
+        self.start_keys = tuple(keys)
+        self._max_key_len = max((len(key) for key in self.start_keys), default=0)
+
+    def feed(self, data):
+        """
+        向扫描器追加新读取的字节
+
+        参数:
+            data (bytes): 新读取到的数据
+        """
+        self.buffer += data
+
+    def _check_start(self, buf, pos):
+        """
+        检查pos处的'{'是否为合理的帧起始
+
+        返回:
+            bool: 是否合理，数据不足以判断时返回None
+        """
+        end = len(buf)
+        i = pos + 1
+        limit = min(end, i + _MAX_START_GAP)
+        while i < limit and buf[i] in _WHITESPACE:
+            i += 1
+        if i >= end:
+            return None
+        if buf[i] != 0x22:  # '"'
+            return False
+        if not self.start_keys:
+            return True
+        head = buf[i:i + self._max_key_len]
+        undecided = False
+        for key in self.start_keys:
+            if head.startswith(key):
+                return True
+            if len(head) < len(key) and key.startswith(head):
+                undecided = True
+        return None if undecided else False
+
+    def _find_start(self, begin):
+        """
+        从begin开始查找下一个合理（或数据不足以判断）的帧起始
+
+        返回:
+            int: 帧起始位置，没有时返回-1
+        """
+        buf = self.buffer
+        m = _PLAUSIBLE_START.search(buf, begin)
+        while m is not None:
+            if self._check_start(buf, m.start()) is not False:
+                return m.start()
+            m = _PLAUSIBLE_START.search(buf, m.start() + 1)
+        # 缓冲区末尾的'{'之后只有空白时尚无法判断
+        tail = buf.rfind(b'{', max(begin, len(buf) - _MAX_START_GAP - 1))
+        if tail != -1 and not bytes(buf[tail + 1:]).strip(_WHITESPACE):
+            return tail
+        return -1
+
+    def _resync(self, begin):
+        """
+        丢弃当前帧，跳到begin及之后的下一个合理帧起始
+        """
+        start = self._find_start(begin)
+        self._discard(start if start != -1 else len(self.buffer))
+        self._reset_state()
+
+    def rewind(self, frame):
+        """
+        解析失败时调用。设置了start_keys时帧内的新帧起始在扫描时已检查过，整帧丢弃；
+        否则帧内的嵌套对象可能是被截断帧之后的完整帧，将帧中下一个合理起始之后的数据放回缓冲区头部
+
+        参数:
+            frame (bytes): 解析失败的帧数据
+        """
+        self.frames_rejected += 1
+        start = -1
+        if not self.start_keys:
+            m = _PLAUSIBLE_START.search(frame, 1)
+            start = m.start() if m is not None else -1
+        if start == -1:
+            self.bytes_discarded += len(frame)
+        else:
+            self.buffer[:0] = frame[start:]
+            self.bytes_discarded += start
+        self._reset_state()
+
+    def _discard(self, count):
+        """
+        丢弃缓冲区头部的count个字节
+        """
+        del self.buffer[:count]
+        self.bytes_discarded += count
+        self._consumed += count
+
+    def _value_allowed(self, buf, pos):
+        """
+        检查帧内pos处是否可以出现值（嵌套的对象或数组）：对象中必须紧跟':'，数组中必须紧跟'['或','
+        """
+        i = pos - 1
+        while i > 0 and buf[i] in _WHITESPACE:
+            i -= 1
+        if self._stack[-1] == _OPEN_OBJECT:
+            return buf[i] == 0x3A  # ':'
+        return buf[i] == 0x5B or buf[i] == 0x2C  # '[' ','
+
+    def next_frame(self):
+        """
+        从缓冲区中取出下一个完整的JSON帧
+
+        返回:
+            bytes: 完整帧的原始字节，如果没有完整帧则返回None
+        """
+        buf = self.buffer
+        while True:
+            stack = self._stack
+            if not stack:
+                # 帧外：跳过噪声直到下一个'{'
+                start = buf.find(b'{')
+                if start == -1:
+                    if buf:
+                        self._discard(len(buf))
+                    return None
+                if start > 0:
+                    self._discard(start)
+                valid = self._check_start(buf, 0)
+                if valid is None:
+                    return None
+                if not valid:
+                    self.starts_rejected += 1
+                    self._resync(1)
+                    continue
+                stack.append(_OPEN_OBJECT)
+                self._pos = 1
+
+            pos = self._pos
+            if self._escaped:
+                # 上一次读取以反斜杠结尾，跳过被转义的字符
+                if pos >= len(buf):
+                    return None
+                pos += 1
+                self._escaped = False
+
+            resync_at = None
+            while True:
+                if self._in_string:
+                    m = _STRING_CHARS.search(buf, pos)
+                    if m is None:
+                        break
+                    pos = m.end()
+                    ch = buf[pos - 1]
+                    if ch == 0x5C:  # '\\'
+                        if pos >= len(buf):
+                            self._escaped = True
+                            break
+                        pos += 1
+                    elif ch == 0x22:  # '"'
+                        self._in_string = False
+                    else:
+                        # 字符串中出现换行，字符串边界已错位；该引号之前的帧起始均已检查过
+                        self.frames_invalid += 1
+                        resync_at = max(1, self._string_start - _MAX_START_GAP - 1)
+                        break
+                    continue
+
+                pos = _SKIP_RUN.match(buf, pos).end()
+                if pos >= len(buf):
+                    break
+                ch = buf[pos]
+                if ch == 0x22:  # '"'，字符串在缓冲区末尾尚未闭合或含有换行
+                    self._in_string = True
+                    self._string_start = pos
+                elif ch == _OPEN_OBJECT or ch == _OPEN_ARRAY:
+                    valid = False
+                    if ch == _OPEN_OBJECT and self.start_keys:
+                        valid = self._check_start(buf, pos)
+                        if valid is None:
+                            break
+                    if valid or not self._value_allowed(buf, pos):
+                        # 帧内出现新的帧起始或不合法的括号，前一帧不完整，从此处重新开始
+                        self.frames_resynced += 1
+                        resync_at = pos
+                        break
+                    stack.append(ch)
+                else:
+                    if stack[-1] != _CLOSING[ch]:
+                        # 括号不配对
+                        self.frames_resynced += 1
+                        resync_at = pos
+                        break
+                    stack.pop()
+                    if not stack:
+                        pos += 1
+                        frame = bytes(buf[:pos])
+                        del buf[:pos]
+                        self._consumed += pos
+                        self.bytes_per_frame.add(self._consumed)
+                        self._consumed = 0
+                        self.frames += 1
+                        self._reset_state()
+                        return frame
+                pos += 1
+
+            if resync_at is not None:
+                self._resync(resync_at)
+                continue
+            self._pos = min(pos, len(buf))
+            if self._pos > self.max_frame_len:
+                # 未闭合的帧过长，其中的帧起始均已检查过，从已扫描位置之后重新开始
+                self.frames_oversize += 1
+                self._resync(self._pos)
+                continue
+            if len(buf) > self.max_buffer_len:
+                # 缓冲数据过多，丢弃较早的数据，从剩余部分重新寻找起点
+                self._discard(len(buf) - self.max_buffer_len)
+                self._reset_state()
+                continue
+            return None
+
+    def get_stats(self):
+        """
+        获取扫描器统计信息
+
+        返回:
+            dict: 包含frames, bytes_discarded, buffered, bytes_per_frame字段，
+                  以及starts_rejected, frames_resynced, frames_invalid, frames_oversize,
+                  frames_rejected损坏统计
+        """
+        return {
+            'frames': self.frames,
+            'bytes_discarded': self.bytes_discarded,
+            'buffered': len(self.buffer),
+            'bytes_per_frame': self.bytes_per_frame.as_dict(),
+            'starts_rejected': self.starts_rejected,
+            'frames_resynced': self.frames_resynced,
+            'frames_invalid': self.frames_invalid,
+            'frames_oversize': self.frames_oversize,
+            'frames_rejected': self.frames_rejected
+        }
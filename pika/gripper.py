@@ -6,11 +6,17 @@ Pika Gripper 设备类，提供对Pika Gripper设备的访问接口
 """
 
 import time
-import math
 import logging
 import threading
 import struct
-from .serial_comm import SerialComm
+import numpy as np
+from .serial_comm import SerialComm, DeliveryMode
+from .telemetry import decode_gripper_frame, GRIPPER_FRAME_KEYS
+from .history import TelemetryHistory, GRIPPER_HISTORY_DTYPE
+from .subscription import OverflowPolicy
+from .snapshot import GripperSnapshot, GRIPPER_SNAPSHOT_DEFAULT
+from .kinematics import get_kinematics, GRIPPER_LINKAGE
+from .trajectory import TrajectoryRun, TrajectoryUnit, TrajectoryState
 
 # 创建logger，但不配置全局日志系统
 logger = logging.getLogger('pika.gripper')
@@ -31,26 +37,53 @@ class Gripper:
     
     参数:
         port (str): 串口设备路径，默认为'/dev/ttyUSB0'
+        delivery_mode (str): 数据帧交付模式，默认为DeliveryMode.EVERY_FRAME，
+                             控制回路可使用DeliveryMode.LATEST_ONLY
+        history_capacity (int): 遥测历史环形缓冲区容量（帧数），为0时不记录历史，默认为4096
+        async_write (bool): 是否使用独立的命令写线程，启用后控制命令不再阻塞调用方，
+                            位置/速度/力矩设定值在发送前被新值替换，默认为False
+        serial_comm (SerialComm): 可选的串口通信对象，例如用于离线回放的ReplaySerialComm、
+                                  在子进程中读取的ProcessSerialComm，为None时按port和delivery_mode创建
+        auto_reconnect (bool): USB串口断开（拔出、复位）后是否自动重新打开同一路径并恢复数据，
+                               port可使用udev固定链接以保证重新插入后路径不变，默认为False
+        reactor (SerialReactor): 可选的共享串口反应器（pika.reactor），多台设备共用一个读取线程，默认为None
+        low_latency (bool): 是否在权限允许的范围内为USB转串口适配器启用低延迟设置（latency_timer
+                            和ASYNC_LOW_LATENCY，见pika.usb_latency），默认为False
+        linkage (LinkageParams): 夹爪连杆参数（pika.kinematics），用于弧度与开合距离的换算，默认为GRIPPER_LINKAGE
     """
     
-    def __init__(self, port='/dev/ttyUSB0'):
+    # 写线程模式下可合并的设定值命令
+    COALESCE_COMMANDS = (CommandType.POSITION_CTRL, CommandType.VELOCITY_CTRL, CommandType.EFFORT_CTRL)
+    
+    def __init__(self, port='/dev/ttyUSB0', delivery_mode=DeliveryMode.EVERY_FRAME,
+                 history_capacity=4096, async_write=False, serial_comm=None, auto_reconnect=False,
+                 reactor=None, low_latency=False, linkage=None):
         self.port = port
-        json_pattern = r'\{\r\n"motor":\{\r\n"Speed":[^\r\n]*,\r\n"Current":[^\r\n]*,\r\n"Position":[^\r\n]*\r\n\}\r\n,\r\n"motorstatus":\{\r\n"Voltage":[^\r\n]*,\r\n"DriverTemp":[^\r\n]*,\r\n"MotorTemp":[^\r\n]*,\r\n"Status":[^\r\n]*,\r\n"BusCurrent":[^\r\n]*\r\n\}\r\n\r\n\}'
-        self.serial_comm = SerialComm(port=port)
+        if serial_comm is None:
+            serial_comm = SerialComm(port=port, delivery_mode=delivery_mode, auto_reconnect=auto_reconnect,
+                                     reactor=reactor, low_latency=low_latency)
+        if serial_comm.decoder is None and not serial_comm.REMOTE_PARSING:
+            serial_comm.decoder = decode_gripper_frame
+            serial_comm.set_frame_keys(GRIPPER_FRAME_KEYS)
+        self.serial_comm = serial_comm
+        # 弧度与夹爪开合距离的换算，相同连杆参数的设备共用查找表
+        self.kinematics = get_kinematics(linkage or GRIPPER_LINKAGE)
+        # 正在执行的轨迹(pika.trajectory)，同一时间只执行一条
+        self._trajectory = None
+        self._trajectory_lock = threading.Lock()
+        self.async_write = async_write
         self.is_connected = False
+        # 保留以兼容外部代码，读取遥测数据已不需要加锁
         self.data_lock = threading.Lock()
-        self.motor_data = {
-            'Speed': 0.0,  # 电机当前转速（rad/s）
-            'Current': 0,    # 电机当前相电流（mA）
-            'Position': 0.0  # 电机当前位置（rad）
-        }
-        self.motor_status = {
-            'Voltage': 0.0,  # 电机驱动器电压(V)
-            'DriverTemp': 0,  # 电机驱动器温度(°C)
-            'MotorTemp': 0,   # 电机温度(°C)
-            'Status': "0x00",  # 电机驱动器状态
-            'BusCurrent': 0    # 母线电流(mA)
-        }
+        # 最新遥测快照，由读取线程整体替换，读取时无需加锁
+        self._snapshot = GRIPPER_SNAPSHOT_DEFAULT
+        # 子进程读取模式(pika.process_reader)下，快照和历史直接从共享内存读取
+        self._shared_history = getattr(serial_comm, 'shared_history', None)
+        # 遥测历史环形缓冲区，由读取线程写入
+        if self._shared_history is not None:
+            self.history = self._shared_history
+        else:
+            self.history = TelemetryHistory(GRIPPER_HISTORY_DTYPE, history_capacity) if history_capacity > 0 else None
         
         
         # 鱼眼相机索引
@@ -90,6 +123,8 @@ class Gripper:
         
         # 启动数据读取线程
         self.serial_comm.start_reading_thread(callback=self._data_callback)
+        if self.async_write:
+            self.serial_comm.start_writer_thread(coalesce_types=self.COALESCE_COMMANDS)
         self.is_connected = True
         logger.info(f"成功连接到Pika Gripper设备: {self.port}")
         
@@ -104,6 +139,9 @@ class Gripper:
         if not self.is_connected:
             return
         
+        # 停止正在执行的轨迹
+        self.cancel_trajectory()
+        
         # 断开串口连接
         self.serial_comm.disconnect()
         self.is_connected = False
@@ -130,61 +168,214 @@ class Gripper:
             data (dict): 接收到的JSON数据
         """
         try:
-            with self.data_lock:
-                # 处理电机数据
-                if 'motor' in data:
-                    motor = data['motor']
-                    self.motor_data = {
-                        'Speed': motor.get('Speed', 0.0),
-                        'Current': motor.get('Current', 0),
-                        'Position': motor.get('Position', 0.0)
-                    }
+            motor = data.get('motor')
+            status = data.get('motorstatus')
+            if motor is not None or status is not None:
+                # 构造新快照后整体替换引用，帧中缺少的部分沿用上一帧
+                previous = self._snapshot
+                if motor is not None:
+                    seq, recv_ns = data.get('seq'), data.get('recv_ns')
+                    speed = motor.get('Speed', 0.0)
+                    current = motor.get('Current', 0)
+                    position = motor.get('Position', 0.0)
+                else:
+                    seq, recv_ns = previous.seq, previous.recv_ns
+                    speed, current, position = previous.Speed, previous.Current, previous.Position
+                if status is not None:
+                    snapshot = GripperSnapshot(
+                        seq, recv_ns, speed, current, position,
+                        status.get('Voltage', 0.0), status.get('DriverTemp', 0), status.get('MotorTemp', 0),
+                        status.get('Status', "0x00"), status.get('BusCurrent', 0))
+                else:
+                    snapshot = previous._replace(seq=seq, recv_ns=recv_ns, Speed=speed,
+                                                 Current=current, Position=position)
+                self._snapshot = snapshot
                 
-                # 处理电机状态
-                if 'motorstatus' in data:
-                    status = data['motorstatus']
-                    self.motor_status = {
-                        'Voltage': status.get('Voltage', 0.0),
-                        'DriverTemp': status.get('DriverTemp', 0),
-                        'MotorTemp': status.get('MotorTemp', 0),
-                        'Status': status.get('Status', "0x00"),
-                        'BusCurrent': status.get('BusCurrent', 0)
-                    }
-                
-                # 处理版本信息
-                if 'Version' in data:
-                    logger.info(f"设备版本信息: {data['Version']}")
+                # 记录遥测历史
+                if motor is not None and self.history is not None:
+                    self._append_history(snapshot)
+            
+            # 处理版本信息
+            if 'Version' in data:
+                logger.info(f"设备版本信息: {data['Version']}")
                     
         except Exception as e:
             logger.error(f"处理数据回调异常: {e}")
     
-    def get_motor_data(self):
+    def _append_history(self, snapshot):
+        """
+        将遥测快照写入历史缓冲区
+        
+        参数:
+            snapshot (GripperSnapshot): 当前帧的遥测快照
+        """
+        self.history.append(self._history_record(snapshot))
+    
+    @staticmethod
+    def _history_record(snapshot):
+        """
+        将遥测快照转换为GRIPPER_HISTORY_DTYPE字段顺序的记录
+        """
+        try:
+            status_code = int(snapshot.Status, 16)
+        except (TypeError, ValueError):
+            status_code = -1
+        return (
+            snapshot.seq if snapshot.seq is not None else -1,
+            snapshot.recv_ns if snapshot.recv_ns is not None else 0,
+            snapshot.Speed, snapshot.Current, snapshot.Position,
+            snapshot.Voltage, snapshot.DriverTemp, snapshot.MotorTemp,
+            status_code, snapshot.BusCurrent
+        )
+    
+    @staticmethod
+    def _snapshot_from_record(record):
+        """
+        将历史记录转换回遥测快照，整数字段的类型与读取线程模式下的快照一致
+        """
+        status = int(record['Status'])
+        return GripperSnapshot(
+            int(record['seq']), int(record['recv_ns']),
+            float(record['Speed']), int(record['Current']), float(record['Position']),
+            float(record['Voltage']), int(record['DriverTemp']), int(record['MotorTemp']),
+            "0x%02X" % status if status >= 0 else "", int(record['BusCurrent']))
+    
+    def snapshot(self):
+        """
+        获取最新的遥测快照，所有字段来自同一帧，不加锁、不复制
+        
+        返回:
+            GripperSnapshot: 不可变的命名元组，包含seq, recv_ns, Speed, Current, Position,
+                             Voltage, DriverTemp, MotorTemp, Status, BusCurrent字段
+        """
+        if self._shared_history is not None:
+            record = self._shared_history.get_latest()
+            if record is not None:
+                return self._snapshot_from_record(record)
+        return self._snapshot
+    
+    @property
+    def motor_data(self):
+        """
+        最新电机数据，每次访问返回新的字典
+        """
+        snapshot = self.snapshot()
+        return {'Speed': snapshot.Speed, 'Current': snapshot.Current, 'Position': snapshot.Position}
+    
+    @property
+    def motor_status(self):
+        """
+        最新电机状态，每次访问返回新的字典
+        """
+        snapshot = self.snapshot()
+        return {'Voltage': snapshot.Voltage, 'DriverTemp': snapshot.DriverTemp, 'MotorTemp': snapshot.MotorTemp,
+                'Status': snapshot.Status, 'BusCurrent': snapshot.BusCurrent}
+    
+    @property
+    def frame_seq(self):
+        """
+        最近一帧电机数据的帧序号
+        """
+        return self.snapshot().seq
+    
+    @property
+    def frame_recv_ns(self):
+        """
+        最近一帧电机数据的接收时间戳(time.monotonic_ns())
+        """
+        return self.snapshot().recv_ns
+    
+    def get_history(self, seconds=None):
+        """
+        获取最近一段时间内的遥测历史
+        
+        参数:
+            seconds (float): 时间窗口长度（秒），为None时返回缓冲区内的全部记录
+            
+        返回:
+            numpy.ndarray: 结构化数组，字段见GRIPPER_HISTORY_DTYPE；未启用历史记录时返回None
+        """
+        if self.history is None:
+            logger.warning("未启用遥测历史记录")
+            return None
+        return self.history.get_history(seconds)
+    
+    def get_since(self, seq):
+        """
+        获取帧序号大于seq的遥测历史，适合增量读取
+        
+        参数:
+            seq (int): 上一次读取到的最后一个帧序号
+            
+        返回:
+            numpy.ndarray: 结构化数组，字段见GRIPPER_HISTORY_DTYPE；未启用历史记录时返回None
+        """
+        if self.history is None:
+            logger.warning("未启用遥测历史记录")
+            return None
+        return self.history.get_since(seq)
+    
+    def get_gripper_distance_history(self, seconds=None):
+        """
+        获取最近一段时间内的夹爪开合距离历史，一次换算全部记录的Position字段
+        
+        参数:
+            seconds (float): 时间窗口长度（秒），为None时返回缓冲区内的全部记录
+            
+        返回:
+            tuple: (recv_ns数组, 开合距离数组(mm))；未启用历史记录时返回None
+        """
+        records = self.get_history(seconds)
+        if records is None:
+            return None
+        return records['recv_ns'], self.kinematics.angles_to_distances(records['Position'])
+    
+    def get_motor_data(self, with_meta=False):
         """
         获取电机完整数据
         
+        参数:
+            with_meta (bool): 是否附带帧序号seq和接收时间戳recv_ns(time.monotonic_ns())，默认为False
+        
         返回:
             dict: 电机数据，包含Speed, Current, Position字段
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机数据")
-            return {'Speed': 0.0, 'Current': 0, 'Position': 0.0}
-        
-        with self.data_lock:
-            return self.motor_data.copy()
+            data = {'Speed': 0.0, 'Current': 0, 'Position': 0.0}
+            if with_meta:
+                data.update(seq=None, recv_ns=None)
+            return data
+        
+        snapshot = self.snapshot()
+        data = {'Speed': snapshot.Speed, 'Current': snapshot.Current, 'Position': snapshot.Position}
+        if with_meta:
+            data.update(seq=snapshot.seq, recv_ns=snapshot.recv_ns)
+        return data
     
-    def get_motor_status(self):
+    def get_motor_status(self, with_meta=False):
         """
         获取电机状态
         
+        参数:
+            with_meta (bool): 是否附带帧序号seq和接收时间戳recv_ns(time.monotonic_ns())，默认为False
+        
         返回:
             dict: 电机状态，包含Voltage, DriverTemp, MotorTemp, Status, BusCurrent字段
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机状态")
-            return {'Voltage': 0.0, 'DriverTemp': 0, 'MotorTemp': 0, 'Status': "0x00", 'BusCurrent': 0}
-        
-        with self.data_lock:
-            return self.motor_status.copy()
+            data = {'Voltage': 0.0, 'DriverTemp': 0, 'MotorTemp': 0, 'Status': "0x00", 'BusCurrent': 0}
+            if with_meta:
+                data.update(seq=None, recv_ns=None)
+            return data
+        
+        snapshot = self.snapshot()
+        data = {'Voltage': snapshot.Voltage, 'DriverTemp': snapshot.DriverTemp, 'MotorTemp': snapshot.MotorTemp,
+                'Status': snapshot.Status, 'BusCurrent': snapshot.BusCurrent}
+        if with_meta:
+            data.update(seq=snapshot.seq, recv_ns=snapshot.recv_ns)
+        return data
 
     def get_motor_speed(self):
         """
@@ -192,9 +383,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机转速")
-            return self.motor_data.get('Speed', 0.0)
-        with self.data_lock:
-            return self.motor_data['Speed']
+        return self.snapshot().Speed
 
     def get_motor_current(self):
         """
@@ -202,9 +391,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机电流")
-            return self.motor_data.get('Current', 0)
-        with self.data_lock:
-            return self.motor_data['Current']
+        return self.snapshot().Current
 
     def get_motor_position(self):
         """
@@ -212,28 +399,21 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机位置")
-            return self.motor_data.get('Position', 0.0)
-        with self.data_lock:
-            return self.motor_data['Position']
+        return self.snapshot().Position
 
-    def get_distance(self,angle):
-        angle = (180.0 - 43.99) / 180.0 * math.pi - angle
-        height = 0.0325 * math.sin(angle)
-        width_d = 0.0325 * math.cos(angle)
-        width = math.sqrt(0.058**2 - (height - 0.01456)**2) + width_d
-        # 将单位由m转换为mm
-        return width*1000
+    def get_distance(self, angle):
+        """
+        计算单侧宽度(mm)，保留以兼容外部代码，开合距离换算见self.kinematics
+        """
+        return self.kinematics.width(angle)
     def get_gripper_distance(self):
         """
         获取夹爪当前位置 (mm)
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机位置")
-        with self.data_lock:
-            angle = self.motor_data['Position']
-            distance = (self.get_distance(angle) - self.get_distance(0)) * 2   #default
-            # distance = (self.get_distance(angle) - 81.7) * 2
-            return distance
+        angle = self.snapshot().Position
+        return self.kinematics.angle_to_distance(angle)
             
     def get_voltage(self):
         """
@@ -241,9 +421,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电压")
-            return self.motor_status.get('Voltage', 0.0)
-        with self.data_lock:
-            return self.motor_status['Voltage']
+        return self.snapshot().Voltage
 
     def get_driver_temp(self):
         """
@@ -251,9 +429,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认驱动器温度")
-            return self.motor_status.get('DriverTemp', 0)
-        with self.data_lock:
-            return self.motor_status['DriverTemp']
+        return self.snapshot().DriverTemp
 
     def get_motor_temp(self):
         """
@@ -261,9 +437,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机温度")
-            return self.motor_status.get('MotorTemp', 0)
-        with self.data_lock:
-            return self.motor_status['MotorTemp']
+        return self.snapshot().MotorTemp
     
     def get_status_raw(self):
         """
@@ -271,9 +445,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认状态")
-            return self.motor_status.get('Status', "0x00")
-        with self.data_lock:
-            return self.motor_status['Status']
+        return self.snapshot().Status
 
     def get_bus_current(self):
         """
@@ -281,9 +453,7 @@ class Gripper:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认母线电流")
-            return self.motor_status.get('BusCurrent', 0)
-        with self.data_lock:
-            return self.motor_status['BusCurrent']
+        return self.snapshot().BusCurrent
     
     def enable(self):
         """
@@ -420,68 +590,90 @@ class Gripper:
             logger.warning("设备未连接，无法设置夹爪距离")
             return False
 
-        # 1. 根据目标夹爪行程距离反推出 get_distance(angle) 的目标值
-        # get_gripper_distance = (get_distance(angle) - get_distance(0)) * 2
-        # target_gripper_distance_mm / 2 = get_distance(angle) - get_distance(0)
-        # get_distance(angle) = target_gripper_distance_mm / 2 + get_distance(0)
-        
-        # Calculate get_distance(0) once
-        get_distance_0 = self.get_distance(0) 
-        target_width_mm = target_gripper_distance_mm / 2 + get_distance_0
-
-        # 2. 通过数值方法反向查找对应的电机角度
-        # 我们需要找到一个 'angle'，使得 self.get_distance(angle) 尽可能接近 target_width_mm
-        
-        # 定义搜索范围和精度
-        # 假设电机角度在 0 到 (180.0 - 43.99) / 180.0 * math.pi 弧度之间
-        low_angle = 0.0
-        high_angle = (180.0 - 43.99) / 180.0 * math.pi # Approximately 1.99 radians
-        
-        # 增加一个检查，确保目标距离在夹爪的有效范围内
-        # 最小夹爪距离 (angle = low_angle)
-        min_gripper_distance_at_low_angle = (self.get_distance(low_angle) - get_distance_0) * 2
-        # 最大夹爪距离 (angle = high_angle)
-        max_gripper_distance_at_high_angle = (self.get_distance(high_angle) - get_distance_0) * 2
-
-        # Ensure target_gripper_distance_mm is within the valid range
-        if not (min_gripper_distance_at_low_angle <= target_gripper_distance_mm <= max_gripper_distance_at_high_angle):
-            logger.error(f"目标夹爪距离 {target_gripper_distance_mm:.2f} mm 超出有效范围 [{min_gripper_distance_at_low_angle:.2f}, {max_gripper_distance_at_high_angle:.2f}] mm")
+        # 通过逆查找表将开合距离换算为电机弧度（常数时间，见pika.kinematics）
+        kinematics = self.kinematics
+        if not (kinematics.min_distance <= target_gripper_distance_mm <= kinematics.max_distance):
+            logger.error(f"目标夹爪距离 {target_gripper_distance_mm:.2f} mm 超出有效范围 [{kinematics.min_distance:.2f}, {kinematics.max_distance:.2f}] mm")
             return False
+        found_angle = kinematics.distance_to_angle(target_gripper_distance_mm)
 
-        tolerance = 0.01 # 夹爪距离的容差 (mm)
-        angle_tolerance = 0.00001 # 角度的容差 (rad)
-        max_iterations = 1000
-
-        found_angle = None
-
-        for i in range(max_iterations):
-            mid_angle = (low_angle + high_angle) / 2
-            current_width_mm = self.get_distance(mid_angle)
-            
-            # Check if the current_width_mm is close enough to target_width_mm
-            if abs(current_width_mm - target_width_mm) < tolerance:
-                found_angle = mid_angle
-                break
+        self.set_motor_angle(found_angle)
+        if show_debug:
+            logger.info(f"夹爪已设置为目标距离 {target_gripper_distance_mm} mm，对应电机角度 {found_angle:.4f} rad")
+        return True
+    
+    def distances_to_angles(self, distances, clip=False):
+        """
+        将一组夹爪开合距离（如规划的轨迹）一次换算为电机弧度
+        
+        参数:
+            distances (array_like): 开合距离数组(mm)
+            clip (bool): 超出有效范围的值是否截断到边界，为False时抛出ValueError，默认为False
             
-            # Since get_distance(angle) increases with angle:
-            if current_width_mm < target_width_mm:
-                low_angle = mid_angle
-            else:
-                high_angle = mid_angle
+        返回:
+            numpy.ndarray: 电机弧度数组，可逐点传给set_motor_angle()
+        """
+        return self.kinematics.distances_to_angles(distances, clip)
+    
+    def follow_trajectory(self, times, values, unit=TrajectoryUnit.ANGLE, rate=100.0, preempt=True):
+        """
+        在独立的调度线程中执行一条轨迹，按命令频率插值并在各截止时间发送位置设定值
+        
+        参数:
+            times (array_like): 轨迹点时间（秒），严格递增，以第一个点为起点
+            values (array_like): 轨迹点数值，长度与times相同
+            unit (str): 数值单位，TrajectoryUnit.ANGLE（电机弧度）或TrajectoryUnit.DISTANCE（开合距离mm），默认为ANGLE
+            rate (float): 命令频率(Hz)，默认为100.0
+            preempt (bool): 已有轨迹在执行时是否取代它，为False时不执行新轨迹，默认为True
             
-            # If the angle range becomes too small, stop
-            if (high_angle - low_angle) < angle_tolerance:
-                found_angle = mid_angle # Use the midpoint as the best approximation
-                break
-
-        if found_angle is not None:
-            self.set_motor_angle(found_angle)
-            if show_debug:
-                logger.info(f"夹爪已设置为目标距离 {target_gripper_distance_mm} mm，对应电机角度 {found_angle:.4f} rad")
-            return True
+        返回:
+            TrajectoryRun: 轨迹执行句柄，可用于wait()/cancel()/get_stats()；失败时返回None
+        """
+        if not self.is_connected:
+            logger.error("设备未连接，无法执行轨迹")
+            return None
+        
+        # 开合距离一次换算为电机弧度，超出有效范围时截断到边界
+        if unit == TrajectoryUnit.DISTANCE:
+            angles = self.kinematics.distances_to_angles(values, clip=True)
+        elif unit == TrajectoryUnit.ANGLE:
+            angles = np.clip(np.asarray(values, dtype=np.float64), 0.0, self.kinematics.max_angle)
         else:
-            logger.error(f"未能找到目标夹爪距离 {target_gripper_distance_mm} mm 对应的电机角度")
-            return False
+            logger.error(f"不支持的轨迹单位: {unit}")
+            return None
+        try:
+            run = TrajectoryRun(self, times, angles, rate, name=f"trajectory-{self.port}")
+        except ValueError as e:
+            logger.error(f"轨迹参数无效: {e}")
+            return None
+        
+        with self._trajectory_lock:
+            current = self._trajectory
+            if current is not None and current.is_running():
+                if not preempt:
+                    logger.warning("已有轨迹正在执行，新轨迹未执行")
+                    return None
+                current.cancel(state=TrajectoryState.PREEMPTED)
+            self._trajectory = run
+            run.start()
+        logger.info(f"开始执行轨迹: {run.points}个设定值，时长{run.duration:.3f}秒，命令频率{rate}Hz")
+        return run
+    
+    def cancel_trajectory(self):
+        """
+        取消正在执行的轨迹，夹爪保持最后一次发送的设定值
+        
+        返回:
+            bool: 是否有轨迹被取消
+        """
+        with self._trajectory_lock:
+            current = self._trajectory
+            if current is None or not current.is_running():
+                return False
+            current.cancel()
+        logger.info("轨迹已取消")
+        return True
+    
     def set_velocity(self, velocity):
         """
         设置电机速度
@@ -514,6 +706,22 @@ class Gripper:
         
         return self.serial_comm.send_command(CommandType.EFFORT_CTRL, effort)
     
+    def send_commands(self, commands):
+        """
+        将多条命令打包后一次写入串口，例如先使能再设置位置
+        
+        参数:
+            commands (list): 命令列表，每项为(CommandType, value)
+            
+        返回:
+            bool: 操作是否成功
+        """
+        if not self.is_connected:
+            logger.error("设备未连接，无法发送命令")
+            return False
+        
+        return self.serial_comm.send_commands(commands)
+    
     def set_camera_param(self,camera_width,camera_height,camera_fps,fisheye_thread_fps=100):
         '''
         设置相机分辨率和帧率
@@ -592,6 +800,87 @@ class Gripper:
         
         return self._realsense_camera
     
+    def add_connection_listener(self, listener):
+        """
+        注册串口连接事件监听函数，用于感知链路断开、自动重连和数据恢复
+        
+        参数:
+            listener (callable): 监听函数，参数为(event, info)，event为ConnectionEvent中的值
+                                 （LOST/RECONNECTED/RESUMED），info为事件信息字典
+        """
+        self.serial_comm.add_connection_listener(listener)
+    
+    def is_link_up(self):
+        """
+        串口链路当前是否可用，自动重连期间返回False
+        
+        返回:
+            bool: 链路是否可用
+        """
+        return self.is_connected and self.serial_comm.is_connected
+    
+    def add_callback(self, callback, name=None):
+        """
+        注册数据帧回调函数，回调在独立的分发线程中执行，不会延误串口数据的解析；
+        分发模式、队列长度和背压通知可通过serial_comm.start_dispatcher()设置
+        
+        参数:
+            callback (callable): 回调函数，接收数据帧(dict)
+            name (str): 回调名称，用于统计信息，默认为函数名
+            
+        返回:
+            CallbackHandle: 回调句柄，可用于remove_callback
+        """
+        return self.serial_comm.add_callback(callback, name)
+    
+    def remove_callback(self, handle):
+        """
+        移除数据帧回调函数
+        
+        参数:
+            handle (CallbackHandle): add_callback()返回的回调句柄
+        """
+        self.serial_comm.remove_callback(handle)
+    
+    def subscribe(self, maxsize=64, policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.005, name=None):
+        """
+        订阅数据帧，适合日志记录、控制回路、界面显示等多个消费者同时获取每一帧数据；
+        慢速订阅者只会丢失自己的数据帧，不会阻塞读取线程
+        
+        参数:
+            maxsize (int): 队列最大长度，默认为64
+            policy (str): 队列已满时的处理策略，OverflowPolicy.DROP_OLDEST/DROP_NEWEST/BLOCK，
+                          默认为丢弃最旧的帧
+            block_timeout (float): BLOCK策略下读取线程的最长等待时间（秒），默认为0.005
+            name (str): 订阅者名称，用于统计信息
+            
+        返回:
+            Subscription: 订阅对象，可通过get()或迭代获取数据帧，断开连接后迭代结束
+        """
+        return self.serial_comm.subscribe(maxsize, policy, block_timeout, name)
+    
+    def unsubscribe(self, subscription):
+        """
+        取消订阅
+        
+        参数:
+            subscription (Subscription): subscribe()返回的订阅对象
+        """
+        self.serial_comm.unsubscribe(subscription)
+    
+    def get_timing_stats(self):
+        """
+        获取串口数据帧的到达间隔抖动和序号间断统计
+        
+        返回:
+            dict: 统计信息，包含frames, gaps, frames_missing, stalls, frames_collapsed, interval_ms字段；
+                  统计信息不可用（如子进程读取模式下尚未连接）时返回None
+        """
+        stats = self.serial_comm.get_stats()
+        if stats is None:
+            return None
+        return stats['timing']
+    
     def get_version(self):
         """
         获取Gripper的版本信息
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+遥测历史数据模块，提供基于NumPy结构化数组的定长环形缓冲区
+"""
+
+import time
+import threading
+import numpy as np
+
+# Gripper历史数据字段
+GRIPPER_HISTORY_DTYPE = np.dtype([
+    ('seq', np.int64),          # 帧序号
+    ('recv_ns', np.int64),      # 接收时间戳(time.monotonic_ns())
+    ('Speed', np.float64),      # 电机转速(rad/s)
+    ('Current', np.float64),    # 电机相电流(mA)
+    ('Position', np.float64),   # 电机位置(rad)
+    ('Voltage', np.float64),    # 驱动器电压(V)
+    ('DriverTemp', np.float64), # 驱动器温度(°C)
+    ('MotorTemp', np.float64),  # 电机温度(°C)
+    ('Status', np.int32),       # 驱动器状态，无法解析时为-1
+    ('BusCurrent', np.float64)  # 母线电流(mA)
+])
+
+# Sense历史数据字段
+SENSE_HISTORY_DTYPE = np.dtype([
+    ('seq', np.int64),          # 帧序号
+    ('recv_ns', np.int64),      # 接收时间戳(time.monotonic_ns())
+    ('angle', np.float64),      # 编码器角度(°)
+    ('rad', np.float64),        # 编码器弧度(rad)
+    ('Command', np.int32),      # 命令状态
+    ('acc', np.float64, (3,)),  # IMU加速度
+    ('gyr', np.float64, (3,)),  # IMU角速度
+    ('pitch', np.float64),
+    ('roll', np.float64),
+    ('yaw', np.float64)
+])
+
+
+class TelemetryHistory:
+    """
+    遥测历史环形缓冲区
+
+    由读取线程写入，查询时直接对结构化数组做切片，不为每个样本创建Python对象。
+    dtype中必须包含按时间单调递增的seq和recv_ns字段。
+
+    参数:
+        dtype (numpy.dtype): 每条记录的结构化数据类型
+        capacity (int): 缓冲区容量（记录条数），默认为4096
+    """
+    def __init__(self, dtype, capacity=4096):
+        if capacity <= 0:
+            raise ValueError("历史缓冲区容量必须大于0")
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._count = 0  # 累计写入的记录数
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def append(self, record):
+        """
+        写入一条记录，缓冲区满后覆盖最旧的记录
+
+        参数:
+            record (tuple): 与dtype字段顺序一致的记录
+        """
+        with self._lock:
+            self._data[self._count % self.capacity] = record
+            self._count += 1
+
+    def clear(self):
+        """
+        清空缓冲区
+        """
+        with self._lock:
+            self._count = 0
+
+    def _segments(self):
+        """
+        按时间顺序返回有效数据所在的两段切片（需持有锁）
+        """
+        head = self._count % self.capacity
+        if self._count <= self.capacity:
+            return (self._data[:self._count],)
+        return (self._data[head:], self._data[:head])
+
+    def _select(self, field, threshold, side):
+        """
+        返回field字段不小于(side='left')或大于(side='right')threshold的记录
+        """
+        with self._lock:
+            parts = []
+            for segment in self._segments():
+                index = np.searchsorted(segment[field], threshold, side=side)
+                if index < len(segment):
+                    parts.append(segment[index:])
+            if not parts:
+                return np.empty(0, dtype=self.dtype)
+            if len(parts) == 1:
+                return parts[0].copy()
+            return np.concatenate(parts)
+
+    def get_history(self, seconds=None):
+        """
+        获取最近一段时间内的历史记录
+
+        参数:
+            seconds (float): 时间窗口长度（秒），为None时返回缓冲区内的全部记录
+
+        返回:
+            numpy.ndarray: 按时间顺序排列的结构化数组
+        """
+        if seconds is None:
+            return self._select('seq', np.iinfo(np.int64).min, 'left')
+        threshold = time.monotonic_ns() - int(seconds * 1e9)
+        return self._select('recv_ns', threshold, 'left')
+
+    def get_since(self, seq):
+        """
+        获取帧序号大于seq的历史记录，适合增量读取
+
+        参数:
+            seq (int): 上一次读取到的最后一个帧序号
+
+        返回:
+            numpy.ndarray: 按时间顺序排列的结构化数组
+        """
+        return self._select('seq', seq, 'right')
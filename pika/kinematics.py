@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+夹爪连杆运动学模块，负责电机/编码器弧度与夹爪开合距离(mm)之间的换算
+
+夹爪单侧为曲柄-连杆机构：曲柄绕电机轴转动，连杆另一端在导轨上平移，
+单侧宽度 = sqrt(连杆² - (曲柄·sin(θ) - 偏距)²) + 曲柄·cos(θ)，其中θ = 安装角 - 弧度。
+开合距离为两侧宽度相对弧度为0时的增量之和。零点宽度只计算一次，
+标量换算使用预先计算的查找表并线性插值，数组换算使用NumPy向量化计算。
+
+开合距离在弧度约2.21处取得最大值后略有回落，逆换算（开合距离→弧度）只在
+[0, 弧度上限处的开合距离]内、取上升段的解，与原先逐次二分查找的结果一致；
+逆查找表的节点以向量化二分法求得，查表时为按开合距离等间隔的常数时间插值。
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+
+# 连杆参数，长度单位为m
+LinkageParams = namedtuple('LinkageParams', [
+    'crank',        # 曲柄长度(m)
+    'coupler',      # 连杆长度(m)
+    'offset',       # 导轨相对电机轴的偏距(m)
+    'base_angle'    # 弧度为0时曲柄与导轨的夹角(rad)，也是电机弧度的上限
+])
+
+GRIPPER_LINKAGE = LinkageParams(crank=0.0325, coupler=0.058, offset=0.01456,
+                                base_angle=(180.0 - 43.99) / 180.0 * math.pi)
+SENSE_LINKAGE = LinkageParams(crank=0.0325, coupler=0.058, offset=0.01456,
+                              base_angle=(180.0 - 43.99) / 180.0 * math.pi)
+
+# 查找表点数，相邻两点间隔约1mrad，线性插值误差远小于0.001mm
+DEFAULT_TABLE_SIZE = 2048
+# 逆查找表节点的二分次数，足以收敛到双精度
+_INVERSE_BISECT_STEPS = 60
+
+
+class GripperKinematics:
+    """
+    夹爪连杆运动学换算
+
+    参数:
+        params (LinkageParams): 连杆参数，默认为GRIPPER_LINKAGE
+        table_size (int): 查找表点数，正查找表覆盖弧度[0, params.base_angle]，
+                          逆查找表覆盖开合距离[min_distance, max_distance]，默认为DEFAULT_TABLE_SIZE
+    """
+    def __init__(self, params=GRIPPER_LINKAGE, table_size=DEFAULT_TABLE_SIZE):
+        self.params = params
+        self.max_angle = params.base_angle
+        # 弧度为0时的单侧宽度(mm)
+        self.zero_width = self.width(0.0)
+        self.min_distance = 0.0
+        self.max_distance = self.angle_to_distance_exact(self.max_angle)
+        self.table_angles = np.linspace(0.0, self.max_angle, table_size)
+        self.table_distances = self.angles_to_distances(self.table_angles)
+        # 标量查找使用Python列表，避免逐个访问NumPy数组元素的开销
+        self._table = self.table_distances.tolist()
+        self._scale = (table_size - 1) / self.max_angle
+        self._last_index = table_size - 1
+        # 逆查找表：按开合距离等间隔取点
+        self.inverse_distances = np.linspace(self.min_distance, self.max_distance, table_size)
+        self.inverse_angles = self._bisect_angles(self.inverse_distances)
+        self._inverse_table = self.inverse_angles.tolist()
+        self._inverse_scale = (table_size - 1) / (self.max_distance - self.min_distance)
+
+    def width(self, angle):
+        """
+        计算单侧宽度(mm)
+
+        参数:
+            angle (float): 电机/编码器弧度
+
+        返回:
+            float: 单侧宽度(mm)
+        """
+        p = self.params
+        theta = p.base_angle - angle
+        height = p.crank * math.sin(theta)
+        width = math.sqrt(p.coupler ** 2 - (height - p.offset) ** 2) + p.crank * math.cos(theta)
+        # 将单位由m转换为mm
+        return width * 1000
+
+    def angle_to_distance_exact(self, angle):
+        """
+        按连杆公式直接计算开合距离(mm)
+        """
+        return (self.width(angle) - self.zero_width) * 2
+
+    def angle_to_distance(self, angle):
+        """
+        将弧度换算为夹爪开合距离(mm)，弧度在[0, max_angle]内时查表插值，超出时按公式计算
+
+        参数:
+            angle (float): 电机/编码器弧度
+
+        返回:
+            float: 开合距离(mm)
+        """
+        x = angle * self._scale
+        if 0.0 <= x < self._last_index:
+            i = int(x)
+            table = self._table
+            low = table[i]
+            return low + (table[i + 1] - low) * (x - i)
+        return self.angle_to_distance_exact(angle)
+
+    def angles_to_distances(self, angles):
+        """
+        将一组弧度（如遥测历史中的Position或rad字段）一次换算为开合距离(mm)
+
+        参数:
+            angles (array_like): 弧度数组
+
+        返回:
+            numpy.ndarray: 与angles形状相同的开合距离数组(mm)
+        """
+        p = self.params
+        theta = p.base_angle - np.asarray(angles, dtype=np.float64)
+        height = p.crank * np.sin(theta)
+        width = np.sqrt(p.coupler ** 2 - (height - p.offset) ** 2) + p.crank * np.cos(theta)
+        return (width * 1000 - self.zero_width) * 2
+
+    def _bisect_angles(self, distances):
+        """
+        以向量化二分法求开合距离对应的弧度，搜索区间与判定条件同原先的逐次二分查找
+        """
+        target = np.asarray(distances, dtype=np.float64)
+        low = np.zeros_like(target)
+        high = np.full_like(target, self.max_angle)
+        for _ in range(_INVERSE_BISECT_STEPS):
+            mid = (low + high) / 2
+            below = self.angles_to_distances(mid) < target
+            low = np.where(below, mid, low)
+            high = np.where(below, high, mid)
+        return (low + high) / 2
+
+    def distance_to_angle(self, distance):
+        """
+        将夹爪开合距离(mm)换算为电机弧度，常数时间查表插值
+
+        参数:
+            distance (float): 开合距离(mm)，取值范围[min_distance, max_distance]
+
+        返回:
+            float: 电机弧度
+
+        异常:
+            ValueError: 开合距离超出有效范围
+        """
+        x = (distance - self.min_distance) * self._inverse_scale
+        if not 0.0 <= x <= self._last_index:
+            raise ValueError(f"开合距离 {distance:.2f} mm 超出有效范围 "
+                             f"[{self.min_distance:.2f}, {self.max_distance:.2f}] mm")
+        i = min(int(x), self._last_index - 1)
+        table = self._inverse_table
+        low = table[i]
+        return low + (table[i + 1] - low) * (x - i)
+
+    def distances_to_angles(self, distances, clip=False):
+        """
+        将一组开合距离（如规划的轨迹）一次换算为电机弧度
+
+        参数:
+            distances (array_like): 开合距离数组(mm)
+            clip (bool): 超出有效范围的值是否截断到边界，为False时抛出ValueError，默认为False
+
+        返回:
+            numpy.ndarray: 与distances形状相同的电机弧度数组
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        if clip:
+            distances = np.clip(distances, self.min_distance, self.max_distance)
+        elif distances.size and (distances.min() < self.min_distance or distances.max() > self.max_distance):
+            raise ValueError(f"开合距离超出有效范围 [{self.min_distance:.2f}, {self.max_distance:.2f}] mm")
+        return np.interp(distances, self.inverse_distances, self.inverse_angles)
+
+
+@lru_cache(maxsize=None)
+def get_kinematics(params):
+    """
+    获取连杆参数对应的运动学换算对象，相同参数的设备共用同一个对象和查找表
+
+    参数:
+        params (LinkageParams): 连杆参数
+
+    返回:
+        GripperKinematics: 运动学换算对象
+    """
+    return GripperKinematics(params)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+统计工具模块，为串口通信等模块提供轻量级的运行时指标统计
+"""
+
+import math
+
+
+def percentile(sorted_values, p):
+    """
+    计算已排序样本的百分位数（最近秩法）
+
+    参数:
+        sorted_values (list): 升序排列的样本
+        p (float): 百分位，取值0~100
+
+    返回:
+        float: 百分位数，样本为空时返回nan
+    """
+    if not len(sorted_values):
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RunningStats:
+    """
+    增量统计类，使用Welford算法在线计算样本的均值、方差、最小值和最大值，
+    不保存样本本身，适合在读取线程中高频调用
+    """
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        清空所有统计数据
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.last = None
+
+    def add(self, value):
+        """
+        添加一个样本
+
+        参数:
+            value (float): 样本值
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.last = value
+
+    @property
+    def variance(self):
+        """
+        样本方差，样本数不足2个时为0
+        """
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        """
+        样本标准差
+        """
+        return math.sqrt(self.variance)
+
+    def as_dict(self):
+        """
+        以字典形式返回统计结果
+
+        返回:
+            dict: 包含count, mean, std, min, max, last字段
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min,
+            'max': self.max,
+            'last': self.last
+        }
+
+
+class FrameTimingStats:
+    """
+    数据帧到达时间统计类，统计帧间隔抖动以及序号间断（丢帧）情况
+
+    参数:
+        stall_factor (float): 帧间隔超过平均间隔的倍数时记为一次停顿，默认为3.0
+        warmup (int): 开始判定停顿前需要累积的间隔样本数，默认为10
+    """
+    def __init__(self, stall_factor=3.0, warmup=10):
+        self.stall_factor = stall_factor
+        self.warmup = warmup
+        self.interval_ms = RunningStats()
+        self.reset()
+
+    def reset(self):
+        """
+        清空所有统计数据
+        """
+        self.interval_ms.reset()
+        self.frames = 0
+        self.gaps = 0              # 序号间断的次数
+        self.frames_missing = 0    # 序号间断中缺失的帧总数
+        self.stalls = 0            # 帧间隔异常偏大的次数
+        self.frames_collapsed = 0  # 交付前被合并的帧数，不计入序号间断
+        self.last_seq = None
+        self.last_recv_ns = None
+
+    def add(self, seq, recv_ns, collapsed=0):
+        """
+        记录一帧的序号和接收时间戳
+
+        参数:
+            seq (int): 帧序号
+            recv_ns (int): 接收时间戳，time.monotonic_ns()
+            collapsed (int): 紧接在该帧之前、被合并到该帧中的帧数（DeliveryMode.LATEST_ONLY），
+                             这些帧的序号不计为间断，默认为0
+        """
+        self.frames += 1
+        self.frames_collapsed += collapsed
+        if self.last_seq is not None:
+            missing = seq - self.last_seq - 1 - collapsed
+            if missing > 0:
+                self.gaps += 1
+                self.frames_missing += missing
+            interval = (recv_ns - self.last_recv_ns) / 1e6
+            if (self.interval_ms.count >= self.warmup
+                    and interval > self.stall_factor * self.interval_ms.mean):
+                self.stalls += 1
+            self.interval_ms.add(interval)
+        self.last_seq = seq
+        self.last_recv_ns = recv_ns
+
+    def as_dict(self):
+        """
+        以字典形式返回统计结果
+
+        返回:
+            dict: 包含frames, gaps, frames_missing, stalls, frames_collapsed, interval_ms字段，
+                  interval_ms中的std即为帧间隔抖动
+        """
+        return {
+            'frames': self.frames,
+            'gaps': self.gaps,
+            'frames_missing': self.frames_missing,
+            'stalls': self.stalls,
+            'frames_collapsed': self.frames_collapsed,
+            'interval_ms': self.interval_ms.as_dict()
+        }
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+子进程串口读取模块，在独立进程中完成串口读取和解析，通过共享内存发布遥测数据
+
+主进程中长时间占用GIL的线程（模型推理、图像处理等）不会再延误串口数据的读取和
+时间戳标记：子进程把每帧数据写入multiprocessing.shared_memory中的环形缓冲区，
+主进程的Sense/Gripper直接从共享内存读取最新快照和历史；命令通过管道发给子进程写出。
+逐帧回调和订阅由主进程中的转发线程从共享内存历史重建数据帧后分发，连接事件由子进程经
+独立管道通知。
+"""
+
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from .serial_comm import SerialComm, DeliveryMode, ReadMode, ConnectionEvent, encode_command, encode_commands
+from .subscription import SubscriptionHub
+from .history import TelemetryHistory, GRIPPER_HISTORY_DTYPE, SENSE_HISTORY_DTYPE
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.process_reader")
+
+# 共享内存头部：int64写入计数，其余保留
+_HEADER_SIZE = 64
+
+
+class DeviceType:
+    """
+    子进程中读取的设备类型
+    """
+    GRIPPER = 'gripper'
+    SENSE = 'sense'
+
+
+_DEVICE_DTYPES = {
+    DeviceType.GRIPPER: GRIPPER_HISTORY_DTYPE,
+    DeviceType.SENSE: SENSE_HISTORY_DTYPE
+}
+
+
+class SharedTelemetryHistory(TelemetryHistory):
+    """
+    位于共享内存中的遥测历史环形缓冲区，由子进程单写、主进程读取
+
+    写入方先写记录再递增计数；读取方复制数据后根据前后两次读到的计数
+    丢弃复制期间可能被覆盖的最旧记录，因此读取时无需跨进程加锁。
+
+    参数:
+        dtype (numpy.dtype): 每条记录的结构化数据类型
+        capacity (int): 缓冲区容量（记录条数）
+        buffer: 共享内存缓冲区，为None时缓冲区为空，可稍后调用attach()
+    """
+    def __init__(self, dtype, capacity, buffer=None):
+        self._header = np.zeros(1, dtype=np.int64)
+        super().__init__(dtype, capacity)
+        if buffer is not None:
+            self.attach(buffer)
+
+    @staticmethod
+    def buffer_size(dtype, capacity):
+        """
+        返回所需的共享内存字节数
+        """
+        return _HEADER_SIZE + np.dtype(dtype).itemsize * capacity
+
+    def attach(self, buffer):
+        """
+        使用共享内存缓冲区
+        """
+        self._header = np.ndarray((1,), dtype=np.int64, buffer=buffer, offset=0)
+        self._data = np.ndarray((self.capacity,), dtype=self.dtype, buffer=buffer, offset=_HEADER_SIZE)
+
+    def detach(self):
+        """
+        释放对共享内存的引用，之后缓冲区为空
+        """
+        self._header = np.zeros(1, dtype=np.int64)
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+
+    @property
+    def _count(self):
+        return int(self._header[0])
+
+    @_count.setter
+    def _count(self, value):
+        self._header[0] = value
+
+    def append(self, record):
+        """
+        写入一条记录（仅由子进程调用）
+        """
+        count = int(self._header[0])
+        self._data[count % self.capacity] = record
+        self._header[0] = count + 1
+
+    def get_latest(self):
+        """
+        获取最新的一条记录
+
+        返回:
+            numpy.void: 最新记录的副本，尚无数据时返回None
+        """
+        while True:
+            count = int(self._header[0])
+            if count == 0:
+                return None
+            record = self._data[(count - 1) % self.capacity].copy()
+            if int(self._header[0]) - count < self.capacity - 1:
+                return record
+
+    def _select(self, field, threshold, side):
+        capacity = self.capacity
+        start_count = int(self._header[0])
+        if start_count <= capacity:
+            data = self._data[:start_count].copy()
+        else:
+            head = start_count % capacity
+            data = np.concatenate((self._data[head:], self._data[:head]))
+        end_count = int(self._header[0])
+        # 复制期间被覆盖（或正在被覆盖）的最旧记录
+        torn = max(0, end_count + 1 - capacity) - max(0, start_count - capacity)
+        if torn > 0:
+            data = data[torn:]
+        index = np.searchsorted(data[field], threshold, side=side)
+        return data[index:]
+
+
+def _gripper_frame(record):
+    """
+    由Gripper历史记录重建数据帧，字段与固件帧解析结果一致
+    """
+    status = int(record['Status'])
+    return {
+        'motor': {
+            'Speed': float(record['Speed']),
+            'Current': int(record['Current']),
+            'Position': float(record['Position'])
+        },
+        'motorstatus': {
+            'Voltage': float(record['Voltage']),
+            'DriverTemp': int(record['DriverTemp']),
+            'MotorTemp': int(record['MotorTemp']),
+            'Status': "0x%02X" % status if status >= 0 else "",
+            'BusCurrent': int(record['BusCurrent'])
+        },
+        'seq': int(record['seq']),
+        'recv_ns': int(record['recv_ns'])
+    }
+
+
+def _sense_frame(record):
+    """
+    由Sense历史记录重建数据帧，字段与固件帧解析结果一致
+    """
+    return {
+        'Command': int(record['Command']),
+        'AS5047': {
+            'angle': float(record['angle']),
+            'rad': float(record['rad'])
+        },
+        'IMU': {
+            'acc': record['acc'].tolist(),
+            'gyr': record['gyr'].tolist(),
+            'pitch': float(record['pitch']),
+            'roll': float(record['roll']),
+            'yaw': float(record['yaw'])
+        },
+        'seq': int(record['seq']),
+        'recv_ns': int(record['recv_ns'])
+    }
+
+
+_DEVICE_FRAMES = {
+    DeviceType.GRIPPER: _gripper_frame,
+    DeviceType.SENSE: _sense_frame
+}
+
+
+def _reader_main(device_type, port, shm_name, capacity, conn, event_conn, options):
+    """
+    子进程入口：读取串口、写共享内存，并执行主进程发来的命令；连接事件经event_conn通知主进程
+    """
+    # 延迟导入，避免循环导入
+    from .gripper import Gripper
+    from .sense import Sense
+
+    # spawn方式启动的子进程与主进程共用资源跟踪器，共享内存由主进程负责释放
+    shm = shared_memory.SharedMemory(name=shm_name)
+    history = SharedTelemetryHistory(_DEVICE_DTYPES[device_type], capacity, shm.buf)
+
+    comm = SerialComm(port=port, **options)
+    device_class = Gripper if device_type == DeviceType.GRIPPER else Sense
+    device = device_class(port, history_capacity=0, serial_comm=comm)
+    history_key = 'motor' if device_type == DeviceType.GRIPPER else 'AS5047'
+
+    def on_frame(frame):
+        device._data_callback(frame)
+        if history_key in frame:
+            history.append(device._history_record(device._snapshot))
+
+    def on_connection_event(event, info):
+        try:
+            event_conn.send((event, info))
+        except (OSError, BrokenPipeError):
+            pass
+
+    if not comm.connect():
+        conn.send(('error', f"无法打开串口: {port}"))
+        history.detach()
+        shm.close()
+        return
+    comm.add_connection_listener(on_connection_event)
+    comm.start_reading_thread(callback=on_frame)
+    conn.send(('ready', None))
+
+    try:
+        while True:
+            try:
+                message, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message == 'send':
+                comm.send_data(payload)
+            elif message == 'stats':
+                conn.send(('stats', comm.get_stats()))
+            elif message == 'frame_keys':
+                comm.set_frame_keys(payload)
+            elif message == 'stop':
+                break
+    finally:
+        comm.disconnect()
+        event_conn.close()
+        history.detach()
+        shm.close()
+
+
+class ProcessSerialComm:
+    """
+    子进程串口通信类，可作为serial_comm参数传给Sense和Gripper
+
+    串口读取、帧解析和时间戳标记都在子进程中完成，遥测快照和历史通过共享内存读取，
+    Sense/Gripper的读取接口、历史接口和命令接口保持不变。逐帧回调和订阅由主进程中的转发线程
+    每RELAY_POLL_INTERVAL秒从共享内存历史取出新记录、重建数据帧后分发（帧包含快照中的全部字段），
+    没有回调和订阅时转发线程只等待连接事件；连接事件由子进程通知后在转发线程中调用监听函数。
+
+    参数:
+        port (str): 串口设备路径
+        device_type (str): 设备类型，DeviceType.GRIPPER或DeviceType.SENSE
+        history_capacity (int): 共享内存历史缓冲区容量（帧数），默认为4096
+        baudrate (int): 波特率，默认为460800
+        delivery_mode (str): 子进程中的数据帧交付模式，默认为DeliveryMode.EVERY_FRAME
+        read_mode (str): 子进程中的读取模式，默认为ReadMode.EVENT
+        auto_reconnect (bool): 子进程中是否自动重连，默认为False
+        start_timeout (float): 等待子进程打开串口的最长时间（秒），默认为10.0
+    """
+    # 快速解码器和帧键名由子进程中的设备类自行设置
+    REMOTE_PARSING = True
+    # 有回调或订阅时转发线程检查共享内存历史的间隔（秒）
+    RELAY_POLL_INTERVAL = 0.001
+    # 没有回调和订阅时转发线程等待连接事件的超时时间（秒）
+    RELAY_IDLE_INTERVAL = 0.02
+
+    def __init__(self, port, device_type=DeviceType.GRIPPER, history_capacity=4096, baudrate=460800,
+                 delivery_mode=DeliveryMode.EVERY_FRAME, read_mode=ReadMode.EVENT,
+                 auto_reconnect=False, start_timeout=10.0):
+        if device_type not in _DEVICE_DTYPES:
+            raise ValueError(f"不支持的设备类型: {device_type}")
+        if history_capacity <= 0:
+            raise ValueError("历史缓冲区容量必须大于0")
+        self.port = port
+        self.device_type = device_type
+        self.start_timeout = start_timeout
+        self.options = {
+            'baudrate': baudrate,
+            'delivery_mode': delivery_mode,
+            'read_mode': read_mode,
+            'auto_reconnect': auto_reconnect
+        }
+        self.decoder = None
+        self.is_connected = False
+        self.shared_history = SharedTelemetryHistory(_DEVICE_DTYPES[device_type], history_capacity)
+        self._shm = None
+        self._process = None
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self.frame_keys = ()
+        # 主进程中的逐帧回调、订阅和连接事件
+        self.subscriptions = SubscriptionHub()
+        self.dispatcher = None
+        self._connection_listeners = ()
+        self._event_conn = None
+        self._relay_thread = None
+        self._relay_stop = threading.Event()
+
+    def connect(self):
+        """
+        创建共享内存并启动子进程打开串口
+
+        返回:
+            bool: 连接是否成功
+        """
+        if self.is_connected:
+            return True
+        history = self.shared_history
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=SharedTelemetryHistory.buffer_size(history.dtype, history.capacity))
+        self._shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        history.attach(self._shm.buf)
+
+        # 使用spawn方式启动，避免在多线程进程中fork
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self._event_conn, child_event_conn = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_reader_main, name="pika-serial-reader",
+            args=(self.device_type, self.port, self._shm.name, history.capacity, child_conn,
+                  child_event_conn, self.options))
+        self._process.daemon = True
+        self._process.start()
+        child_conn.close()
+        child_event_conn.close()
+
+        if self._conn.poll(self.start_timeout):
+            try:
+                status, message = self._conn.recv()
+            except (EOFError, OSError):
+                status, message = 'error', "子进程异常退出"
+        else:
+            status, message = 'error', "等待子进程启动超时"
+        if status != 'ready':
+            logger.error(f"连接串口设备失败: {message}")
+            self._shutdown()
+            return False
+        self.is_connected = True
+        if self.frame_keys:
+            self._request(('frame_keys', self.frame_keys))
+        self._resume_dispatcher()
+        self._relay_stop.clear()
+        self._relay_thread = threading.Thread(target=self._relay_thread_func, name="pika-process-relay", daemon=True)
+        self._relay_thread.start()
+        logger.info(f"已在子进程中连接串口设备: {self.port}")
+        return True
+
+    def disconnect(self):
+        """
+        停止子进程并释放共享内存
+        """
+        if self._process is None:
+            return
+        self._request(('stop', None))
+        self._shutdown()
+        self.subscriptions.close()
+        self.stop_dispatcher()
+        if self.is_connected:
+            self.is_connected = False
+            logger.info(f"已断开串口设备连接: {self.port}")
+
+    def _shutdown(self):
+        if self._relay_thread is not None:
+            self._relay_stop.set()
+            self._relay_thread.join()
+            self._relay_thread = None
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._event_conn is not None:
+            self._event_conn.close()
+            self._event_conn = None
+        self.shared_history.detach()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _request(self, message, reply=False):
+        """
+        向子进程发送消息
+
+        返回:
+            reply为True时返回子进程的应答内容，失败时返回None；否则返回是否发送成功
+        """
+        with self._conn_lock:
+            if self._conn is None:
+                return None if reply else False
+            try:
+                self._conn.send(message)
+                if reply:
+                    return self._conn.recv()[1]
+                return True
+            except (EOFError, OSError, BrokenPipeError) as e:
+                logger.error(f"与串口子进程通信失败: {e}")
+                self.is_connected = False
+                return None if reply else False
+
+    def _relay_thread_func(self):
+        """
+        转发线程函数：通知子进程的连接事件，并将共享内存历史中的新记录重建为数据帧分发给回调和订阅者
+        """
+        build_frame = _DEVICE_FRAMES[self.device_type]
+        history = self.shared_history
+        events = self._event_conn
+        latest = history.get_latest()
+        last_seq = int(latest['seq']) if latest is not None else -1
+        while not self._relay_stop.is_set():
+            dispatcher = self.dispatcher
+            active = bool(self.subscriptions) or (dispatcher is not None and len(dispatcher) > 0)
+            interval = self.RELAY_POLL_INTERVAL if active else self.RELAY_IDLE_INTERVAL
+            try:
+                if events is None:
+                    self._relay_stop.wait(interval)
+                else:
+                    while events.poll(interval):
+                        self._on_child_event(*events.recv())
+            except (EOFError, OSError):
+                # 子进程已退出，继续转发共享内存中剩余的数据直到断开连接
+                events = None
+            if not active:
+                # 没有消费者时只跟踪最新帧序号，新注册的回调不会收到此前的帧
+                latest = history.get_latest()
+                if latest is not None:
+                    last_seq = int(latest['seq'])
+                continue
+            records = history.get_since(last_seq)
+            if len(records) == 0:
+                continue
+            last_seq = int(records['seq'][-1])
+            for record in records:
+                frame = build_frame(record)
+                if self.subscriptions:
+                    self.subscriptions.publish(frame)
+                if dispatcher is not None:
+                    dispatcher.dispatch(frame)
+
+    def _on_child_event(self, event, info):
+        """
+        在主进程中通知子进程的连接事件，并同步链路状态
+        """
+        if event == ConnectionEvent.LOST:
+            self.is_connected = False
+        elif event == ConnectionEvent.RECONNECTED:
+            self.is_connected = True
+        for listener in self._connection_listeners:
+            try:
+                listener(event, info)
+            except Exception as e:
+                logger.error(f"连接事件监听函数异常: {e}")
+
+    def set_frame_keys(self, keys):
+        """
+        设置JSON帧合法的首个键名，转发给子进程中的SerialComm，参数与SerialComm.set_frame_keys相同
+
+        返回:
+            bool: 是否成功转发给子进程，未连接时在连接后生效
+        """
+        self.frame_keys = tuple(keys)
+        if not self.is_connected:
+            return False
+        return self._request(('frame_keys', self.frame_keys))
+
+    # 回调分发、订阅和连接事件监听与SerialComm的接口和实现相同
+    start_dispatcher = SerialComm.start_dispatcher
+    stop_dispatcher = SerialComm.stop_dispatcher
+    _resume_dispatcher = SerialComm._resume_dispatcher
+    add_callback = SerialComm.add_callback
+    remove_callback = SerialComm.remove_callback
+    subscribe = SerialComm.subscribe
+    unsubscribe = SerialComm.unsubscribe
+    add_connection_listener = SerialComm.add_connection_listener
+    remove_connection_listener = SerialComm.remove_connection_listener
+
+    def start_reading_thread(self, callback=None):
+        """
+        读取在子进程中进行，主进程不需要读取线程；回调函数不会被调用
+        """
+
+    def stop_reading_thread(self):
+        """
+        读取在子进程中进行，断开连接时随子进程一起停止
+        """
+
+    def stop_writer_thread(self):
+        """
+        命令由子进程写出，主进程没有命令写线程
+        """
+
+    def start_writer_thread(self, coalesce_types=(), max_queue=64):
+        """
+        命令通过管道交给子进程写出，调用方只在管道写入时阻塞
+        """
+
+    def send_data(self, data, coalesce_key=None):
+        """
+        将数据交给子进程写入串口
+
+        参数:
+            data (bytes): 要发送的数据
+            coalesce_key: 未使用，与SerialComm.send_data保持一致
+
+        返回:
+            bool: 是否成功交给子进程
+        """
+        if not self.is_connected:
+            logger.error("串口未连接，无法发送数据")
+            return False
+        return self._request(('send', bytes(data)))
+
+    def send_command(self, command_type, value=0, big_endian=False):
+        """
+        发送命令到设备，参数与SerialComm.send_command相同
+        """
+        try:
+            data = encode_command(command_type, value, big_endian)
+        except Exception as e:
+            logger.error(f"构建命令数据失败: {e}")
+            return False
+        return self.send_data(data)
+
+    def send_commands(self, commands, big_endian=False):
+        """
+        将多条命令打包后一次交给子进程写入，参数与SerialComm.send_commands相同
+        """
+        if not commands:
+            return True
+        try:
+            data = encode_commands(commands, big_endian)
+        except Exception as e:
+            logger.error(f"构建命令数据失败: {e}")
+            return False
+        return self.send_data(data)
+
+    def get_device_info_command(self):
+        """
+        下发GET_INFO\\r\\n命令到设备
+        """
+        return self.send_data(b'GET_INFO\r\n')
+
+    def get_latest_data(self):
+        """
+        获取最新数据帧，由共享内存中的最新记录重建，格式与SerialComm.get_latest_data相同
+
+        返回:
+            dict: 最新数据帧，其中seq为帧序号，recv_ns为接收时的time.monotonic_ns()时间戳，
+                  尚无数据时返回空字典
+        """
+        record = self.shared_history.get_latest()
+        if record is None:
+            return {}
+        return _DEVICE_FRAMES[self.device_type](record)
+
+    def get_stats(self):
+        """
+        获取子进程中串口数据处理的统计信息，格式与SerialComm.get_stats相同
+
+        返回:
+            dict: 统计信息，子进程不可用时返回None
+        """
+        return self._request(('stats', None), reply=True)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口反应器模块，在单个线程中通过selectors（Linux上为epoll）同时监听多个串口
+
+多台设备共用一个反应器时，只有一个线程在等待数据，数据到达后直接在该线程中
+完成对应设备的解析和交付，避免每台设备各自的读取线程争抢GIL。
+"""
+
+import os
+import time
+import logging
+import selectors
+import threading
+import serial
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.reactor")
+
+
+class SerialReactor:
+    """
+    串口反应器
+
+    将SerialComm对象以reactor参数创建（或由Sense/Gripper的reactor参数传入），
+    其start_reading_thread会把串口注册到反应器而不创建独立的读取线程。
+    开启自动重连的串口断开后由反应器线程定期尝试重新打开。
+
+    参数:
+        select_timeout (float): 单次等待的超时时间（秒），用于处理重连等周期任务，默认为0.1
+    """
+    def __init__(self, select_timeout=0.1):
+        self.select_timeout = select_timeout
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._pending = []      # 待在反应器线程中执行的注册/注销操作
+        self._lock = threading.Lock()
+        self._comms = {}        # SerialComm -> 已注册的文件描述符
+        self._reconnecting = {} # SerialComm -> [下次尝试时间, 重试间隔]
+        self._thread = None
+        self._stopping = False
+        # 统计
+        self.wakeups = 0
+        self.reads = 0
+        self.bytes_read = 0
+
+    def start(self):
+        """
+        启动反应器线程
+        """
+        if self.is_running():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="pika-reactor")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        停止反应器线程，已注册的串口不会被关闭
+
+        参数:
+            timeout (float): 等待线程退出的最长时间（秒），默认为1.0
+        """
+        self._stopping = True
+        self._wake()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def close(self):
+        """
+        停止反应器并释放资源
+        """
+        self.stop()
+        self._selector.close()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def is_running(self):
+        """
+        反应器线程是否在运行
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def __len__(self):
+        return len(self._comms) + len(self._reconnecting)
+
+    def register(self, comm):
+        """
+        注册已连接的串口，反应器未启动时自动启动
+
+        参数:
+            comm (SerialComm): 已连接的串口通信对象
+
+        异常:
+            OSError: 串口没有可供selectors监听的文件描述符
+        """
+        fd = comm._get_fileno()
+        if fd is None:
+            raise OSError(f"串口{comm.port}没有可监听的文件描述符，无法使用反应器")
+        self._submit(('register', comm, fd))
+        self.start()
+
+    def unregister(self, comm):
+        """
+        注销串口，调用返回后反应器不会再读取该串口
+
+        参数:
+            comm (SerialComm): 已注册的串口通信对象
+        """
+        done = threading.Event()
+        self._submit(('unregister', comm, done))
+        if self.is_running() and threading.current_thread() is not self._thread:
+            done.wait(1.0)
+        elif not self.is_running():
+            self._apply_pending()
+
+    def _submit(self, op):
+        with self._lock:
+            self._pending.append(op)
+        self._wake()
+
+    def _wake(self):
+        try:
+            os.write(self._wake_w, b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _apply_pending(self):
+        """
+        在反应器线程中执行注册/注销操作
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for op, comm, arg in pending:
+            if op == 'register':
+                self._unregister_fd(comm)
+                try:
+                    self._selector.register(arg, selectors.EVENT_READ, comm)
+                    self._comms[comm] = arg
+                except (ValueError, KeyError, OSError) as e:
+                    logger.error(f"注册串口失败: {comm.port}，{e}")
+            else:
+                self._unregister_fd(comm)
+                self._reconnecting.pop(comm, None)
+                arg.set()
+
+    def _unregister_fd(self, comm):
+        fd = self._comms.pop(comm, None)
+        if fd is not None:
+            try:
+                self._selector.unregister(fd)
+            except (ValueError, KeyError, OSError):
+                pass
+
+    def _run(self):
+        """
+        反应器线程函数
+        """
+        logger.info("启动串口反应器线程")
+        while not self._stopping:
+            timeout = self.select_timeout
+            if self._reconnecting:
+                timeout = min(timeout, self._next_retry_delay())
+            try:
+                events = self._selector.select(timeout)
+            except OSError as e:
+                logger.error(f"反应器等待异常: {e}")
+                time.sleep(0.01)
+                continue
+            self.wakeups += 1
+            for key, _ in events:
+                comm = key.data
+                if comm is None:
+                    try:
+                        while os.read(self._wake_r, 4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                if comm in self._comms:
+                    self._read(comm)
+            if self._pending:
+                self._apply_pending()
+            if self._reconnecting:
+                self._retry_reconnects()
+        logger.info("串口反应器线程已停止")
+
+    def _read(self, comm):
+        """
+        读取并处理一个可读串口的数据
+        """
+        try:
+            data = comm.serial.read(max(1, comm.serial.in_waiting))
+        except (serial.SerialException, OSError) as e:
+            self._unregister_fd(comm)
+            comm._on_link_lost(e)
+            if comm.auto_reconnect:
+                self._reconnecting[comm] = [time.monotonic(), comm.RECONNECT_INITIAL_DELAY]
+            return
+        if not data:
+            return
+        self.reads += 1
+        self.bytes_read += len(data)
+        try:
+            comm._process_data(data, time.monotonic_ns())
+        except Exception as e:
+            logger.error(f"处理串口数据异常: {comm.port}，{e}")
+
+    def _next_retry_delay(self):
+        """
+        返回距离下一次重连尝试的时间（秒）
+        """
+        now = time.monotonic()
+        return max(0.0, min(state[0] for state in self._reconnecting.values()) - now)
+
+    def _retry_reconnects(self):
+        """
+        对已断开且开启自动重连的串口尝试重新打开
+        """
+        now = time.monotonic()
+        for comm, state in list(self._reconnecting.items()):
+            if now < state[0]:
+                continue
+            if comm._try_reopen():
+                del self._reconnecting[comm]
+                fd = comm._get_fileno()
+                try:
+                    self._selector.register(fd, selectors.EVENT_READ, comm)
+                    self._comms[comm] = fd
+                except (ValueError, KeyError, OSError) as e:
+                    logger.error(f"重新注册串口失败: {comm.port}，{e}")
+            elif not os.path.exists(comm.port):
+                state[0] = now + comm.RECONNECT_POLL_INTERVAL
+            else:
+                state[0] = now + state[1]
+                state[1] = min(state[1] * 2, comm.RECONNECT_MAX_DELAY)
+
+    def get_stats(self):
+        """
+        获取反应器统计信息
+
+        返回:
+            dict: 包含ports, reconnecting, wakeups, reads, bytes_read字段
+        """
+        return {
+            'ports': len(self._comms),
+            'reconnecting': len(self._reconnecting),
+            'wakeups': self.wakeups,
+            'reads': self.reads,
+            'bytes_read': self.bytes_read
+        }
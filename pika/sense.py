@@ -6,10 +6,14 @@ Pika Sense 设备类，提供对Pika Sense设备的访问接口
 """
 
 import time
-import math
 import logging
 import threading
-from .serial_comm import SerialComm
+from .serial_comm import SerialComm, DeliveryMode
+from .telemetry import decode_sense_frame, SENSE_FRAME_KEYS
+from .history import TelemetryHistory, SENSE_HISTORY_DTYPE
+from .subscription import OverflowPolicy
+from .snapshot import SenseSnapshot, SENSE_SNAPSHOT_DEFAULT
+from .kinematics import get_kinematics, SENSE_LINKAGE
 
 # 创建logger，但不配置全局日志系统
 logger = logging.getLogger('pika.sense')
@@ -24,23 +28,46 @@ class Sense:
     
     参数:
         port (str): 串口设备路径，默认为'/dev/ttyUSB0'
+        delivery_mode (str): 数据帧交付模式，默认为DeliveryMode.EVERY_FRAME，
+                             控制回路可使用DeliveryMode.LATEST_ONLY
+        history_capacity (int): 遥测历史环形缓冲区容量（帧数），为0时不记录历史，默认为4096
+        serial_comm (SerialComm): 可选的串口通信对象，例如用于离线回放的ReplaySerialComm、
+                                  在子进程中读取的ProcessSerialComm，为None时按port和delivery_mode创建
+        auto_reconnect (bool): USB串口断开（拔出、复位）后是否自动重新打开同一路径并恢复数据，
+                               port可使用udev固定链接以保证重新插入后路径不变，默认为False
+        reactor (SerialReactor): 可选的共享串口反应器（pika.reactor），多台设备共用一个读取线程，默认为None
+        low_latency (bool): 是否在权限允许的范围内为USB转串口适配器启用低延迟设置（latency_timer
+                            和ASYNC_LOW_LATENCY，见pika.usb_latency），默认为False
+        linkage (LinkageParams): 夹爪连杆参数（pika.kinematics），用于弧度与开合距离的换算，默认为SENSE_LINKAGE
     """
     
-    def __init__(self, port='/dev/ttyUSB0'):
+    def __init__(self, port='/dev/ttyUSB0', delivery_mode=DeliveryMode.EVERY_FRAME,
+                 history_capacity=4096, serial_comm=None, auto_reconnect=False,
+                 reactor=None, low_latency=False, linkage=None):
         self.port = port
-        json_pattern = r'\{\r\n"Command":[0-1],\r\n"AS5047":\{\r\n"angle":[^\r\n]*,\r\n"rad":[^\r\n]*\r\n\},\r\n\r\n"IMU":\{\r\n"acc":\[[^\r\n]*\],\r\n"gyr":\[[^\r\n]*\],\r\n"pitch":[^\r\n]*,\r\n"roll":[^\r\n]*,\r\n"yaw":[^\r\n]*\r\n\}\r\n\r\n\}'
-        self.serial_comm = SerialComm(port=port)
+        if serial_comm is None:
+            serial_comm = SerialComm(port=port, delivery_mode=delivery_mode, auto_reconnect=auto_reconnect,
+                                     reactor=reactor, low_latency=low_latency)
+        if serial_comm.decoder is None and not serial_comm.REMOTE_PARSING:
+            serial_comm.decoder = decode_sense_frame
+            serial_comm.set_frame_keys(SENSE_FRAME_KEYS)
+        self.serial_comm = serial_comm
+        # 弧度与夹爪开合距离的换算，相同连杆参数的设备共用查找表
+        self.kinematics = get_kinematics(linkage or SENSE_LINKAGE)
         self.is_connected = False
+        # 保留以兼容外部代码，读取遥测数据已不需要加锁
         self.data_lock = threading.Lock()
         
-        # 编码器数据
-        self.encoder_data = {
-            'angle': 0.0,
-            'rad': 0.0
-        }
+        # 最新遥测快照，由读取线程整体替换，读取时无需加锁
+        self._snapshot = SENSE_SNAPSHOT_DEFAULT
         
-        # 命令状态
-        self.command_state = 0
+        # 子进程读取模式(pika.process_reader)下，快照和历史直接从共享内存读取
+        self._shared_history = getattr(serial_comm, 'shared_history', None)
+        # 遥测历史环形缓冲区，由读取线程写入
+        if self._shared_history is not None:
+            self.history = self._shared_history
+        else:
+            self.history = TelemetryHistory(SENSE_HISTORY_DTYPE, history_capacity) if history_capacity > 0 else None
         
         # 鱼眼相机索引
         self.fisheye_camera_index = 0
@@ -131,34 +158,163 @@ class Sense:
             data (dict): 接收到的JSON数据
         """
         try:
-            with self.data_lock:
-
-                # 处理编码器数据
-                if 'AS5047' in data:
-                    encoder = data['AS5047']
-                    self.encoder_data = {
-                        'angle': encoder.get('angle', 0.0),
-                        'rad': encoder.get('rad', 0.0)
-                    }
+            encoder = data.get('AS5047')
+            imu = data.get('IMU')
+            if encoder is not None or imu is not None or 'Command' in data:
+                # 构造新快照后整体替换引用，帧中缺少的部分沿用上一帧
+                previous = self._snapshot
+                if encoder is not None:
+                    seq, recv_ns = data.get('seq'), data.get('recv_ns')
+                    angle, rad = encoder.get('angle', 0.0), encoder.get('rad', 0.0)
+                else:
+                    seq, recv_ns = previous.seq, previous.recv_ns
+                    angle, rad = previous.angle, previous.rad
+                command = data.get('Command', previous.Command)
+                if imu is not None:
+                    nan = float('nan')
+                    acc = tuple(imu.get('acc') or (nan, nan, nan))
+                    gyr = tuple(imu.get('gyr') or (nan, nan, nan))
+                    snapshot = SenseSnapshot(seq, recv_ns, angle, rad, command, acc, gyr,
+                                             imu.get('pitch', nan), imu.get('roll', nan), imu.get('yaw', nan))
+                else:
+                    snapshot = previous._replace(seq=seq, recv_ns=recv_ns, angle=angle, rad=rad, Command=command)
+                self._snapshot = snapshot
                 
-                # 处理命令状态
-                if 'Command' in data:
-                    self.command_state = data['Command']
-                
-                # 处理版本信息
-                if 'Version' in data:
-                    logger.info(f"设备版本信息: {data['Version']}")
+                # 记录遥测历史
+                if encoder is not None and self.history is not None:
+                    self._append_history(snapshot)
+            
+            # 处理版本信息
+            if 'Version' in data:
+                logger.info(f"设备版本信息: {data['Version']}")
                     
         except Exception as e:
             logger.error(f"处理数据回调异常: {e}")
             
-    def get_distance(self,angle):
-        angle = (180.0 - 43.99) / 180.0 * math.pi - angle
-        height = 0.0325 * math.sin(angle)
-        width_d = 0.0325 * math.cos(angle)
-        width = math.sqrt(0.058**2 - (height - 0.01456)**2) + width_d
-        # 将单位由m转换为mm
-        return width*1000
+    def _append_history(self, snapshot):
+        """
+        将遥测快照写入历史缓冲区
+        
+        参数:
+            snapshot (SenseSnapshot): 当前帧的遥测快照
+        """
+        self.history.append(self._history_record(snapshot))
+    
+    @staticmethod
+    def _history_record(snapshot):
+        """
+        将遥测快照转换为SENSE_HISTORY_DTYPE字段顺序的记录
+        """
+        return (
+            snapshot.seq if snapshot.seq is not None else -1,
+            snapshot.recv_ns if snapshot.recv_ns is not None else 0,
+            snapshot.angle, snapshot.rad, snapshot.Command,
+            snapshot.acc, snapshot.gyr, snapshot.pitch, snapshot.roll, snapshot.yaw
+        )
+    
+    @staticmethod
+    def _snapshot_from_record(record):
+        """
+        将历史记录转换回遥测快照
+        """
+        return SenseSnapshot(
+            int(record['seq']), int(record['recv_ns']), float(record['angle']), float(record['rad']),
+            int(record['Command']), tuple(record['acc'].tolist()), tuple(record['gyr'].tolist()),
+            float(record['pitch']), float(record['roll']), float(record['yaw']))
+    
+    def snapshot(self):
+        """
+        获取最新的遥测快照，所有字段来自同一帧，不加锁、不复制
+        
+        返回:
+            SenseSnapshot: 不可变的命名元组，包含seq, recv_ns, angle, rad, Command,
+                           acc, gyr, pitch, roll, yaw字段
+        """
+        if self._shared_history is not None:
+            record = self._shared_history.get_latest()
+            if record is not None:
+                return self._snapshot_from_record(record)
+        return self._snapshot
+    
+    @property
+    def encoder_data(self):
+        """
+        最新编码器数据，每次访问返回新的字典
+        """
+        snapshot = self.snapshot()
+        return {'angle': snapshot.angle, 'rad': snapshot.rad}
+    
+    @property
+    def command_state(self):
+        """
+        最新命令状态
+        """
+        return self.snapshot().Command
+    
+    @property
+    def frame_seq(self):
+        """
+        最近一帧编码器数据的帧序号
+        """
+        return self.snapshot().seq
+    
+    @property
+    def frame_recv_ns(self):
+        """
+        最近一帧编码器数据的接收时间戳(time.monotonic_ns())
+        """
+        return self.snapshot().recv_ns
+    
+    def get_history(self, seconds=None):
+        """
+        获取最近一段时间内的遥测历史
+        
+        参数:
+            seconds (float): 时间窗口长度（秒），为None时返回缓冲区内的全部记录
+            
+        返回:
+            numpy.ndarray: 结构化数组，字段见SENSE_HISTORY_DTYPE；未启用历史记录时返回None
+        """
+        if self.history is None:
+            logger.warning("未启用遥测历史记录")
+            return None
+        return self.history.get_history(seconds)
+    
+    def get_since(self, seq):
+        """
+        获取帧序号大于seq的遥测历史，适合增量读取
+        
+        参数:
+            seq (int): 上一次读取到的最后一个帧序号
+            
+        返回:
+            numpy.ndarray: 结构化数组，字段见SENSE_HISTORY_DTYPE；未启用历史记录时返回None
+        """
+        if self.history is None:
+            logger.warning("未启用遥测历史记录")
+            return None
+        return self.history.get_since(seq)
+    
+    def get_gripper_distance_history(self, seconds=None):
+        """
+        获取最近一段时间内的夹爪开合距离历史，一次换算全部记录的rad字段
+        
+        参数:
+            seconds (float): 时间窗口长度（秒），为None时返回缓冲区内的全部记录
+            
+        返回:
+            tuple: (recv_ns数组, 开合距离数组(mm))；未启用历史记录时返回None
+        """
+        records = self.get_history(seconds)
+        if records is None:
+            return None
+        return records['recv_ns'], self.kinematics.angles_to_distances(records['rad'])
+    
+    def get_distance(self, angle):
+        """
+        计算单侧宽度(mm)，保留以兼容外部代码，开合距离换算见self.kinematics
+        """
+        return self.kinematics.width(angle)
 
     def get_gripper_distance(self):
         """
@@ -166,24 +322,28 @@ class Sense:
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认电机位置")
-        with self.data_lock:
-            angle = self.encoder_data['rad']
-            distance = (self.get_distance(angle) - self.get_distance(0)) * 2   #default
-            return distance
+        angle = self.snapshot().rad
+        return self.kinematics.angle_to_distance(angle)
         
         
-    def get_encoder_data(self):
+    def get_encoder_data(self, with_meta=False):
         """
         获取编码器数据
         
+        参数:
+            with_meta (bool): 是否附带帧序号seq和接收时间戳recv_ns(time.monotonic_ns())，默认为False
+        
         返回:
             dict: 编码器数据，包含angle、rad字段
         """
         if not self.is_connected:
             logger.warning("设备未连接，返回默认编码器数据")
         
-        with self.data_lock:
-            return self.encoder_data.copy()
+        snapshot = self.snapshot()
+        data = {'angle': snapshot.angle, 'rad': snapshot.rad}
+        if with_meta:
+            data.update(seq=snapshot.seq, recv_ns=snapshot.recv_ns)
+        return data
     
     def get_command_state(self):
         """
@@ -195,8 +355,7 @@ class Sense:
         if not self.is_connected:
             logger.warning("设备未连接，返回默认命令状态")
         
-        with self.data_lock:
-            return self.command_state
+        return self.snapshot().Command
     
     def set_camera_param(self,camera_width,camera_height,camera_fps,fisheye_thread_fps=100):
         '''
@@ -368,6 +527,103 @@ class Sense:
         """
         return self.serial_comm.send_command(CommandType.VIBRATE_CTRL, mode, big_endian=True)
         
+    def send_commands(self, commands):
+        """
+        将多条命令打包后一次写入串口，例如同时控制灯光和振动
+        
+        参数:
+            commands (list): 命令列表，每项为(CommandType, value)，命令值按大端序整数编码
+            
+        返回:
+            bool: 操作是否成功
+        """
+        if not self.is_connected:
+            logger.error("设备未连接，无法发送命令")
+            return False
+        
+        return self.serial_comm.send_commands(commands, big_endian=True)
+    
+    def add_connection_listener(self, listener):
+        """
+        注册串口连接事件监听函数，用于感知链路断开、自动重连和数据恢复
+        
+        参数:
+            listener (callable): 监听函数，参数为(event, info)，event为ConnectionEvent中的值
+                                 （LOST/RECONNECTED/RESUMED），info为事件信息字典
+        """
+        self.serial_comm.add_connection_listener(listener)
+    
+    def is_link_up(self):
+        """
+        串口链路当前是否可用，自动重连期间返回False
+        
+        返回:
+            bool: 链路是否可用
+        """
+        return self.is_connected and self.serial_comm.is_connected
+    
+    def add_callback(self, callback, name=None):
+        """
+        注册数据帧回调函数，回调在独立的分发线程中执行，不会延误串口数据的解析；
+        分发模式、队列长度和背压通知可通过serial_comm.start_dispatcher()设置
+        
+        参数:
+            callback (callable): 回调函数，接收数据帧(dict)
+            name (str): 回调名称，用于统计信息，默认为函数名
+            
+        返回:
+            CallbackHandle: 回调句柄，可用于remove_callback
+        """
+        return self.serial_comm.add_callback(callback, name)
+    
+    def remove_callback(self, handle):
+        """
+        移除数据帧回调函数
+        
+        参数:
+            handle (CallbackHandle): add_callback()返回的回调句柄
+        """
+        self.serial_comm.remove_callback(handle)
+    
+    def subscribe(self, maxsize=64, policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.005, name=None):
+        """
+        订阅数据帧，适合日志记录、控制回路、界面显示等多个消费者同时获取每一帧数据；
+        慢速订阅者只会丢失自己的数据帧，不会阻塞读取线程
+        
+        参数:
+            maxsize (int): 队列最大长度，默认为64
+            policy (str): 队列已满时的处理策略，OverflowPolicy.DROP_OLDEST/DROP_NEWEST/BLOCK，
+                          默认为丢弃最旧的帧
+            block_timeout (float): BLOCK策略下读取线程的最长等待时间（秒），默认为0.005
+            name (str): 订阅者名称，用于统计信息
+            
+        返回:
+            Subscription: 订阅对象，可通过get()或迭代获取数据帧，断开连接后迭代结束
+        """
+        return self.serial_comm.subscribe(maxsize, policy, block_timeout, name)
+    
+    def unsubscribe(self, subscription):
+        """
+        取消订阅
+        
+        参数:
+            subscription (Subscription): subscribe()返回的订阅对象
+        """
+        self.serial_comm.unsubscribe(subscription)
+    
+    def get_timing_stats(self):
+        """
+        获取串口数据帧的到达间隔抖动和序号间断统计
+        
+        返回:
+            dict: 统计信息，包含frames, gaps, frames_missing, stalls, frames_collapsed, interval_ms字段；
+                  统计信息不可用（如子进程读取模式下尚未连接）时返回None
+        """
+        stats = self.serial_comm.get_stats()
+        if stats is None:
+            return None
+        return stats['timing']
+    
     def get_version(self):
         """
         获取Gripper的版本信息
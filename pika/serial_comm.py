@@ -5,17 +5,113 @@
 串口通信模块，用于与Pika系列设备进行通信
 """
 
+import os
 import threading
 import time
+import select
 import json
 import serial
 import logging
 import re # 导入re模块用于正则表达式
 import struct # 导入struct模块
+from .frame_scanner import JsonFrameScanner
+from .binary_protocol import BinaryFrameScanner, decode_binary_frame, find_binary_frame
+from .metrics import FrameTimingStats, RunningStats
+from .command_writer import CommandWriter
+from .subscription import SubscriptionHub, OverflowPolicy
+from .dispatcher import CallbackDispatcher, DispatchMode
+from . import usb_latency
 
 # 创建logger，但不配置全局日志系统
 logger = logging.getLogger("pika.serial_comm")
 
+# 固件输出的JSON中可能带有多余的逗号，解析前需要去除
+_OBJECT_TRAILING_COMMA = re.compile(rb',\s*}')
+_ARRAY_TRAILING_COMMA = re.compile(rb',\s*\]')
+# 自动检测协议时判断JSON帧起始的模式
+_JSON_FRAME_START = re.compile(rb'\{\s*"')
+
+
+def _loads_json(frame):
+    """
+    去除多余的逗号后解析一个JSON帧，解析失败时抛出json.JSONDecodeError
+    """
+    cleaned = _OBJECT_TRAILING_COMMA.sub(b'}', frame)
+    cleaned = _ARRAY_TRAILING_COMMA.sub(b']', cleaned)
+    return json.loads(cleaned.decode('utf-8', errors='ignore'))
+
+# 各扫描器的数据损坏计数字段，get_corruption_stats()跨扫描器累计
+_CORRUPTION_FIELDS = ('bytes_discarded', 'starts_rejected', 'frames_resynced', 'frames_invalid',
+                      'frames_oversize', 'frames_rejected', 'crc_errors', 'header_errors')
+
+# 命令帧格式：1字节命令类型 + 4字节命令值 + 结束符\r\n
+COMMAND_SIZE = 7
+_COMMAND_LE = struct.Struct('<Bf2s')   # 小端序浮点命令值
+_COMMAND_BE = struct.Struct('>Bi2s')   # 大端序整数命令值
+_COMMAND_END = b'\r\n'
+
+def encode_command(command_type, value=0, big_endian=False):
+    """
+    编码单条命令
+    
+    参数:
+        command_type (int): 命令类型
+        value (float): 命令值，默认为0
+        big_endian (bool): 是否使用大端序整数编码，默认为False（小端序浮点）
+        
+    返回:
+        bytes: 7字节命令数据
+    """
+    if big_endian:
+        return _COMMAND_BE.pack(command_type, value, _COMMAND_END)
+    return _COMMAND_LE.pack(command_type, value, _COMMAND_END)
+
+def encode_commands(commands, big_endian=False):
+    """
+    将多条命令编码到同一个缓冲区，按列表顺序排列
+    
+    参数:
+        commands (list): 命令列表，每项为(command_type, value)或(command_type, value, big_endian)
+        big_endian (bool): 未单独指定字节序的命令是否使用大端序，默认为False
+        
+    返回:
+        bytearray: 每条命令7字节的命令数据
+    """
+    data = bytearray(COMMAND_SIZE * len(commands))
+    offset = 0
+    for command in commands:
+        if len(command) == 3:
+            command_type, value, command_big_endian = command
+        else:
+            command_type, value = command
+            command_big_endian = big_endian
+        encoder = _COMMAND_BE if command_big_endian else _COMMAND_LE
+        encoder.pack_into(data, offset, command_type, value, _COMMAND_END)
+        offset += COMMAND_SIZE
+    return data
+
+# 数据帧交付模式枚举
+class DeliveryMode:
+    EVERY_FRAME = 'every_frame'    # 逐帧交付，适用于数据记录
+    LATEST_ONLY = 'latest_only'    # 同一次读取中的多帧合并为最新状态后交付，适用于控制回路
+
+# 读取线程工作模式枚举
+class ReadMode:
+    EVENT = 'event'        # 阻塞等待串口文件描述符可读，仅在有数据到达时唤醒
+    POLLING = 'polling'    # 轮询in_waiting，每轮休眠1ms
+
+# 遥测帧协议枚举
+class Protocol:
+    JSON = 'json'          # 固件默认输出的JSON文本帧
+    BINARY = 'binary'      # 带同步字节、长度和CRC的二进制帧(pika.binary_protocol)
+    AUTO = 'auto'          # 根据数据流自动检测，持续无法得到有效帧时重新检测
+
+# 连接事件枚举
+class ConnectionEvent:
+    LOST = 'lost'              # 串口链路断开（设备被拔出、USB复位等）
+    RECONNECTED = 'reconnected'  # 自动重连成功
+    RESUMED = 'resumed'        # 重连后收到第一帧数据
+
 class SerialComm:
     """
     串口通信类，负责与设备的串口通信
@@ -24,21 +120,113 @@ class SerialComm:
         port (str): 串口设备路径，默认为'/dev/ttyUSB0'
         baudrate (int): 波特率，默认为460800
         timeout (float): 超时时间，默认为1.0秒
+        delivery_mode (str): 数据帧交付模式，DeliveryMode.EVERY_FRAME或DeliveryMode.LATEST_ONLY，默认为逐帧交付
+        read_mode (str): 读取线程工作模式，ReadMode.EVENT或ReadMode.POLLING，默认为事件驱动
+        decoder (callable): 可选的快速解码函数，接收完整帧字节并返回解析结果，
+                            帧布局不匹配时返回None以退回通用JSON解析，默认为None
+        auto_reconnect (bool): 链路断开后是否由读取线程自动重新打开同一串口路径（可以是
+                               tools/multi_device_detector.py生成的udev固定链接），默认为False
+        reactor (SerialReactor): 可选的共享串口反应器，设置后不再创建独立的读取线程，
+                                 由反应器线程统一监听多个串口，默认为None
+        low_latency (bool): 打开串口后是否在权限允许的范围内将USB转串口适配器的latency_timer
+                            设为LOW_LATENCY_TIMER_MS并设置ASYNC_LOW_LATENCY标志，默认为False
+        protocol (str): 遥测帧协议，Protocol.JSON、Protocol.BINARY或Protocol.AUTO，默认为自动检测
     """
-    def __init__(self, port=r"/dev/ttyUSB0", baudrate=460800, timeout=1.0):
+    # 事件驱动模式下单次等待的超时时间（秒），用于及时响应停止请求
+    EVENT_WAIT_TIMEOUT = 0.1
+    # 自动重连时检查设备节点是否重新出现的间隔（秒）
+    RECONNECT_POLL_INTERVAL = 0.02
+    # 设备节点存在但打开失败时的重试间隔（秒），按指数退避增长到最大值
+    RECONNECT_INITIAL_DELAY = 0.02
+    RECONNECT_MAX_DELAY = 0.5
+    # 低延迟模式下USB转串口适配器的latency_timer(ms)
+    LOW_LATENCY_TIMER_MS = 1
+    # 自动检测协议时，连续这么多字节没有解析出有效帧则重新检测（字节），
+    # 大于扫描器缓冲上限，使扫描器先按自身规则恢复
+    PROTOCOL_REDETECT_BYTES = 8192
+    # 帧解析是否在其他进程中完成（pika.process_reader），为True时Sense/Gripper不设置解码器和帧键名
+    REMOTE_PARSING = False
+    
+    def __init__(self, port=r"/dev/ttyUSB0", baudrate=460800, timeout=1.0,
+                 delivery_mode=DeliveryMode.EVERY_FRAME, read_mode=ReadMode.EVENT,
+                 decoder=None, auto_reconnect=False, reactor=None, low_latency=False,
+                 protocol=Protocol.AUTO):
+        if protocol not in (Protocol.JSON, Protocol.BINARY, Protocol.AUTO):
+            raise ValueError(f"不支持的遥测帧协议: {protocol}")
+        if delivery_mode not in (DeliveryMode.EVERY_FRAME, DeliveryMode.LATEST_ONLY):
+            raise ValueError(f"不支持的数据帧交付模式: {delivery_mode}")
+        if read_mode not in (ReadMode.EVENT, ReadMode.POLLING):
+            raise ValueError(f"不支持的读取模式: {read_mode}")
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.delivery_mode = delivery_mode
+        self.read_mode = read_mode
+        self.decoder = decoder
+        self.auto_reconnect = auto_reconnect
+        self.reactor = reactor
+        self.low_latency = low_latency
+        self.latency_timer_ms = self.LOW_LATENCY_TIMER_MS
+        self.usb_settings = None        # 最近一次应用低延迟设置后生效的值
+        self._original_latency_timer = None
         self.serial = None
         self.is_connected = False
         self.reading_thread = None
         self.stop_thread = False
-        self.buffer = ""
         self.callback = None
+        # 数据帧订阅者
+        self.subscriptions = SubscriptionHub()
+        # 在读取线程之外执行的用户回调
+        self.dispatcher = None
         self.data_lock = threading.Lock()
         self.latest_data = {}
+        # 写锁，保证多线程发送时每条命令完整写出、不会交错
+        self._write_lock = threading.Lock()
+        # 原始数据录制器
+        self.recorder = None
+        # 可选的命令写线程及可合并的命令类型
+        self.writer = None
+        self.coalesce_types = frozenset()
         # Prevent unbounded buffer growth under noisy serial lines.
         self._max_buffer_len = 4096
+        # 单个JSON帧的最大长度，固件帧约200字节
+        self._max_frame_len = 1024
+        # 可选的合法首个键名，由Sense/Gripper通过set_frame_keys()设置，用于提前拒绝损坏的帧
+        self.frame_keys = ()
+        self._corruption_totals = dict.fromkeys(_CORRUPTION_FIELDS, 0)
+        # 遥测帧协议，自动检测时active_protocol在检测完成前为None
+        self.protocol = protocol
+        self.active_protocol = None if protocol == Protocol.AUTO else protocol
+        self.protocol_switches = 0      # 自动检测确定或更换协议的次数
+        self._detected_protocol = None  # 最近一次自动检测的结果
+        self._detect_buffer = bytearray()
+        self._unframed_bytes = 0        # 自上一个有效帧以来收到的字节数
+        self.scanner = None
+        self._replace_scanner()
+        # 交付统计
+        self.frames_received = 0    # 解析成功的帧数
+        self.frames_delivered = 0   # 交付给回调和latest_data的帧数
+        self.frames_collapsed = 0   # LATEST_ONLY模式下被合并、未单独交付的帧数
+        self.frames_superseded = 0  # 同一次读取中被更新的帧覆盖的帧数（两种模式均统计）
+        self.burst_reads = 0        # 一次读取包含多帧的次数
+        self.max_burst = 0          # 单次读取包含的最大帧数
+        # 帧序号与到达时间统计，序号按扫描出的帧递增（含解析失败和被合并的帧），
+        # 交付结果中序号不连续即表示有帧被丢弃
+        self._next_seq = 0
+        self.timing_stats = FrameTimingStats()
+        # 解析统计
+        self.frames_fast_decoded = 0    # 由快速解码器解析的帧数
+        self.frames_json_decoded = 0    # 由通用JSON路径解析的帧数
+        self.frames_binary_decoded = 0  # 二进制协议帧数
+        # 连接状态统计与事件监听
+        self._connection_listeners = ()
+        self._lost_ns = None            # 最近一次链路断开的时间，恢复数据后清空
+        self._reopen_failures = 0       # 本次断开后打开串口失败的次数
+        self.links_lost = 0             # 链路断开次数
+        self.reconnects = 0             # 自动重连成功次数
+        self.reconnect_attempts = 0     # 打开串口失败的重试次数
+        self.reconnect_ms = RunningStats()  # 从断开到重新打开串口的时间
+        self.recovery_ms = RunningStats()   # 从断开到重新收到数据的时间
     
     def connect(self):
         """
@@ -58,6 +246,8 @@ class SerialComm:
             )
             self.is_connected = True
             logger.info(f"成功连接到串口设备: {self.port}")
+            if self.low_latency:
+                self._apply_low_latency()
             return True
         except serial.SerialException as e:
             logger.error(f"连接串口设备失败: {e}")
@@ -69,28 +259,71 @@ class SerialComm:
         断开串口连接
         """
         self.stop_reading_thread()
+        self.stop_writer_thread()
+        self.stop_recording()
+        self.subscriptions.close()
+        self.stop_dispatcher()
         if self.serial and self.is_connected:
             self.serial.close()
             self.is_connected = False
             logger.info(f"已断开串口设备连接: {self.port}")
     
-    def send_data(self, data):
+    def start_writer_thread(self, coalesce_types=(), max_queue=64):
+        """
+        启动命令写线程，此后send_data只负责入队，由写线程完成写入和flush
+        
+        参数:
+            coalesce_types (iterable): 可合并的命令类型，队尾尚未发送的同类型命令会被新命令替换，
+                                       其余命令严格按顺序发送
+            max_queue (int): 发送队列最大长度，默认为64
+        """
+        if self.writer and self.writer.is_running():
+            logger.warning("命令写线程已经在运行")
+            return
+        self.coalesce_types = frozenset(coalesce_types)
+        self.writer = CommandWriter(self._write_now, max_queue=max_queue)
+        self.writer.start()
+    
+    def stop_writer_thread(self):
+        """
+        停止命令写线程，队列中剩余的命令会尽量写出
+        """
+        if self.writer:
+            self.writer.stop()
+    
+    def send_data(self, data, coalesce_key=None):
         """
         发送数据到串口
         
         参数:
             data (bytes): 要发送的数据
+            coalesce_key: 写线程模式下的合并键，为None时不参与合并
             
         返回:
-            bool: 发送是否成功
+            bool: 发送是否成功（写线程模式下表示是否成功入队）
         """
         if not self.is_connected or not self.serial:
             logger.error("串口未连接，无法发送数据")
             return False
         
+        if self.writer and self.writer.is_running():
+            return self.writer.submit(bytes(data), coalesce_key)
+        return self._write_now(data)
+    
+    def _write_now(self, data):
+        """
+        在当前线程中写入数据并等待发送完成
+        
+        参数:
+            data (bytes): 要发送的数据
+            
+        返回:
+            bool: 发送是否成功
+        """
         try:
-            self.serial.write(data)
-            self.serial.flush()
+            with self._write_lock:
+                self.serial.write(data)
+                self.serial.flush()
             return True
         except serial.SerialException as e:
             logger.error(f"发送数据失败: {e}")
@@ -110,24 +343,35 @@ class SerialComm:
         """ 
         try:
             # 构建命令数据
-            data = bytearray()
-            data.append(command_type)  # 命令类型
-            
-            if big_endian:
-                value_bytes = bytearray(struct.pack('>i', value))  # 大端序
-            else:
-                value_bytes = bytearray(struct.pack('<f', value))  # 小端序
-            
-            data.extend(value_bytes)
-            
-            # 添加结束符 \r\n
-            data.extend(b'\r\n')
+            data = encode_command(command_type, value, big_endian)
+        except Exception as e:
+            logger.error(f"构建命令数据失败: {e}")
+            return False
+        
+        coalesce_key = command_type if command_type in self.coalesce_types else None
+        return self.send_data(data, coalesce_key)
+    
+    def send_commands(self, commands, big_endian=False):
+        """
+        将多条命令打包后一次写入串口，命令按列表顺序发送，不参与设定值合并
+        
+        参数:
+            commands (list): 命令列表，每项为(command_type, value)或(command_type, value, big_endian)
+            big_endian (bool): 未单独指定字节序的命令是否使用大端序，默认为False
             
-            return self.send_data(data)
+        返回:
+            bool: 发送是否成功
+        """
+        if not commands:
+            return True
+        try:
+            data = encode_commands(commands, big_endian)
         except Exception as e:
             logger.error(f"构建命令数据失败: {e}")
             return False
         
+        return self.send_data(data)
+        
     def get_device_info_command(self):
         """
         下发GET_INFO\r\n命令到设备
@@ -145,10 +389,13 @@ class SerialComm:
             logger.error(f"发送GET_INFO命令失败: {e}")
             return False
         
-    def read_data(self):
+    def read_data(self, raise_errors=False):
         """
         从串口读取数据
         
+        参数:
+            raise_errors (bool): 读取出错时是否抛出异常，读取线程以此触发链路断开处理，默认为False
+            
         返回:
             bytes: 读取到的数据
         """
@@ -160,120 +407,665 @@ class SerialComm:
             if self.serial.in_waiting > 0:
                 return self.serial.read(self.serial.in_waiting)
             return b''
-        except serial.SerialException as e:
+        except (serial.SerialException, OSError) as e:
+            if raise_errors:
+                raise
             logger.error(f"读取数据失败: {e}")
             return b''
     
+    def _get_fileno(self):
+        """
+        获取串口的文件描述符
+        
+        返回:
+            int: 文件描述符，平台不支持时返回None
+        """
+        try:
+            return self.serial.fileno()
+        except (AttributeError, OSError, serial.SerialException):
+            return None
+    
+    def _wait_and_read(self, timeout):
+        """
+        阻塞等待串口有数据到达并读取，超时返回空字节
+        
+        与read_data不同，该方法不吞掉异常：串口可读但读不到数据（如设备被拔出）时
+        由pyserial抛出异常，交给读取线程处理，避免空转。
+        
+        参数:
+            timeout (float): 最长等待时间（秒）
+            
+        返回:
+            bytes: 读取到的数据
+        """
+        fd = self._get_fileno()
+        if fd is None:
+            # 平台不支持文件描述符时，退化为带超时的阻塞读取
+            if self.serial.timeout != timeout:
+                self.serial.timeout = timeout
+            data = self.serial.read(1)
+            if data and self.serial.in_waiting > 0:
+                data += self.serial.read(self.serial.in_waiting)
+            return data
+        
+        if fd != self._poll_fd:
+            self._poller = select.poll() if hasattr(select, 'poll') else None
+            if self._poller is not None:
+                self._poller.register(fd, select.POLLIN | select.POLLERR | select.POLLHUP)
+            self._poll_fd = fd
+        if self._poller is not None:
+            ready = self._poller.poll(timeout * 1000)
+        else:
+            ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            return b''
+        return self.serial.read(max(1, self.serial.in_waiting))
+    
     def _reading_thread_func(self):
         """
         读取线程函数，持续从串口读取数据并解析
         """
-        logger.info("启动串口读取线程")
+        logger.info(f"启动串口读取线程，读取模式: {self.read_mode}")
+        self._poller = None
+        self._poll_fd = None
         while not self.stop_thread:
             if not self.is_connected:
-                time.sleep(0.1)
+                if self.auto_reconnect and self._lost_ns is not None:
+                    self._reconnect()
+                else:
+                    time.sleep(0.1)
                 continue
             
             try:
-                # 读取数据
-                data = self.read_data()
+                if self.read_mode == ReadMode.EVENT:
+                    # 阻塞等待数据到达
+                    data = self._wait_and_read(self.EVENT_WAIT_TIMEOUT)
+                else:
+                    # 轮询读取数据，短暂休眠避免CPU占用过高
+                    data = self.read_data(raise_errors=True)
+                    if not data:
+                        time.sleep(0.001)
                 if data:
-                    # 将读取到的数据添加到缓冲区
-                    self.buffer += data.decode('utf-8', errors='ignore')
-                    
-                    # 查找完整的JSON对象
-                    json_data = self._find_json()
-                    if json_data:
-                        # 如果设置了回调函数，则调用回调函数
-                        if self.callback:
-                            self.callback(json_data)
-                        
-                        # 更新最新数据
-                        with self.data_lock:
-                            self.latest_data = json_data
-                
-                # 短暂休眠，避免CPU占用过高
-                time.sleep(0.001)
+                    self._process_data(data, time.monotonic_ns())
+            except (serial.SerialException, OSError) as e:
+                self._on_link_lost(e)
             except Exception as e:
                 logger.error(f"读取线程异常: {e}")
                 time.sleep(0.1)
         
         logger.info("串口读取线程已停止")
     
-    def _find_json(self):
+    def add_connection_listener(self, listener):
+        """
+        注册连接事件监听函数，在读取线程中调用，应尽量轻量
+        
+        参数:
+            listener (callable): 监听函数，参数为(event, info)，event为ConnectionEvent中的值，
+                                 info为包含port, time_ns以及事件相关字段的字典
+        """
+        self._connection_listeners = self._connection_listeners + (listener,)
+    
+    def remove_connection_listener(self, listener):
+        """
+        移除连接事件监听函数
+        
+        参数:
+            listener (callable): add_connection_listener注册的监听函数
+        """
+        self._connection_listeners = tuple(l for l in self._connection_listeners if l is not listener)
+    
+    def _emit_connection_event(self, event, **info):
+        """
+        通知连接事件
+        """
+        info.update(port=self.port, time_ns=time.monotonic_ns())
+        for listener in self._connection_listeners:
+            try:
+                listener(event, info)
+            except Exception as e:
+                logger.error(f"连接事件监听函数异常: {e}")
+    
+    def _on_link_lost(self, error):
+        """
+        读取出错时关闭串口并标记链路断开，未开启自动重连时读取线程保持空闲
+        """
+        self.links_lost += 1
+        self._lost_ns = time.monotonic_ns()
+        self._reopen_failures = 0
+        self.is_connected = False
+        try:
+            self.serial.close()
+        except Exception:
+            pass
+        # 丢弃断开前残留的半帧数据，自动检测时重新检测协议
+        self._reset_scanner()
+        self._poll_fd = None
+        logger.error(f"串口链路断开: {self.port}，{error}")
+        self._emit_connection_event(ConnectionEvent.LOST, error=str(error))
+    
+    def _reconnect(self):
         """
-        在缓冲区中查找完整的JSON对象
+        在读取线程中重新打开串口：设备节点不存在时以较短间隔等待其重新出现，
+        存在但打开失败时按指数退避重试，直到成功或读取线程停止
+        """
+        delay = self.RECONNECT_INITIAL_DELAY
+        while not self.stop_thread:
+            if self._try_reopen():
+                return
+            if not os.path.exists(self.port):
+                time.sleep(self.RECONNECT_POLL_INTERVAL)
+                continue
+            time.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+    
+    def _try_reopen(self):
+        """
+        尝试重新打开一次串口
         
         返回:
-            dict: 解析到的JSON对象，如果没有找到则返回None
+            bool: 是否重新打开成功
         """
+        if not os.path.exists(self.port):
+            return False
         try:
-            # 查找JSON对象的开始位置
-            buf = self.buffer
-            start = buf.find('{')
-            if start == -1:
-                if len(buf) > self._max_buffer_len:
-                    self.buffer = ""
-                return None
-            if start > 0:
-                # 丢弃噪声前缀，仅保留可能的JSON起点
-                buf = buf[start:]
-                start = 0
+            self.serial.open()
+        except (serial.SerialException, OSError) as e:
+            self._reopen_failures += 1
+            self.reconnect_attempts += 1
+            logger.debug(f"重新打开串口失败: {e}")
+            return False
+        elapsed_ms = (time.monotonic_ns() - self._lost_ns) / 1e6
+        self.reconnects += 1
+        self.reconnect_ms.add(elapsed_ms)
+        self.is_connected = True
+        if self.low_latency:
+            self._apply_low_latency()
+        logger.info(f"已重新连接串口设备: {self.port}，耗时{elapsed_ms:.1f}ms")
+        self._emit_connection_event(ConnectionEvent.RECONNECTED, attempts=self._reopen_failures,
+                                    reconnect_ms=elapsed_ms)
+        return True
+    
+    def set_low_latency(self, enabled=True, latency_timer_ms=None):
+        """
+        启用或关闭USB转串口低延迟设置，已连接时立即生效，自动重连后重新应用
+        
+        参数:
+            enabled (bool): 是否启用，关闭时恢复启用前的latency_timer并清除ASYNC_LOW_LATENCY标志
+            latency_timer_ms (int): 启用时的latency_timer(ms)，为None时沿用当前值（初始为LOW_LATENCY_TIMER_MS）
             
-            # 使用括号计数并跳过字符串内容，避免字符串内的花括号干扰
-            depth = 0
-            in_string = False
-            escaped = False
-            for i in range(start, len(buf)):
-                ch = buf[i]
-                if in_string:
-                    if escaped:
-                        escaped = False
-                    elif ch == '\\':
-                        escaped = True
-                    elif ch == '"':
-                        in_string = False
-                    continue
-                else:
-                    if ch == '"':
-                        in_string = True
-                        continue
-                    if ch == '{':
-                        depth += 1
-                    elif ch == '}':
-                        depth -= 1
-                        if depth == 0:
-                            json_str = buf[start:i+1]
-                            remainder = buf[i+1:]
-
-                            # --- 关键修改：处理多余的逗号 ---
-                            cleaned_json_str = re.sub(r',\s*}', '}', json_str)
-                            cleaned_json_str = re.sub(r',\s*\]', ']', cleaned_json_str)
-
-                            parsed = json.loads(cleaned_json_str)
-                            self.buffer = remainder
-                            return parsed
-
-            # 未找到完整JSON对象，保留缓冲区（尽量保留起始位置后的内容）
-            if len(buf) - start > self._max_buffer_len:
-                self.buffer = buf[start:][-self._max_buffer_len:]
+        返回:
+            dict: 当前生效的设置，字段见get_usb_settings；latency_timer_ms不在1~255之间时返回False
+        """
+        if latency_timer_ms is not None:
+            if not 1 <= latency_timer_ms <= 255:
+                logger.error(f"latency_timer必须在1~255ms之间: {latency_timer_ms}")
+                return False
+            self.latency_timer_ms = latency_timer_ms
+        self.low_latency = enabled
+        if self.serial is None or not self.is_connected:
+            return self.get_usb_settings()
+        if enabled:
+            return self._apply_low_latency()
+        if self._original_latency_timer is not None:
+            usb_latency.write_latency_timer(self.port, self._original_latency_timer)
+            self._original_latency_timer = None
+        fd = self._get_fileno()
+        if fd is not None:
+            usb_latency.set_low_latency_flag(fd, False)
+        self.usb_settings = self.get_usb_settings()
+        return self.usb_settings
+    
+    def _apply_low_latency(self):
+        """
+        在权限允许的范围内应用低延迟设置，并记录启用前的latency_timer
+        """
+        if self._original_latency_timer is None:
+            self._original_latency_timer = usb_latency.read_latency_timer(self.port)
+        self.usb_settings = usb_latency.configure_low_latency(
+            self.port, self._get_fileno(), self.latency_timer_ms)
+        if self.usb_settings['adapter'] is None:
+            logger.info(f"{self.port}不是USB转串口设备，跳过低延迟设置")
+        else:
+            logger.info(f"{self.port}低延迟设置: latency_timer={self.usb_settings['latency_timer_ms']}ms, "
+                        f"ASYNC_LOW_LATENCY={self.usb_settings['async_low_latency']}")
+        return self.usb_settings
+    
+    def get_usb_settings(self):
+        """
+        获取串口当前生效的USB转串口低延迟设置
+        
+        返回:
+            dict: 包含adapter（驱动、VID/PID等，非USB串口时为None）、latency_timer_ms、
+                  async_low_latency字段，不支持或无法读取的项为None
+        """
+        fd = self._get_fileno() if self.serial is not None and self.is_connected else None
+        return usb_latency.get_settings(self.port, fd)
+    
+    def _process_data(self, data, recv_ns=None):
+        """
+        处理一次读取到的数据：切分并解析其中所有完整帧，然后按交付模式交付
+        
+        参数:
+            data (bytes): 读取到的数据
+            recv_ns (int): 读取完成时的time.monotonic_ns()时间戳，默认为当前时间
+        """
+        if recv_ns is None:
+            recv_ns = time.monotonic_ns()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(recv_ns, data)
+        if self.active_protocol is None:
+            data = self._detect_protocol(data)
+            if data is None:
+                return
+        # 将读取到的数据交给帧扫描器
+        self.scanner.feed(data)
+        frames = self._extract_frames(recv_ns)
+        if frames:
+            self._unframed_bytes = 0
+            self._deliver(frames)
+        elif self.protocol == Protocol.AUTO:
+            self._unframed_bytes += len(data)
+            if self._unframed_bytes > self.PROTOCOL_REDETECT_BYTES:
+                logger.warning(f"连续{self._unframed_bytes}字节没有有效的{self.active_protocol}帧，重新检测协议")
+                pending = bytes(self.scanner.buffer)
+                self._reset_scanner()
+                self._detect_buffer += pending
+    
+    def _replace_scanner(self):
+        """
+        按当前协议创建新的帧扫描器，协议未确定时使用JSON扫描器；旧扫描器的损坏计数计入累计值
+        """
+        if self.scanner is not None:
+            for name in _CORRUPTION_FIELDS:
+                self._corruption_totals[name] += getattr(self.scanner, name, 0)
+        if self.active_protocol == Protocol.BINARY:
+            self.scanner = BinaryFrameScanner(max_buffer_len=self._max_buffer_len)
+        else:
+            self.scanner = JsonFrameScanner(max_buffer_len=self._max_buffer_len, max_frame_len=self._max_frame_len,
+                                            start_keys=self.frame_keys)
+    
+    def set_frame_keys(self, keys):
+        """
+        设置JSON帧合法的首个键名，扫描器据此提前拒绝损坏的帧，并在帧内出现新的帧起始时直接重新同步
+        
+        参数:
+            keys (tuple): 含引号的键名字节串，如(b'"motor"', b'"Version"')，为空时不检查键名
+        """
+        self.frame_keys = tuple(keys)
+        if isinstance(self.scanner, JsonFrameScanner):
+            self.scanner.set_start_keys(self.frame_keys)
+    
+    def get_corruption_stats(self):
+        """
+        获取数据损坏统计，跨协议切换和重连累计
+        
+        返回:
+            dict: 包含bytes_discarded（丢弃的字节数）、starts_rejected（被拒绝的帧起始）、
+                  frames_resynced（被新帧起始截断的帧）、frames_invalid（字符串损坏的帧）、
+                  frames_oversize（超长未闭合的帧）、frames_rejected（解析失败的帧）、
+                  crc_errors和header_errors（二进制帧校验失败和帧头错误）字段
+        """
+        stats = dict(self._corruption_totals)
+        for name in _CORRUPTION_FIELDS:
+            stats[name] += getattr(self.scanner, name, 0)
+        return stats
+    
+    def _reset_scanner(self):
+        """
+        丢弃扫描器中的数据，自动检测时回到检测状态
+        """
+        if self.protocol == Protocol.AUTO:
+            self.active_protocol = None
+            self._detect_buffer.clear()
+        self._unframed_bytes = 0
+        self._replace_scanner()
+    
+    def _detect_protocol(self, data):
+        """
+        缓存数据直到能够确定协议：出现通过CRC校验的二进制帧时为BINARY，
+        出现能够完整切分并解析的JSON帧时为JSON；二进制负载中偶然出现的'{"'不会误判为JSON
+        
+        返回:
+            bytes: 协议确定后需要交给扫描器的全部缓存数据，尚未确定时返回None
+        """
+        buffer = self._detect_buffer
+        buffer += data
+        if find_binary_frame(buffer):
+            protocol = Protocol.BINARY
+        elif _JSON_FRAME_START.search(buffer) and self._has_json_frame(buffer):
+            protocol = Protocol.JSON
+        else:
+            if len(buffer) > self._max_buffer_len:
+                del buffer[:len(buffer) - self._max_buffer_len]
             return None
+        self.active_protocol = protocol
+        self._replace_scanner()
+        if protocol != self._detected_protocol:
+            self._detected_protocol = protocol
+            self.protocol_switches += 1
+            logger.info(f"检测到遥测帧协议: {protocol}")
+        pending = bytes(buffer)
+        buffer.clear()
+        return pending
+    
+    def _has_json_frame(self, buffer):
+        """
+        用临时的JSON扫描器检查缓存中是否有完整且能够解析的JSON对象帧
+        """
+        probe = JsonFrameScanner(max_buffer_len=self._max_buffer_len, max_frame_len=self._max_frame_len,
+                                 start_keys=self.frame_keys)
+        probe.feed(buffer)
+        while True:
+            frame = probe.next_frame()
+            if frame is None:
+                return False
+            try:
+                if isinstance(_loads_json(frame), dict):
+                    return True
+            except json.JSONDecodeError:
+                pass
+            probe.rewind(frame)
+    
+    def _extract_frames(self, recv_ns):
+        """
+        从缓冲区中取出并解析所有完整的JSON对象，并为每帧标记接收时间戳和序号
+        
+        参数:
+            recv_ns (int): 本次读取的接收时间戳
+            
+        返回:
+            list: 解析到的JSON对象列表，按到达顺序排列，每个对象带有seq和recv_ns字段
+        """
+        frames = []
+        try:
+            while True:
+                frame = self.scanner.next_frame()
+                if frame is None:
+                    break
+                seq = self._next_seq
+                self._next_seq += 1
+                parsed = self._parse_frame(frame)
+                if parsed is not None:
+                    parsed['seq'] = seq
+                    parsed['recv_ns'] = recv_ns
+                    frames.append(parsed)
+        except Exception as e:
+            logger.error(f"通信Json异常: {e}")
+            self._replace_scanner()
+        return frames
+    
+    def _deliver(self, frames):
+        """
+        按交付模式将一次读取得到的帧交给回调函数并更新最新数据
+        
+        参数:
+            frames (list): 按到达顺序排列的JSON对象列表
+        """
+        count = len(frames)
+        if self._lost_ns is not None and self.is_connected:
+            elapsed_ms = (time.monotonic_ns() - self._lost_ns) / 1e6
+            self._lost_ns = None
+            self.recovery_ms.add(elapsed_ms)
+            self._emit_connection_event(ConnectionEvent.RESUMED, recovery_ms=elapsed_ms)
+        self.frames_received += count
+        if count > self.max_burst:
+            self.max_burst = count
+        collapsed = 0
+        if count > 1:
+            self.burst_reads += 1
+            self.frames_superseded += count - 1
+            if self.delivery_mode == DeliveryMode.LATEST_ONLY:
+                # 按顺序合并，后到的字段覆盖先到的，得到最新状态
+                merged = {}
+                for frame in frames:
+                    merged.update(frame)
+                frames = [merged]
+                collapsed = count - 1
+                self.frames_collapsed += collapsed
+        
+        for frame in frames:
+            self.timing_stats.add(frame['seq'], frame['recv_ns'], collapsed)
+            
+            # 如果设置了回调函数，则调用回调函数
+            if self.callback:
+                self.callback(frame)
+            
+            # 更新最新数据
+            with self.data_lock:
+                self.latest_data = frame
+            
+            # 分发给订阅者
+            if self.subscriptions:
+                self.subscriptions.publish(frame)
+            
+            # 提交给回调分发器
+            if self.dispatcher is not None:
+                self.dispatcher.dispatch(frame)
+        self.frames_delivered += len(frames)
+    
+    def _parse_frame(self, frame):
+        """
+        解析一个完整的JSON帧
+        
+        参数:
+            frame (bytes): 扫描器切分出的完整帧
+            
+        返回:
+            dict: 解析到的JSON对象，解析失败则返回None
+        """
+        if self.active_protocol == Protocol.BINARY:
+            parsed = decode_binary_frame(frame)
+            if parsed is not None:
+                self.frames_binary_decoded += 1
+            return parsed
+        
+        if self.decoder is not None:
+            parsed = self.decoder(frame)
+            if parsed is not None:
+                self.frames_fast_decoded += 1
+                return parsed
+        
+        try:
+            # --- 关键修改：处理多余的逗号 ---
+            parsed = _loads_json(frame)
+            self.frames_json_decoded += 1
+            return parsed
         except json.JSONDecodeError as e:
             logger.error(f"JSON解析错误: {e}")
             # 丢弃当前起始符，尝试从后续数据中恢复
-            self.buffer = buf[start+1:] if start >= 0 else ""
-            return None
-        except Exception as e:
-            logger.error(f"通信Json异常: {e}")
-            self.buffer = ""
+            self.scanner.rewind(frame)
             return None
     
+    def start_dispatcher(self, mode=DispatchMode.SERIAL, max_pending=256, workers=4,
+                         high_watermark=None, on_backpressure=None, slow_ms=None):
+        """
+        启动回调分发器，此后通过add_callback注册的回调在读取线程之外执行
+        
+        参数:
+            mode (str): 分发模式，DispatchMode.SERIAL按帧顺序串行执行，
+                        DispatchMode.PER_FRAME每帧提交到线程池并发执行，默认为串行
+            max_pending (int): 最多等待执行的帧数，超出时丢弃帧，默认为256
+            workers (int): 逐帧模式下的线程池大小，默认为4
+            high_watermark (int): 触发背压信号的待处理帧数，默认为max_pending的一半
+            on_backpressure (callable): 背压状态变化时调用，参数为(active, stats)，应尽量轻量
+            slow_ms (float): 单次回调耗时超过该值（毫秒）时计为慢回调，默认为None不统计
+            
+        返回:
+            CallbackDispatcher: 回调分发器
+        """
+        if self.dispatcher is not None and self.dispatcher.is_running():
+            logger.warning("回调分发器已经在运行")
+            return self.dispatcher
+        dispatcher = CallbackDispatcher(mode=mode, max_pending=max_pending, workers=workers,
+                                        high_watermark=high_watermark, on_backpressure=on_backpressure,
+                                        slow_ms=slow_ms)
+        if self.dispatcher is not None:
+            # 保留此前注册的回调
+            dispatcher._callbacks = self.dispatcher._callbacks
+        dispatcher.start()
+        self.dispatcher = dispatcher
+        return dispatcher
+    
+    def _resume_dispatcher(self):
+        """
+        重新连接后恢复已注册回调的分发
+        """
+        if self.dispatcher is not None and len(self.dispatcher) and not self.dispatcher.is_running():
+            self.dispatcher.start()
+    
+    def stop_dispatcher(self):
+        """
+        停止回调分发器，已注册的回调保留，重新启动后继续生效
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+    
+    def add_callback(self, callback, name=None):
+        """
+        注册在读取线程之外执行的回调函数，分发器未启动时以默认参数启动
+        
+        参数:
+            callback (callable): 回调函数，接收数据帧(dict)
+            name (str): 回调名称，用于统计信息，默认为函数名
+            
+        返回:
+            CallbackHandle: 回调句柄，可用于remove_callback
+        """
+        if self.dispatcher is None or not self.dispatcher.is_running():
+            self.start_dispatcher()
+        return self.dispatcher.add_callback(callback, name)
+    
+    def remove_callback(self, handle):
+        """
+        移除通过add_callback注册的回调函数
+        
+        参数:
+            handle (CallbackHandle): add_callback()返回的回调句柄
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.remove_callback(handle)
+    
+    def subscribe(self, maxsize=64, policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.005, name=None):
+        """
+        订阅数据帧，每个订阅者拥有独立的有界队列，断开连接时订阅自动关闭
+        
+        参数:
+            maxsize (int): 队列最大长度，默认为64
+            policy (str): 队列已满时的处理策略，OverflowPolicy.DROP_OLDEST/DROP_NEWEST/BLOCK，
+                          默认为丢弃最旧的帧
+            block_timeout (float): BLOCK策略下读取线程的最长等待时间（秒），默认为0.005
+            name (str): 订阅者名称，用于统计信息
+            
+        返回:
+            Subscription: 订阅对象，可通过get()或迭代获取数据帧
+        """
+        return self.subscriptions.subscribe(maxsize, policy, block_timeout, name)
+    
+    def unsubscribe(self, subscription):
+        """
+        取消订阅
+        
+        参数:
+            subscription (Subscription): subscribe()返回的订阅对象
+        """
+        self.subscriptions.unsubscribe(subscription)
+    
+    def get_stats(self):
+        """
+        获取串口数据处理的统计信息
+        
+        返回:
+            dict: 统计信息，scanner字段为帧扫描器统计（含每帧扫描字节数），
+                  parser字段为JSON帧快速解码/通用JSON解析的帧数，
+                  protocol字段为遥测帧协议、自动检测状态及二进制帧数，
+                  corruption字段为跨扫描器累计的数据损坏统计，delivery字段为帧交付统计，
+                  timing字段为交付帧的到达间隔抖动和序号间断统计，
+                  writer字段为命令写线程统计（未启用时为None），
+                  subscriptions字段为各订阅者的队列统计，
+                  dispatcher字段为回调分发统计（未启用时为None），
+                  connection字段为链路断开/重连次数及恢复耗时统计，
+                  usb字段为最近一次应用的低延迟设置（未启用时为None）
+        """
+        return {
+            'scanner': self.scanner.get_stats(),
+            'corruption': self.get_corruption_stats(),
+            'parser': {
+                'fast': self.frames_fast_decoded,
+                'json': self.frames_json_decoded
+            },
+            'protocol': {
+                'mode': self.protocol,
+                'active': self.active_protocol,
+                'switches': self.protocol_switches,
+                'binary_frames': self.frames_binary_decoded
+            },
+            'delivery': {
+                'mode': self.delivery_mode,
+                'frames_received': self.frames_received,
+                'frames_delivered': self.frames_delivered,
+                'frames_collapsed': self.frames_collapsed,
+                'frames_superseded': self.frames_superseded,
+                'burst_reads': self.burst_reads,
+                'max_burst': self.max_burst
+            },
+            'timing': self.timing_stats.as_dict(),
+            'writer': self.writer.get_stats() if self.writer else None,
+            'subscriptions': self.subscriptions.get_stats(),
+            'dispatcher': self.dispatcher.get_stats() if self.dispatcher else None,
+            'connection': {
+                'connected': self.is_connected,
+                'auto_reconnect': self.auto_reconnect,
+                'links_lost': self.links_lost,
+                'reconnects': self.reconnects,
+                'reconnect_attempts': self.reconnect_attempts,
+                'reconnect_ms': self.reconnect_ms.as_dict(),
+                'recovery_ms': self.recovery_ms.as_dict()
+            },
+            'usb': self.usb_settings
+        }
+    
+    def start_recording(self, path):
+        """
+        开始录制串口原始字节流及读取时间戳，可用ReplaySerialComm回放
+        
+        参数:
+            path (str): 录制文件路径
+            
+        返回:
+            bool: 是否成功开始录制
+        """
+        # 延迟导入，避免循环导入
+        from .capture import CaptureWriter
+        self.stop_recording()
+        try:
+            self.recorder = CaptureWriter(path)
+        except OSError as e:
+            logger.error(f"创建录制文件失败: {e}")
+            return False
+        logger.info(f"开始录制串口数据: {path}")
+        return True
+    
+    def stop_recording(self):
+        """
+        停止录制串口原始字节流
+        """
+        recorder = self.recorder
+        if recorder is not None:
+            self.recorder = None
+            recorder.close()
+            logger.info(f"已停止录制串口数据，共{recorder.records}条记录，{recorder.bytes}字节")
+    
     def start_reading_thread(self, callback=None):
         """
         启动读取线程
         
         参数:
-            callback (callable): 数据回调函数，接收解析后的JSON对象
+            callback (callable): 数据回调函数，接收解析后的JSON对象，在读取线程中直接执行，
+                                 耗时较长的处理应通过add_callback注册
+        
+        异常:
+            OSError: 使用反应器时串口没有可监听的文件描述符
         """
         if self.reading_thread and self.reading_thread.is_alive():
             logger.warning("读取线程已经在运行")
@@ -281,6 +1073,11 @@ class SerialComm:
         
         self.callback = callback
         self.stop_thread = False
+        self._resume_dispatcher()
+        if self.reactor is not None:
+            # 由共享反应器线程读取
+            self.reactor.register(self)
+            return
         self.reading_thread = threading.Thread(target=self._reading_thread_func)
         self.reading_thread.daemon = True
         self.reading_thread.start()
@@ -290,6 +1087,8 @@ class SerialComm:
         停止读取线程
         """
         self.stop_thread = True
+        if self.reactor is not None:
+            self.reactor.unregister(self)
         if self.reading_thread and self.reading_thread.is_alive():
             self.reading_thread.join(timeout=1.0)
             logger.info("读取线程已停止")
@@ -299,7 +1098,7 @@ class SerialComm:
         获取最新的数据
         
         返回:
-            dict: 最新的数据
+            dict: 最新的数据，其中seq为帧序号，recv_ns为接收时的time.monotonic_ns()时间戳
         """
         with self.data_lock:
             return self.latest_data.copy()
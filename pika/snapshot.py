@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+遥测快照模块，定义Sense和Gripper的不可变遥测快照
+
+读取线程每收到一帧就构造一个新的快照并整体替换设备对象上的引用，
+读取方直接取用该引用即可得到同一帧中的全部字段，无需加锁或复制。
+字段名与数据帧及遥测历史(pika.history)中的字段名一致。
+"""
+
+from collections import namedtuple
+
+# Gripper遥测快照
+GripperSnapshot = namedtuple('GripperSnapshot', [
+    'seq',          # 帧序号，尚未收到数据时为None
+    'recv_ns',      # 接收时间戳(time.monotonic_ns())，尚未收到数据时为None
+    'Speed',        # 电机转速(rad/s)
+    'Current',      # 电机相电流(mA)
+    'Position',     # 电机位置(rad)
+    'Voltage',      # 驱动器电压(V)
+    'DriverTemp',   # 驱动器温度(°C)
+    'MotorTemp',    # 电机温度(°C)
+    'Status',       # 驱动器状态（原始字符串）
+    'BusCurrent'    # 母线电流(mA)
+])
+
+GRIPPER_SNAPSHOT_DEFAULT = GripperSnapshot(
+    seq=None, recv_ns=None, Speed=0.0, Current=0, Position=0.0,
+    Voltage=0.0, DriverTemp=0, MotorTemp=0, Status="0x00", BusCurrent=0)
+
+# Sense遥测快照，acc和gyr为长度3的元组，尚未收到IMU数据时为nan
+SenseSnapshot = namedtuple('SenseSnapshot', [
+    'seq',          # 帧序号，尚未收到数据时为None
+    'recv_ns',      # 接收时间戳(time.monotonic_ns())，尚未收到数据时为None
+    'angle',        # 编码器角度(°)
+    'rad',          # 编码器弧度(rad)
+    'Command',      # 命令状态
+    'acc',          # IMU加速度
+    'gyr',          # IMU角速度
+    'pitch',
+    'roll',
+    'yaw'
+])
+
+_NAN = float('nan')
+
+SENSE_SNAPSHOT_DEFAULT = SenseSnapshot(
+    seq=None, recv_ns=None, angle=0.0, rad=0.0, Command=0,
+    acc=(_NAN, _NAN, _NAN), gyr=(_NAN, _NAN, _NAN), pitch=_NAN, roll=_NAN, yaw=_NAN)
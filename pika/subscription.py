@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+数据帧订阅模块，将读取线程交付的数据帧分发给多个订阅者
+
+每个订阅者拥有独立的有界队列和溢出策略，读取线程只做入队操作，
+慢速订阅者不会阻塞读取线程（BLOCK策略的等待时间也有上限）。
+"""
+
+import time
+import threading
+from collections import deque
+
+
+class OverflowPolicy:
+    """
+    订阅队列已满时的处理策略
+    """
+    DROP_OLDEST = 'drop_oldest'     # 丢弃队列中最旧的帧，保留最新数据
+    DROP_NEWEST = 'drop_newest'     # 丢弃新到达的帧，保留已排队的数据
+    BLOCK = 'block'                 # 读取线程最多等待block_timeout秒，仍满则丢弃新帧
+
+
+class Subscription:
+    """
+    单个订阅者的有界数据帧队列
+
+    由读取线程调用put()入队，订阅者线程通过get()或迭代获取数据帧；
+    数据帧与回调函数收到的是同一个对象，订阅者不应修改它。
+
+    参数:
+        maxsize (int): 队列最大长度，默认为64
+        policy (str): 队列已满时的处理策略，默认为OverflowPolicy.DROP_OLDEST
+        block_timeout (float): BLOCK策略下读取线程的最长等待时间（秒），默认为0.005
+        name (str): 订阅者名称，用于统计信息
+    """
+    def __init__(self, maxsize=64, policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.005, name=None):
+        if maxsize <= 0:
+            raise ValueError("订阅队列长度必须大于0")
+        if policy not in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.DROP_NEWEST, OverflowPolicy.BLOCK):
+            raise ValueError(f"不支持的溢出策略: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.name = name
+        self.closed = False
+        self._queue = deque()
+        self._cond = threading.Condition()
+        # 统计
+        self.received = 0       # 入队的帧数
+        self.consumed = 0       # 被订阅者取走的帧数
+        self.dropped = 0        # 因队列已满被丢弃的帧数
+        self.blocked = 0        # BLOCK策略下读取线程发生等待的次数
+        self.max_depth = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def put(self, frame):
+        """
+        将数据帧放入队列（由读取线程调用）
+
+        参数:
+            frame (dict): 数据帧
+
+        返回:
+            bool: 数据帧是否入队
+        """
+        with self._cond:
+            if self.closed:
+                return False
+            queue = self._queue
+            if len(queue) >= self.maxsize:
+                if self.policy == OverflowPolicy.DROP_OLDEST:
+                    queue.popleft()
+                    self.dropped += 1
+                elif self.policy == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                else:
+                    self.blocked += 1
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(queue) >= self.maxsize and not self.closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._cond.wait(remaining)
+                    if self.closed:
+                        return False
+            queue.append(frame)
+            self.received += 1
+            if len(queue) > self.max_depth:
+                self.max_depth = len(queue)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        取出最早的数据帧
+
+        参数:
+            timeout (float): 最长等待时间（秒），为None时一直等待，为0时不等待
+
+        返回:
+            dict: 数据帧，超时或订阅已关闭且队列为空时返回None
+        """
+        with self._cond:
+            if not self._queue and not self.closed and timeout != 0:
+                if timeout is None:
+                    while not self._queue and not self.closed:
+                        self._cond.wait()
+                else:
+                    deadline = time.monotonic() + timeout
+                    while not self._queue and not self.closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+            if not self._queue:
+                return None
+            frame = self._queue.popleft()
+            self.consumed += 1
+            self._cond.notify_all()
+            return frame
+
+    def get_all(self):
+        """
+        取出队列中的全部数据帧，不等待
+
+        返回:
+            list: 按到达顺序排列的数据帧列表
+        """
+        with self._cond:
+            frames = list(self._queue)
+            self._queue.clear()
+            self.consumed += len(frames)
+            self._cond.notify_all()
+            return frames
+
+    def __iter__(self):
+        """
+        逐帧迭代，订阅关闭且队列取空后结束
+        """
+        while True:
+            frame = self.get()
+            if frame is None:
+                return
+            yield frame
+
+    def close(self):
+        """
+        关闭订阅，唤醒所有等待者；已排队的数据帧仍可取出
+        """
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """
+        获取订阅统计信息
+
+        返回:
+            dict: 包含name, policy, queue_depth, max_depth, received, consumed, dropped, blocked字段
+        """
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'queue_depth': len(self._queue),
+            'max_depth': self.max_depth,
+            'received': self.received,
+            'consumed': self.consumed,
+            'dropped': self.dropped,
+            'blocked': self.blocked
+        }
+
+
+class SubscriptionHub:
+    """
+    订阅者集合，读取线程遍历时不加锁（订阅/退订时整体替换列表）
+    """
+    def __init__(self):
+        self._subscriptions = ()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, maxsize=64, policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.005, name=None):
+        """
+        新增订阅者，参数与Subscription相同
+
+        返回:
+            Subscription: 订阅对象
+        """
+        subscription = Subscription(maxsize, policy, block_timeout, name)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        移除并关闭订阅者
+
+        参数:
+            subscription (Subscription): subscribe()返回的订阅对象
+        """
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+        subscription.close()
+
+    def publish(self, frame):
+        """
+        将数据帧分发给全部订阅者（由读取线程调用）
+        """
+        for subscription in self._subscriptions:
+            subscription.put(frame)
+
+    def close(self):
+        """
+        关闭并移除全部订阅者
+        """
+        with self._lock:
+            subscriptions = self._subscriptions
+            self._subscriptions = ()
+        for subscription in subscriptions:
+            subscription.close()
+
+    def get_stats(self):
+        """
+        获取全部订阅者的统计信息
+
+        返回:
+            list: 每个订阅者的统计信息
+        """
+        return [s.get_stats() for s in self._subscriptions]
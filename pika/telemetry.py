@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+设备遥测数据模块，提供针对Sense和Gripper固件帧格式的快速解码器
+
+快速解码器按固件输出的固定帧布局直接从字节中提取字段并转换为约定的类型
+（角度、速度、电压等为float，电流、温度等为int），跳过去除多余逗号的正则替换
+和json.loads；帧布局或字段类型不匹配时返回None，由SerialComm退回通用JSON解析。
+"""
+
+import re
+
+# 各设备帧合法的首个键名，供帧扫描器提前拒绝损坏的帧
+GRIPPER_FRAME_KEYS = (b'"motor"', b'"motorstatus"', b'"Version"')
+SENSE_FRAME_KEYS = (b'"Command"', b'"AS5047"', b'"IMU"', b'"Version"')
+
+# 数值字段，具体合法性由float()/int()转换时校验
+_NUM = rb'([-+.\deE]+)'
+# 字符串字段内容
+_STR = rb'"([^"\\\r\n]*)"'
+# 数值数组内容
+_ARR = rb'\[([-+.\deE,\s]*)\]'
+# 可选的多余逗号
+_TRAILING = rb',?'
+
+
+def _field(name, value, last=False):
+    """
+    构造单个"key":value字段的正则片段
+    """
+    sep = _TRAILING if last else rb','
+    return rb'\s*"' + name + rb'"\s*:\s*' + value + sep
+
+
+# Gripper固件帧布局:
+# {"motor":{"Speed":..,"Current":..,"Position":..},"motorstatus":{"Voltage":..,"DriverTemp":..,
+#  "MotorTemp":..,"Status":"..","BusCurrent":..}}
+GRIPPER_FRAME_PATTERN = re.compile(
+    rb'\{\s*"motor"\s*:\s*\{'
+    + _field(b'Speed', _NUM)
+    + _field(b'Current', _NUM)
+    + _field(b'Position', _NUM, last=True)
+    + rb'\s*\}\s*,\s*"motorstatus"\s*:\s*\{'
+    + _field(b'Voltage', _NUM)
+    + _field(b'DriverTemp', _NUM)
+    + _field(b'MotorTemp', _NUM)
+    + _field(b'Status', _STR)
+    + _field(b'BusCurrent', _NUM, last=True)
+    + rb'\s*\}\s*' + _TRAILING + rb'\s*\}'
+)
+
+# Sense固件帧布局:
+# {"Command":..,"AS5047":{"angle":..,"rad":..},"IMU":{"acc":[..],"gyr":[..],"pitch":..,"roll":..,"yaw":..}}
+SENSE_FRAME_PATTERN = re.compile(
+    rb'\{'
+    + _field(b'Command', _NUM)
+    + rb'\s*"AS5047"\s*:\s*\{'
+    + _field(b'angle', _NUM)
+    + _field(b'rad', _NUM, last=True)
+    + rb'\s*\}\s*,\s*"IMU"\s*:\s*\{'
+    + _field(b'acc', _ARR)
+    + _field(b'gyr', _ARR)
+    + _field(b'pitch', _NUM)
+    + _field(b'roll', _NUM)
+    + _field(b'yaw', _NUM, last=True)
+    + rb'\s*\}\s*' + _TRAILING + rb'\s*\}'
+)
+
+
+def _float_array(raw):
+    """
+    将数值数组内容转换为浮点数列表
+    """
+    if not raw.strip():
+        return []
+    return [float(item) for item in raw.split(b',')]
+
+
+def decode_gripper_frame(frame):
+    """
+    快速解码Gripper遥测帧
+
+    参数:
+        frame (bytes): 帧扫描器切分出的完整帧
+
+    返回:
+        dict: 与json.loads结果结构一致的数据，帧布局不匹配时返回None
+    """
+    m = GRIPPER_FRAME_PATTERN.fullmatch(frame)
+    if m is None:
+        return None
+    speed, current, position, voltage, driver_temp, motor_temp, status, bus_current = m.groups()
+    try:
+        return {
+            'motor': {
+                'Speed': float(speed),
+                'Current': int(current),
+                'Position': float(position)
+            },
+            'motorstatus': {
+                'Voltage': float(voltage),
+                'DriverTemp': int(driver_temp),
+                'MotorTemp': int(motor_temp),
+                'Status': status.decode('utf-8', errors='ignore'),
+                'BusCurrent': int(bus_current)
+            }
+        }
+    except ValueError:
+        # 字段类型与固件约定不符，交给通用JSON解析
+        return None
+
+
+def decode_sense_frame(frame):
+    """
+    快速解码Sense遥测帧
+
+    参数:
+        frame (bytes): 帧扫描器切分出的完整帧
+
+    返回:
+        dict: 与json.loads结果结构一致的数据，帧布局不匹配时返回None
+    """
+    m = SENSE_FRAME_PATTERN.fullmatch(frame)
+    if m is None:
+        return None
+    command, angle, rad, acc, gyr, pitch, roll, yaw = m.groups()
+    try:
+        return {
+            'Command': int(command),
+            'AS5047': {
+                'angle': float(angle),
+                'rad': float(rad)
+            },
+            'IMU': {
+                'acc': _float_array(acc),
+                'gyr': _float_array(gyr),
+                'pitch': float(pitch),
+                'roll': float(roll),
+                'yaw': float(yaw)
+            }
+        }
+    except ValueError:
+        # 字段类型与固件约定不符，交给通用JSON解析
+        return None
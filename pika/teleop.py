@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+遥操作桥接模块，将Sense编码器数据实时映射为Gripper设定值
+
+桥接函数注册为Sense的数据帧回调（pika.dispatcher），每收到一帧编码器数据立即计算设定值
+并发送给Gripper，不再以固定周期轮询；回调积压时只处理最新的一帧，变化小于死区时不重复发送。
+同一进程中可以同时运行多组Sense/Gripper桥接，每组相互独立。
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from .metrics import RunningStats, percentile
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.teleop")
+
+
+class TeleopMode:
+    """
+    遥操作映射方式
+    """
+    ANGLE = 'angle'         # Sense编码器弧度直接作为Gripper电机弧度
+    DISTANCE = 'distance'   # 按各自的连杆参数换算开合距离(mm)，再反算Gripper电机弧度
+
+
+class TeleopBridge:
+    """
+    Sense→Gripper遥操作桥接
+
+    设定值 = Sense输入 × scale + offset，截断到[min_value, max_value]后，与上一次发送的设定值之差
+    不超过deadband时不发送。ANGLE模式下各值单位为rad，DISTANCE模式下为mm。
+
+    参数:
+        sense (Sense): 输入设备，需已连接
+        gripper (Gripper): 输出设备，需已连接并使能
+        mode (str): 映射方式，TeleopMode.ANGLE或TeleopMode.DISTANCE，默认为ANGLE
+        scale (float): 缩放系数，默认为1.0
+        offset (float): 偏移量，默认为0.0
+        min_value (float): 设定值下限，默认为Gripper的有效范围下限（ANGLE模式0rad，DISTANCE模式0mm）
+        max_value (float): 设定值上限，默认为Gripper的有效范围上限
+        deadband (float): 死区，默认为0.0（设定值不变时仍不重复发送）
+        latency_window (int): 计算延迟百分位数时保留的最近样本数，默认为4096
+        name (str): 桥接名称，用于回调统计和日志，默认为'teleop'
+    """
+    def __init__(self, sense, gripper, mode=TeleopMode.ANGLE, scale=1.0, offset=0.0,
+                 min_value=None, max_value=None, deadband=0.0, latency_window=4096, name='teleop'):
+        if mode not in (TeleopMode.ANGLE, TeleopMode.DISTANCE):
+            raise ValueError(f"不支持的遥操作映射方式: {mode}")
+        self.sense = sense
+        self.gripper = gripper
+        self.mode = mode
+        self.scale = scale
+        self.offset = offset
+        kinematics = gripper.kinematics
+        if mode == TeleopMode.ANGLE:
+            low, high = 0.0, kinematics.max_angle
+        else:
+            low, high = kinematics.min_distance, kinematics.max_distance
+        # 设定值范围不超出Gripper的有效范围
+        self.min_value = low if min_value is None else max(low, min_value)
+        self.max_value = high if max_value is None else min(high, max_value)
+        if self.min_value > self.max_value:
+            raise ValueError("设定值下限不能大于上限")
+        self.deadband = deadband
+        self.name = name
+        self._handle = None
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        清空统计数据
+        """
+        with self._lock:
+            self.frames = 0             # 收到的编码器帧数
+            self.commands = 0           # 发送的设定值命令数
+            self.suppressed = 0         # 变化不超过死区、未发送的帧数
+            self.stale = 0              # 回调积压时已有更新的帧、被跳过的帧数
+            self.clamped = 0            # 设定值被截断的帧数
+            self.failures = 0           # 发送失败的命令数
+            self.last_setpoint = None
+            self._last_seq = -1
+            self._last_send_ns = None
+            self.latency_ms = RunningStats()    # 帧接收(recv_ns)到命令发出的时间
+            self.interval_ms = RunningStats()   # 相邻两次发送的间隔，标准差即发送抖动
+            self._latencies.clear()
+
+    def start(self):
+        """
+        开始桥接，将桥接函数注册为Sense的数据帧回调
+
+        返回:
+            bool: 是否成功启动
+        """
+        if self._handle is not None:
+            logger.warning(f"遥操作桥接{self.name}已经在运行")
+            return True
+        if not self.sense.is_connected or not self.gripper.is_connected:
+            logger.error(f"遥操作桥接{self.name}启动失败：Sense或Gripper未连接")
+            return False
+        self._handle = self.sense.add_callback(self._on_frame, name=self.name)
+        logger.info(f"遥操作桥接{self.name}已启动，映射方式: {self.mode}")
+        return True
+
+    def stop(self):
+        """
+        停止桥接，Gripper保持最后一次发送的设定值
+        """
+        if self._handle is None:
+            return
+        self.sense.remove_callback(self._handle)
+        self._handle = None
+        logger.info(f"遥操作桥接{self.name}已停止")
+
+    def is_running(self):
+        """
+        桥接是否正在运行
+        """
+        return self._handle is not None
+
+    def map_value(self, rad):
+        """
+        将Sense编码器弧度映射为设定值（截断前）
+
+        参数:
+            rad (float): Sense编码器弧度
+
+        返回:
+            float: ANGLE模式下为电机弧度，DISTANCE模式下为开合距离(mm)
+        """
+        if self.mode == TeleopMode.DISTANCE:
+            rad = self.sense.kinematics.angle_to_distance(rad)
+        return rad * self.scale + self.offset
+
+    def _on_frame(self, frame):
+        """
+        数据帧回调：每收到一帧编码器数据计算并发送一次设定值
+        """
+        encoder = frame.get('AS5047')
+        if encoder is None:
+            return
+        seq = frame.get('seq', -1)
+        with self._lock:
+            self.frames += 1
+            # 回调积压时已有更新的帧，跳过旧帧
+            latest = self.sense.snapshot().seq
+            if seq <= self._last_seq or (latest is not None and seq < latest):
+                self.stale += 1
+                return
+            self._last_seq = seq
+            value = self.map_value(encoder.get('rad', 0.0))
+            if value < self.min_value or value > self.max_value:
+                value = min(max(value, self.min_value), self.max_value)
+                self.clamped += 1
+            last = self.last_setpoint
+            if last is not None and abs(value - last) <= self.deadband:
+                self.suppressed += 1
+                return
+            if self.mode == TeleopMode.DISTANCE:
+                angle = self.gripper.kinematics.distance_to_angle(value)
+            else:
+                angle = value
+            if not self.gripper.set_motor_angle(angle):
+                self.failures += 1
+                return
+            now = time.monotonic_ns()
+            self.commands += 1
+            self.last_setpoint = value
+            recv_ns = frame.get('recv_ns')
+            if recv_ns is not None:
+                latency = (now - recv_ns) / 1e6
+                self.latency_ms.add(latency)
+                self._latencies.append(latency)
+            if self._last_send_ns is not None:
+                self.interval_ms.add((now - self._last_send_ns) / 1e6)
+            self._last_send_ns = now
+
+    def get_stats(self):
+        """
+        获取桥接统计信息
+
+        返回:
+            dict: 包含name, mode, running, frames, commands, suppressed, stale, clamped, failures,
+                  last_setpoint, latency_ms（帧接收到命令发出，含最近样本的p50/p99）,
+                  interval_ms（发送间隔，std即抖动）字段
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            latency = self.latency_ms.as_dict()
+            latency.update(p50=percentile(latencies, 50), p99=percentile(latencies, 99))
+            return {
+                'name': self.name,
+                'mode': self.mode,
+                'running': self.is_running(),
+                'frames': self.frames,
+                'commands': self.commands,
+                'suppressed': self.suppressed,
+                'stale': self.stale,
+                'clamped': self.clamped,
+                'failures': self.failures,
+                'last_setpoint': self.last_setpoint,
+                'latency_ms': latency,
+                'interval_ms': self.interval_ms.as_dict()
+            }
+
+
+class TeleopGroup:
+    """
+    同一进程中的多组遥操作桥接，统一启动、停止和获取统计
+
+    每组桥接注册在各自Sense的回调分发器上，一组的Gripper写入延误不会影响其他组。
+    """
+    def __init__(self):
+        self.bridges = []
+
+    def add(self, sense, gripper, **kwargs):
+        """
+        添加一组桥接
+
+        参数:
+            sense (Sense): 输入设备
+            gripper (Gripper): 输出设备
+            **kwargs: 传给TeleopBridge的其他参数，name默认为'teleop<序号>'
+
+        返回:
+            TeleopBridge: 新建的桥接
+        """
+        kwargs.setdefault('name', f"teleop{len(self.bridges)}")
+        bridge = TeleopBridge(sense, gripper, **kwargs)
+        self.bridges.append(bridge)
+        return bridge
+
+    def start(self):
+        """
+        启动全部桥接
+
+        返回:
+            bool: 是否全部启动成功
+        """
+        return all([bridge.start() for bridge in self.bridges])
+
+    def stop(self):
+        """
+        停止全部桥接
+        """
+        for bridge in self.bridges:
+            bridge.stop()
+
+    def get_stats(self):
+        """
+        获取全部桥接的统计信息
+
+        返回:
+            list: 每组桥接的统计信息，见TeleopBridge.get_stats()
+        """
+        return [bridge.get_stats() for bridge in self.bridges]
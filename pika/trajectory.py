@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+夹爪轨迹执行模块，在独立的调度线程中按固定命令频率发送插值后的位置设定值
+
+各设定值的截止时间以轨迹开始时刻为基准计算（start + k/rate），单次唤醒延误不会累积成漂移；
+落后超过一个命令周期时直接跳到当前应发送的设定值，被跳过的设定值计为错过的截止时间。
+调度线程同时读取Position遥测，与轨迹在该帧接收时刻的参考值比较，统计跟踪误差。
+"""
+
+import math
+import time
+import logging
+import threading
+import numpy as np
+from .metrics import RunningStats
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.trajectory")
+
+
+class TrajectoryUnit:
+    """
+    轨迹数值的单位
+    """
+    ANGLE = 'rad'       # 电机弧度
+    DISTANCE = 'mm'     # 夹爪开合距离，发送前按连杆参数换算为电机弧度
+
+
+class TrajectoryState:
+    """
+    轨迹执行状态
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    CANCELLED = 'cancelled'
+    PREEMPTED = 'preempted'     # 被新的轨迹取代
+
+
+class TrajectoryRun:
+    """
+    一次轨迹执行，由Gripper.follow_trajectory()创建
+
+    参数:
+        gripper (Gripper): 执行轨迹的夹爪
+        times (array_like): 轨迹点时间（秒），严格递增，以第一个点为起点
+        angles (array_like): 轨迹点电机弧度，长度与times相同
+        rate (float): 命令频率(Hz)
+        name (str): 调度线程名称
+    """
+    def __init__(self, gripper, times, angles, rate, name='trajectory'):
+        times = np.asarray(times, dtype=np.float64)
+        angles = np.asarray(angles, dtype=np.float64)
+        if times.ndim != 1 or times.shape != angles.shape or len(times) == 0:
+            raise ValueError("轨迹时间和数值必须是长度相同的非空一维数组")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("轨迹时间必须严格递增")
+        if rate <= 0:
+            raise ValueError("命令频率必须大于0")
+        self.gripper = gripper
+        self.rate = rate
+        self.name = name
+        self.times = times - times[0]
+        self.angles = angles
+        self.duration = float(self.times[-1])
+        # 按命令频率预先插值全部设定值，最后一个设定值固定为轨迹终点
+        ticks = np.arange(int(math.floor(self.duration * rate + 1e-9)) + 1) / rate
+        if ticks[-1] < self.duration:
+            ticks = np.append(ticks, self.duration)
+        self._tick_ns = (ticks * 1e9).astype(np.int64).tolist()
+        self._setpoints = np.interp(ticks, self.times, angles).tolist()
+        self.state = TrajectoryState.PENDING
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._cancel_state = TrajectoryState.CANCELLED
+        self._lock = threading.Lock()
+        self._thread = None
+        # 统计
+        self.sent = 0
+        self.failures = 0
+        self.missed_deadlines = 0           # 落后超过一个命令周期而被跳过的设定值数
+        self.lateness_ms = RunningStats()   # 实际发送时刻相对截止时间的延误
+        self.tracking_error = RunningStats()    # |Position - 参考弧度|
+        self.tracking_error_mm = RunningStats() # 换算为开合距离后的跟踪误差
+        self._squared_error = 0.0
+        self.start_ns = None
+        self.end_ns = None
+
+    @property
+    def points(self):
+        """
+        按命令频率插值后的设定值数量
+        """
+        return len(self._setpoints)
+
+    def start(self):
+        """
+        启动调度线程
+        """
+        self.state = TrajectoryState.RUNNING
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def cancel(self, wait=True, state=TrajectoryState.CANCELLED):
+        """
+        取消轨迹执行，夹爪保持最后一次发送的设定值
+
+        参数:
+            wait (bool): 是否等待调度线程退出，默认为True
+            state (str): 取消后的状态，默认为TrajectoryState.CANCELLED
+        """
+        self._cancel_state = state
+        self._cancel.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def wait(self, timeout=None):
+        """
+        等待轨迹执行结束（完成、取消或被取代）
+
+        参数:
+            timeout (float): 最长等待时间（秒），默认为None一直等待
+
+        返回:
+            bool: 轨迹是否已结束
+        """
+        return self._done.wait(timeout)
+
+    def is_running(self):
+        """
+        轨迹是否正在执行
+        """
+        return self.state == TrajectoryState.RUNNING
+
+    def reference_at(self, t):
+        """
+        获取轨迹在t时刻（秒，相对起点）的参考弧度
+        """
+        return float(np.interp(t, self.times, self.angles))
+
+    def _run(self):
+        """
+        调度线程函数：按截止时间发送设定值，落后时跳到当前应发送的设定值
+        """
+        tick_ns = self._tick_ns
+        setpoints = self._setpoints
+        period_ns = int(1e9 / self.rate)
+        kinematics = self.gripper.kinematics
+        last_seq = self.gripper.snapshot().seq
+        count = len(setpoints)
+        start = time.monotonic_ns()
+        self.start_ns = start
+        k = 0
+        try:
+            while k < count:
+                remaining = start + tick_ns[k] - time.monotonic_ns()
+                if remaining > 0 and self._cancel.wait(remaining / 1e9):
+                    break
+                if self._cancel.is_set():
+                    break
+                now = time.monotonic_ns()
+                # 落后超过一个命令周期时跳到当前应发送的设定值，不补发积压的设定值
+                if now - (start + tick_ns[k]) > period_ns:
+                    due = k
+                    while due + 1 < count and start + tick_ns[due + 1] <= now:
+                        due += 1
+                    with self._lock:
+                        self.missed_deadlines += due - k
+                    k = due
+                ok = self.gripper.set_motor_angle(setpoints[k])
+                sent_ns = time.monotonic_ns()
+                snapshot = self.gripper.snapshot()
+                with self._lock:
+                    if ok:
+                        self.sent += 1
+                    else:
+                        self.failures += 1
+                    self.lateness_ms.add((sent_ns - start - tick_ns[k]) / 1e6)
+                    # 以新到达的Position遥测计算跟踪误差
+                    if snapshot.seq != last_seq and snapshot.recv_ns is not None and snapshot.recv_ns >= start:
+                        last_seq = snapshot.seq
+                        reference = self.reference_at((snapshot.recv_ns - start) / 1e9)
+                        error = snapshot.Position - reference
+                        self.tracking_error.add(abs(error))
+                        self._squared_error += error * error
+                        self.tracking_error_mm.add(abs(kinematics.angle_to_distance(snapshot.Position) -
+                                                       kinematics.angle_to_distance(reference)))
+                k += 1
+        except Exception as e:
+            logger.error(f"轨迹执行异常: {e}")
+        finally:
+            self.end_ns = time.monotonic_ns()
+            self.state = self._cancel_state if self._cancel.is_set() else TrajectoryState.COMPLETED
+            self._done.set()
+
+    def get_stats(self):
+        """
+        获取轨迹执行统计信息
+
+        返回:
+            dict: 包含state, duration, rate, points, sent, failures, missed_deadlines,
+                  achieved_rate_hz（实际命令频率）, lateness_ms（发送延误统计）,
+                  tracking_error_rad（|Position - 参考弧度|统计）, tracking_rms_rad,
+                  tracking_error_mm（换算为开合距离的跟踪误差统计）字段
+        """
+        with self._lock:
+            elapsed = ((self.end_ns or time.monotonic_ns()) - self.start_ns) / 1e9 if self.start_ns else 0.0
+            # 第一个设定值在起点发送，频率按发送间隔数计算
+            achieved = (self.sent - 1) / elapsed if self.sent > 1 and elapsed > 0 else float('nan')
+            samples = self.tracking_error.count
+            return {
+                'state': self.state,
+                'duration': self.duration,
+                'rate': self.rate,
+                'points': self.points,
+                'sent': self.sent,
+                'failures': self.failures,
+                'missed_deadlines': self.missed_deadlines,
+                'achieved_rate_hz': achieved,
+                'lateness_ms': self.lateness_ms.as_dict(),
+                'tracking_error_rad': self.tracking_error.as_dict(),
+                'tracking_rms_rad': math.sqrt(self._squared_error / samples) if samples else float('nan'),
+                'tracking_error_mm': self.tracking_error_mm.as_dict()
+            }
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+USB转串口低延迟配置模块，仅在Linux上可用
+
+FTDI等USB转串口芯片默认以16ms的latency_timer批量上报数据，设备每帧数据最多会被延迟16ms
+才到达主机。本模块通过sysfs识别串口对应的USB适配器，读取或设置驱动的latency_timer，
+并通过TIOCGSERIAL/TIOCSSERIAL读取或设置ASYNC_LOW_LATENCY标志。写入sysfs通常需要root权限，
+也可以通过udev规则设置，例如：
+    ACTION=="add", SUBSYSTEM=="usb-serial", DRIVER=="ftdi_sio", ATTR{latency_timer}="1"
+"""
+
+import os
+import array
+import logging
+
+# 创建logger，但不配置全局日志系统
+logger = logging.getLogger("pika.usb_latency")
+
+# sysfs中tty设备所在目录
+SYSFS_TTY_ROOT = '/sys/class/tty'
+
+# linux/serial.h中的ASYNC_LOW_LATENCY标志
+ASYNC_LOW_LATENCY = 1 << 13
+# struct serial_struct按int数组读写，flags位于第5个字段
+_SERIAL_STRUCT_INTS = 32
+_SERIAL_FLAGS_INDEX = 4
+# 查找USB设备属性(idVendor/idProduct)时向上查找的最大层数
+_MAX_PARENT_DEPTH = 4
+
+
+def _read_attr(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def find_adapter(port, sysfs_root=None):
+    """
+    识别串口对应的USB转串口适配器
+
+    参数:
+        port (str): 串口设备路径，可以是udev固定链接
+        sysfs_root (str): sysfs中tty设备所在目录，默认为SYSFS_TTY_ROOT
+
+    返回:
+        dict: 包含tty, driver, vendor_id, product_id, latency_timer_path字段，
+              驱动不支持latency_timer时latency_timer_path为None；不是USB串口时返回None
+    """
+    if not port:
+        return None
+    tty = os.path.basename(os.path.realpath(port))
+    device_dir = os.path.join(sysfs_root or SYSFS_TTY_ROOT, tty, 'device')
+    if not os.path.exists(device_dir):
+        return None
+    device_dir = os.path.realpath(device_dir)
+    driver_link = os.path.join(device_dir, 'driver')
+    driver = os.path.basename(os.path.realpath(driver_link)) if os.path.exists(driver_link) else None
+
+    vendor_id = product_id = None
+    parent = device_dir
+    for _ in range(_MAX_PARENT_DEPTH):
+        vendor_id = _read_attr(os.path.join(parent, 'idVendor'))
+        if vendor_id is not None:
+            product_id = _read_attr(os.path.join(parent, 'idProduct'))
+            break
+        parent = os.path.dirname(parent)
+    if vendor_id is None and driver is None:
+        return None
+
+    latency_timer_path = os.path.join(device_dir, 'latency_timer')
+    return {
+        'tty': tty,
+        'driver': driver,
+        'vendor_id': vendor_id,
+        'product_id': product_id,
+        'latency_timer_path': latency_timer_path if os.path.exists(latency_timer_path) else None
+    }
+
+
+def read_latency_timer(port, sysfs_root=None):
+    """
+    读取USB转串口驱动的latency_timer
+
+    返回:
+        int: latency_timer(ms)，适配器不支持时返回None
+    """
+    adapter = find_adapter(port, sysfs_root)
+    if adapter is None or adapter['latency_timer_path'] is None:
+        return None
+    value = _read_attr(adapter['latency_timer_path'])
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def write_latency_timer(port, milliseconds, sysfs_root=None):
+    """
+    设置USB转串口驱动的latency_timer
+
+    参数:
+        port (str): 串口设备路径
+        milliseconds (int): latency_timer(ms)，取值1~255
+
+    返回:
+        bool: 是否设置成功，无权限或适配器不支持时返回False
+    """
+    if not 1 <= int(milliseconds) <= 255:
+        raise ValueError("latency_timer必须在1~255ms之间")
+    adapter = find_adapter(port, sysfs_root)
+    if adapter is None or adapter['latency_timer_path'] is None:
+        logger.debug(f"串口不支持latency_timer: {port}")
+        return False
+    try:
+        with open(adapter['latency_timer_path'], 'w') as f:
+            f.write(str(int(milliseconds)))
+        return True
+    except PermissionError:
+        logger.warning(f"没有权限设置latency_timer: {adapter['latency_timer_path']}，"
+                       f"请以root运行或添加udev规则")
+    except OSError as e:
+        logger.warning(f"设置latency_timer失败: {e}")
+    return False
+
+
+def _get_serial_struct(fd):
+    import fcntl
+    import termios
+    buf = array.array('i', [0] * _SERIAL_STRUCT_INTS)
+    fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+    return buf
+
+
+def get_low_latency_flag(fd):
+    """
+    读取串口的ASYNC_LOW_LATENCY标志
+
+    参数:
+        fd (int): 已打开串口的文件描述符
+
+    返回:
+        bool: 标志是否已设置，驱动或平台不支持时返回None
+    """
+    try:
+        return bool(_get_serial_struct(fd)[_SERIAL_FLAGS_INDEX] & ASYNC_LOW_LATENCY)
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+def set_low_latency_flag(fd, enabled=True):
+    """
+    设置或清除串口的ASYNC_LOW_LATENCY标志
+
+    参数:
+        fd (int): 已打开串口的文件描述符
+        enabled (bool): 是否设置，默认为True
+
+    返回:
+        bool: 是否设置成功
+    """
+    try:
+        import fcntl
+        import termios
+        buf = _get_serial_struct(fd)
+        if enabled:
+            buf[_SERIAL_FLAGS_INDEX] |= ASYNC_LOW_LATENCY
+        else:
+            buf[_SERIAL_FLAGS_INDEX] &= ~ASYNC_LOW_LATENCY
+        fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+        return True
+    except (ImportError, AttributeError, OSError) as e:
+        logger.debug(f"设置ASYNC_LOW_LATENCY失败: {e}")
+        return False
+
+
+def get_settings(port, fd=None, sysfs_root=None):
+    """
+    获取串口当前生效的低延迟相关设置
+
+    参数:
+        port (str): 串口设备路径
+        fd (int): 已打开串口的文件描述符，为None时不读取ASYNC_LOW_LATENCY标志
+        sysfs_root (str): sysfs中tty设备所在目录，默认为SYSFS_TTY_ROOT
+
+    返回:
+        dict: 包含adapter（见find_adapter，非USB串口时为None）、latency_timer_ms、
+              async_low_latency字段，不支持的项为None
+    """
+    adapter = find_adapter(port, sysfs_root)
+    latency_timer = None
+    if adapter is not None and adapter['latency_timer_path'] is not None:
+        latency_timer = read_latency_timer(port, sysfs_root)
+    return {
+        'adapter': adapter,
+        'latency_timer_ms': latency_timer,
+        'async_low_latency': get_low_latency_flag(fd) if fd is not None else None
+    }
+
+
+def configure_low_latency(port, fd=None, latency_timer_ms=1, sysfs_root=None):
+    """
+    在权限允许的范围内为串口启用低延迟设置，无法设置的项保持不变
+
+    参数:
+        port (str): 串口设备路径
+        fd (int): 已打开串口的文件描述符，为None时不设置ASYNC_LOW_LATENCY标志
+        latency_timer_ms (int): 目标latency_timer(ms)，为None时不修改，默认为1
+        sysfs_root (str): sysfs中tty设备所在目录，默认为SYSFS_TTY_ROOT
+
+    返回:
+        dict: 设置后生效的值，字段同get_settings
+    """
+    if latency_timer_ms is not None:
+        current = read_latency_timer(port, sysfs_root)
+        if current is not None and current != latency_timer_ms:
+            if write_latency_timer(port, latency_timer_ms, sysfs_root):
+                logger.info(f"已将{port}的latency_timer从{current}ms设置为{latency_timer_ms}ms")
+    if fd is not None and get_low_latency_flag(fd) is False:
+        set_low_latency_flag(fd, True)
+    return get_settings(port, fd, sysfs_root)
@@ -118,6 +118,775 @@ def test_camera_modules():
         print(f"✗ 测试失败: {e}")
         return False
 
+def test_frame_scanner():
+    """测试增量帧扫描器"""
+    print("\n测试增量帧扫描器...")
+    from pika.frame_scanner import JsonFrameScanner
+    
+    frame = b'{\r\n"AS5047":{\r\n"angle":12.5,\r\n"rad":0.2\r\n},\r\n"Version":"a\\"}{"\r\n}'
+    stream = b'noise}' + frame + b'\r\n' + frame
+    scanner = JsonFrameScanner()
+    frames = []
+    # 逐字节喂入，验证跨读取的状态保持
+    for i in range(len(stream)):
+        scanner.feed(stream[i:i + 1])
+        result = scanner.next_frame()
+        if result is not None:
+            frames.append(result)
+    assert frames == [frame, frame]
+    assert scanner.get_stats()['bytes_discarded'] == 8
+    print("✓ 增量帧扫描器切分正确")
+    return True
+
+def test_fast_decoder():
+    """测试Sense/Gripper快速解码器"""
+    print("\n测试快速解码器...")
+    from pika.serial_comm import SerialComm
+    from pika.telemetry import decode_gripper_frame, decode_sense_frame
+    
+    gripper_frame = (b'{\r\n"motor":{\r\n"Speed":0.5,\r\n"Current":-120,\r\n"Position":1.25\r\n}\r\n,\r\n'
+                     b'"motorstatus":{\r\n"Voltage":24.1,\r\n"DriverTemp":35,\r\n"MotorTemp":36,\r\n'
+                     b'"Status":"0x00",\r\n"BusCurrent":80\r\n}\r\n\r\n}')
+    sense_frame = (b'{\r\n"Command":1,\r\n"AS5047":{\r\n"angle":45.5,\r\n"rad":0.79\r\n},\r\n\r\n'
+                   b'"IMU":{\r\n"acc":[0.1,0.2,9.8],\r\n"gyr":[0.0,0.1,0.2],\r\n"pitch":1.5,\r\n'
+                   b'"roll":2.5,\r\n"yaw":3.5\r\n}\r\n\r\n}')
+    for frame, decoder in ((gripper_frame, decode_gripper_frame), (sense_frame, decode_sense_frame)):
+        comm = SerialComm(port=None)
+        assert decoder(frame) == comm._parse_frame(frame)
+    # 布局不匹配时退回通用JSON解析
+    comm = SerialComm(port=None, decoder=decode_gripper_frame)
+    assert comm._parse_frame(b'{"Version":"1.0"}') == {'Version': '1.0'}
+    assert comm.get_stats()['parser'] == {'fast': 0, 'json': 1}
+    print("✓ 快速解码结果与通用JSON解析一致")
+    return True
+
+def test_emulator():
+    """测试Gripper通过伪终端连接虚拟设备"""
+    print("\n测试虚拟设备...")
+    import time
+    from pika.gripper import Gripper
+    from pika.emulator import GripperEmulator
+    
+    with GripperEmulator(rate=500) as emulator:
+        gripper = Gripper(emulator.port)
+        assert gripper.connect()
+        assert gripper.enable() and gripper.set_motor_angle(0.5)
+        deadline = time.monotonic() + 2.0
+        while gripper.get_motor_position() != 0.5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        gripper.disconnect()
+        assert gripper.get_motor_position() == 0.5
+        assert emulator.last_commands[:2] == [(11, 0.0), (22, 0.5)]
+    # 只写出一部分的帧计为损坏，完全未写出的帧计为丢弃，发送时间取写入之前
+    emulator = GripperEmulator()
+    for written in (lambda data: len(data) // 2, lambda data: 0, len):
+        emulator._write_raw = written
+        before = time.monotonic_ns()
+        emulator._write_frame(b'{"n":1}')
+    stats = emulator.get_stats()
+    assert (stats['frames_sent'], stats['frames_corrupted'], stats['frames_dropped']) == (3, 1, 1)
+    assert emulator.get_send_ns(0) is None and emulator.get_send_ns(1) is None
+    assert before <= emulator.get_send_ns(2) <= time.monotonic_ns()
+    print("✓ 虚拟设备收发正常")
+    return True
+
+def test_subscription():
+    """测试多订阅者分发和溢出策略"""
+    print("\n测试数据帧订阅...")
+    from pika.serial_comm import SerialComm
+    from pika.subscription import OverflowPolicy
+    
+    comm = SerialComm(port=None)
+    oldest = comm.subscribe(maxsize=2)
+    newest = comm.subscribe(maxsize=2, policy=OverflowPolicy.DROP_NEWEST)
+    block = comm.subscribe(maxsize=2, policy=OverflowPolicy.BLOCK, block_timeout=0.001)
+    comm._process_data(b'{"n":1}{"n":2}{"n":3}')
+    assert [f['n'] for f in oldest.get_all()] == [2, 3]
+    assert [f['n'] for f in newest.get_all()] == [1, 2]
+    assert [f['n'] for f in block.get_all()] == [1, 2]
+    assert oldest.dropped == newest.dropped == block.dropped == 1
+    comm.unsubscribe(oldest)
+    assert oldest.get(timeout=0) is None and len(comm.subscriptions) == 2
+    print("✓ 订阅队列按策略丢弃数据帧")
+    return True
+
+def test_dispatcher():
+    """测试在读取线程之外执行回调"""
+    print("\n测试回调分发...")
+    import threading
+    from pika.serial_comm import SerialComm
+    
+    comm = SerialComm(port=None)
+    threads = []
+    done = threading.Event()
+    comm.start_dispatcher(max_pending=4)
+    comm.add_callback(lambda frame: (threads.append(threading.get_ident()), done.set()))
+    comm._process_data(b'{"n":1}')
+    assert done.wait(1.0)
+    assert threads == [comm.dispatcher._thread.ident] != [threading.get_ident()]
+    comm.stop_dispatcher()
+    stats = comm.get_stats()['dispatcher']
+    assert stats['completed'] == 1 and stats['callbacks'][0]['calls'] == 1
+
+    # 逐帧模式停止后提交的帧被丢弃，不会提交到已关闭的线程池
+    from pika.dispatcher import CallbackDispatcher, DispatchMode
+    dispatcher = CallbackDispatcher(mode=DispatchMode.PER_FRAME)
+    dispatcher.add_callback(lambda frame: None)
+    dispatcher.start()
+    dispatcher.stop()
+    dispatcher.dispatch({'n': 2})
+    assert dispatcher.dispatched == 0 and dispatcher._executor is None
+    print("✓ 回调在分发线程中执行")
+    return True
+
+def test_snapshot():
+    """测试遥测快照"""
+    print("\n测试遥测快照...")
+    from pika.serial_comm import SerialComm
+    from pika.gripper import Gripper
+    
+    gripper = Gripper(serial_comm=SerialComm(port=None), history_capacity=0)
+    gripper.serial_comm.callback = gripper._data_callback
+    before = gripper.snapshot()
+    gripper.serial_comm._process_data(
+        b'{"motor":{"Speed":1.5,"Current":-200,"Position":0.25},'
+        b'"motorstatus":{"Voltage":24.0,"DriverTemp":30,"MotorTemp":31,"Status":"0x01","BusCurrent":90}}')
+    snapshot = gripper.snapshot()
+    assert before.seq is None and snapshot.seq == 0
+    assert (snapshot.Position, snapshot.Status, snapshot.BusCurrent) == (0.25, "0x01", 90)
+    assert gripper.motor_data == {'Speed': 1.5, 'Current': -200, 'Position': 0.25}
+    # 只含电机数据的帧沿用上一帧的电机状态
+    gripper.serial_comm._process_data(b'{"motor":{"Speed":0.0,"Current":0,"Position":0.5}}')
+    assert gripper.snapshot()[:3] == (1, gripper.snapshot().recv_ns, 0.0)
+    assert gripper.snapshot().Voltage == 24.0 and snapshot.Position == 0.25
+    print("✓ 快照字段来自同一帧且不可变")
+    return True
+
+def test_shared_history():
+    """测试共享内存遥测历史"""
+    print("\n测试共享内存遥测历史...")
+    from pika.process_reader import SharedTelemetryHistory
+    from pika.history import GRIPPER_HISTORY_DTYPE
+    from pika.gripper import Gripper
+    from pika.snapshot import GRIPPER_SNAPSHOT_DEFAULT
+    
+    size = SharedTelemetryHistory.buffer_size(GRIPPER_HISTORY_DTYPE, 8)
+    buffer = bytearray(size)
+    writer = SharedTelemetryHistory(GRIPPER_HISTORY_DTYPE, 8, buffer)
+    reader = SharedTelemetryHistory(GRIPPER_HISTORY_DTYPE, 8, buffer)
+    assert reader.get_latest() is None
+    for seq in range(20):
+        writer.append(Gripper._history_record(GRIPPER_SNAPSHOT_DEFAULT._replace(seq=seq, recv_ns=seq)))
+    # 缓冲区已满时最旧的一条可能正在被覆盖，读取时丢弃
+    assert reader.get_history()['seq'].tolist() == list(range(13, 20))
+    assert reader.get_since(17)['seq'].tolist() == [18, 19]
+    snapshot = Gripper._snapshot_from_record(reader.get_latest())
+    assert snapshot == GRIPPER_SNAPSHOT_DEFAULT._replace(seq=19, recv_ns=19)
+    # 整数字段类型与读取线程模式一致
+    assert all(type(getattr(snapshot, name)) is int for name in ('Current', 'DriverTemp', 'MotorTemp', 'BusCurrent'))
+    # 尚未连接的子进程读取模式没有统计信息
+    from pika.process_reader import ProcessSerialComm
+    assert Gripper(serial_comm=ProcessSerialComm('/dev/ttyUSB0')).get_timing_stats() is None
+    print("✓ 共享内存历史读取正确")
+    return True
+
+def test_usb_latency():
+    """测试USB转串口低延迟设置"""
+    print("\n测试USB转串口低延迟设置...")
+    import os
+    import tempfile
+    from pika import usb_latency
+    
+    with tempfile.TemporaryDirectory() as root:
+        # 模拟sysfs: usb设备/接口/ttyUSB0，tty目录中的device链接指向ttyUSB0
+        usb_dir = os.path.join(root, 'devices', '1-1')
+        port_dir = os.path.join(usb_dir, '1-1:1.0', 'ttyUSB0')
+        os.makedirs(port_dir)
+        os.makedirs(os.path.join(root, 'drivers', 'ftdi_sio'))
+        os.symlink(os.path.join(root, 'drivers', 'ftdi_sio'), os.path.join(port_dir, 'driver'))
+        for name, value in (('idVendor', '0403'), ('idProduct', '6001')):
+            with open(os.path.join(usb_dir, name), 'w') as f:
+                f.write(value + '\n')
+        with open(os.path.join(port_dir, 'latency_timer'), 'w') as f:
+            f.write('16\n')
+        tty_root = os.path.join(root, 'class', 'tty')
+        os.makedirs(os.path.join(tty_root, 'ttyUSB0'))
+        os.symlink(port_dir, os.path.join(tty_root, 'ttyUSB0', 'device'))
+        
+        adapter = usb_latency.find_adapter('/dev/ttyUSB0', tty_root)
+        assert (adapter['driver'], adapter['vendor_id'], adapter['product_id']) == ('ftdi_sio', '0403', '6001')
+        assert usb_latency.read_latency_timer('/dev/ttyUSB0', tty_root) == 16
+        settings = usb_latency.configure_low_latency('/dev/ttyUSB0', latency_timer_ms=1, sysfs_root=tty_root)
+        assert settings['latency_timer_ms'] == 1 and settings['async_low_latency'] is None
+        assert usb_latency.find_adapter('/dev/ttyS99', tty_root) is None
+    # 超出范围的latency_timer被拒绝，不抛出异常也不修改当前设置
+    from pika.serial_comm import SerialComm
+    comm = SerialComm(port=None)
+    timer = comm.latency_timer_ms
+    assert comm.set_low_latency(latency_timer_ms=0) is False
+    assert comm.set_low_latency(latency_timer_ms=256) is False
+    assert comm.latency_timer_ms == timer
+    print("✓ 适配器识别和latency_timer读写正确")
+    return True
+
+def test_binary_protocol():
+    """测试二进制遥测协议"""
+    print("\n测试二进制遥测协议...")
+    from pika.serial_comm import SerialComm, Protocol
+    from pika.binary_protocol import encode_gripper_frame
+    
+    frame = encode_gripper_frame(0.5, -120, 1.25, 24.0, 35, 36, 0x01, 80)
+    corrupted = bytearray(frame)
+    corrupted[10] ^= 0xFF
+    comm = SerialComm(port=None)
+    received = []
+    comm.callback = received.append
+    # 噪声和CRC错误的帧被跳过，逐字节到达时同样能切分
+    for byte in b'\x00\xA5noise' + bytes(corrupted) + frame:
+        comm._process_data(bytes([byte]))
+    assert len(received) == 1 and comm.active_protocol == Protocol.BINARY
+    assert received[0]['motor'] == {'Speed': 0.5, 'Current': -120, 'Position': 1.25}
+    assert received[0]['motorstatus']['Status'] == "0x01"
+    assert comm.get_stats()['scanner']['crc_errors'] == 1
+    # 自动检测对JSON数据流保持原有行为
+    comm = SerialComm(port=None)
+    comm._process_data(b'{"Version":"1.0"}')
+    assert comm.active_protocol == Protocol.JSON and comm.get_latest_data()['Version'] == "1.0"
+    # 二进制负载中出现的'{"'在JSON帧完整解析之前不会被判定为JSON
+    from pika.binary_protocol import encode_info_frame
+    comm = SerialComm(port=None)
+    for byte in encode_info_frame('{"v":1'):
+        comm._process_data(bytes([byte]))
+    assert comm.active_protocol == Protocol.BINARY and comm.get_latest_data()['Version'] == '{"v":1'
+    comm = SerialComm(port=None)
+    comm._process_data(b'{"Version":')
+    assert comm.active_protocol is None
+    comm._process_data(b'"1.0"}')
+    assert comm.active_protocol == Protocol.JSON and comm.get_latest_data()['Version'] == "1.0"
+    print("✓ 二进制帧校验、切分和协议检测正确")
+    return True
+
+def test_resync():
+    """测试损坏数据流的重新同步"""
+    print("\n测试损坏数据流的重新同步...")
+    from pika.serial_comm import SerialComm
+    from pika.emulator import GripperEmulator
+    from pika.telemetry import decode_gripper_frame, GRIPPER_FRAME_KEYS
+    
+    emulator = GripperEmulator(embed_counter=True, corruption_rate=0.2, seed=7)
+    stream, corrupted = emulator.generate(300)
+    comm = SerialComm(port=None, decoder=decode_gripper_frame)
+    comm.set_frame_keys(GRIPPER_FRAME_KEYS)
+    received = set()
+    comm.callback = lambda frame: received.add(frame.get('motorstatus', {}).get('BusCurrent'))
+    for offset in range(0, len(stream), 97):
+        comm._process_data(stream[offset:offset + 97])
+    # 所有未损坏的帧都被恢复
+    assert set(range(300)) - corrupted <= received
+    # 大量噪声括号之后的正常帧仍能被切分
+    frame, _ = GripperEmulator(embed_counter=True).generate(1)
+    comm._process_data(b'{"a":' * 2000 + b'\r\n' + frame)
+    assert comm.get_latest_data()['motorstatus']['BusCurrent'] == 0
+    assert comm.get_corruption_stats()['starts_rejected'] > 0
+    print("✓ 损坏帧被丢弃，完好帧全部恢复")
+    return True
+
+def test_kinematics():
+    """测试夹爪开合距离换算"""
+    print("\n测试夹爪开合距离换算...")
+    import math
+    import numpy as np
+    from pika.kinematics import get_kinematics, GRIPPER_LINKAGE
+    
+    def legacy_get_distance(angle):
+        angle = (180.0 - 43.99) / 180.0 * math.pi - angle
+        height = 0.0325 * math.sin(angle)
+        width = math.sqrt(0.058**2 - (height - 0.01456)**2) + 0.0325 * math.cos(angle)
+        return width * 1000
+    
+    kinematics = get_kinematics(GRIPPER_LINKAGE)
+    angles = np.linspace(-0.1, kinematics.max_angle + 0.1, 1001)
+    expected = np.array([(legacy_get_distance(a) - legacy_get_distance(0)) * 2 for a in angles])
+    # 查找表插值（超出范围时按公式计算）与向量化换算均与原公式一致
+    table = np.array([kinematics.angle_to_distance(a) for a in angles])
+    assert np.max(np.abs(table - expected)) < 1e-3
+    assert np.allclose(kinematics.angles_to_distances(angles), expected, atol=1e-9)
+    assert kinematics.angle_to_distance(0.0) == 0.0
+    # 逆换算：常数时间查表与原二分查找（开合距离容差0.01mm）得到同一上升段的解
+    targets = np.linspace(kinematics.min_distance, kinematics.max_distance, 501)
+    angles = np.array([kinematics.distance_to_angle(d) for d in targets])
+    assert np.max(np.abs(kinematics.angles_to_distances(angles) - targets)) < 1e-3
+    assert np.allclose(kinematics.distances_to_angles(targets), angles, atol=1e-9)
+    assert np.allclose(angles, kinematics._bisect_angles(targets), atol=1e-4)
+    try:
+        kinematics.distance_to_angle(kinematics.max_distance + 1.0)
+        assert False, "超出范围的开合距离应抛出ValueError"
+    except ValueError:
+        pass
+    print("✓ 查找表插值和向量化换算与连杆公式一致")
+    return True
+
+def test_teleop():
+    """测试Sense→Gripper遥操作桥接"""
+    print("\n测试遥操作桥接...")
+    import time
+    from pika.sense import Sense
+    from pika.gripper import Gripper
+    from pika.teleop import TeleopBridge
+    from pika.emulator import SenseEmulator, GripperEmulator
+    
+    with SenseEmulator(rate=200) as sense_emulator, GripperEmulator(rate=200) as gripper_emulator:
+        sense_emulator.set_encoder(0.8)
+        sense, gripper = Sense(sense_emulator.port), Gripper(gripper_emulator.port)
+        assert sense.connect() and gripper.connect() and gripper.enable()
+        bridge = TeleopBridge(sense, gripper, scale=0.5, deadband=0.01)
+        assert bridge.start()
+        deadline = time.monotonic() + 2.0
+        while gripper.get_motor_position() != 0.4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        bridge.stop()
+        stats = bridge.get_stats()
+        sense.disconnect()
+        gripper.disconnect()
+    assert gripper.get_motor_position() == 0.4
+    # 编码器静止时只发送一次设定值
+    assert stats['commands'] == 1 and stats['suppressed'] > 0
+    assert stats['latency_ms']['count'] == 1
+    print("✓ 编码器帧到达即发送设定值，死区内不重复发送")
+    return True
+
+def test_trajectory():
+    """测试夹爪轨迹执行"""
+    print("\n测试夹爪轨迹执行...")
+    import time
+    from pika.gripper import Gripper
+    from pika.trajectory import TrajectoryUnit, TrajectoryState
+    from pika.emulator import GripperEmulator
+    
+    with GripperEmulator(rate=200) as emulator:
+        gripper = Gripper(emulator.port)
+        assert gripper.connect() and gripper.enable()
+        run = gripper.follow_trajectory([0.0, 0.5], [10.0, 30.0], unit=TrajectoryUnit.DISTANCE, rate=100)
+        assert run.points == 51 and run.wait(3.0)
+        stats = run.get_stats()
+        assert stats['state'] == TrajectoryState.COMPLETED
+        assert stats['sent'] + stats['missed_deadlines'] == 51 and stats['failures'] == 0
+        assert stats['tracking_error_rad']['count'] > 0
+        # 最后一个设定值为轨迹终点
+        time.sleep(0.2)
+        assert abs(gripper.kinematics.angle_to_distance(gripper.get_motor_position()) - 30.0) < 0.05
+        # 新轨迹取代正在执行的轨迹，preempt=False时不执行新轨迹
+        first = gripper.follow_trajectory([0.0, 5.0], [0.0, 1.0])
+        assert gripper.follow_trajectory([0.0, 1.0], [0.0, 1.0], preempt=False) is None
+        second = gripper.follow_trajectory([0.0, 5.0], [1.0, 0.0])
+        assert first.state == TrajectoryState.PREEMPTED and second.is_running()
+        assert gripper.cancel_trajectory() and second.state == TrajectoryState.CANCELLED
+        gripper.disconnect()
+    print(f"✓ 轨迹按截止时间执行，实际频率 {stats['achieved_rate_hz']:.1f} Hz，支持取消和取代")
+    return True
+
+def test_replay_polling():
+    """测试轮询读取模式下回放录制文件"""
+    print("\n测试轮询模式回放...")
+    import os
+    import tempfile
+    from pika.serial_comm import ReadMode
+    from pika.capture import CaptureWriter, ReplaySerialComm
+    from pika.gripper import Gripper
+    from pika.emulator import GripperEmulator
+    
+    stream, _ = GripperEmulator(embed_counter=True).generate(20)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'gripper.cap')
+        writer = CaptureWriter(path)
+        for offset in range(0, len(stream), 200):
+            writer.write(offset * 1000, stream[offset:offset + 200])
+        writer.close()
+        # 轮询模式经由可覆盖的read_data()读取，回放不需要真实串口
+        replay = ReplaySerialComm(path, speed=0, read_mode=ReadMode.POLLING)
+        gripper = Gripper(serial_comm=replay)
+        assert gripper.connect() and replay.wait_finished(2.0)
+        time.sleep(0.05)
+        gripper.disconnect()
+    assert gripper.frame_seq == 19 and gripper.snapshot().BusCurrent == 19
+    print("✓ 轮询模式回放交付全部数据帧")
+    return True
+
+def test_process_reader():
+    """测试子进程读取模式下的回调和订阅"""
+    print("\n测试子进程读取模式...")
+    import threading
+    from pika.sense import Sense
+    from pika.serial_comm import SerialComm
+    from pika.process_reader import ProcessSerialComm, DeviceType
+    from pika.emulator import SenseEmulator
+    
+    assert ProcessSerialComm('/dev/ttyUSB0', device_type=DeviceType.SENSE).get_latest_data() == {}
+    with SenseEmulator(rate=200) as emulator:
+        emulator.set_encoder(0.8)
+        sense = Sense(serial_comm=ProcessSerialComm(emulator.port, device_type=DeviceType.SENSE))
+        assert sense.connect()
+        subscription = sense.subscribe()
+        received = threading.Event()
+        handle = sense.add_callback(lambda frame: received.set())
+        frame = subscription.get(timeout=2.0)
+        assert received.wait(2.0)
+        # get_latest_data返回与读取线程模式相同格式的数据帧
+        latest = sense.serial_comm.get_latest_data()
+        comm = SerialComm(port=None)
+        comm._process_data(emulator.generate(1)[0])
+        expected = comm.get_latest_data()
+        assert latest.keys() == expected.keys() and latest['seq'] >= frame['seq']
+        assert {k: v for k, v in latest.items() if k not in ('seq', 'recv_ns')} == \
+            {k: v for k, v in expected.items() if k not in ('seq', 'recv_ns')}
+        sense.remove_callback(handle)
+        sense.unsubscribe(subscription)
+        sense.disconnect()
+    # 由共享内存历史重建的数据帧与固件帧字段一致
+    assert frame['AS5047']['rad'] == 0.8 and len(frame['IMU']['acc']) == 3
+    assert frame['seq'] >= 0 and frame['recv_ns'] > 0
+    print("✓ 子进程读取模式下回调和订阅正常")
+    return True
+
+def test_timing_stats():
+    """测试帧序号间断统计"""
+    print("\n测试帧序号间断统计...")
+    from pika.serial_comm import SerialComm, DeliveryMode
+    from pika.metrics import FrameTimingStats
+    
+    # 合并交付的帧不计为丢帧
+    comm = SerialComm(port=None, delivery_mode=DeliveryMode.LATEST_ONLY)
+    comm._process_data(b'{"n":1}')
+    comm._process_data(b'{"n":2}{"n":3}{"n":4}')
+    timing = comm.get_stats()['timing']
+    assert (timing['frames'], timing['gaps'], timing['frames_missing'], timing['frames_collapsed']) == (2, 0, 0, 2)
+    # 真实的序号间断仍被统计
+    stats = FrameTimingStats()
+    for seq in (0, 1, 4, 5):
+        stats.add(seq, seq * 1000000)
+    assert (stats.gaps, stats.frames_missing) == (1, 2)
+    print("✓ 合并交付与丢帧区分统计")
+    return True
+
+def test_command_writer():
+    """测试命令写线程的设定值合并和保序"""
+    print("\n测试命令写线程...")
+    import threading
+    from pika.command_writer import CommandWriter
+    from pika.gripper import CommandType
+    
+    written = []
+    gate = threading.Event()
+    
+    def write(data):
+        # 第一条命令写出前阻塞，使后续命令在队列中等待
+        gate.wait(2.0)
+        written.append(data)
+        return True
+    
+    writer = CommandWriter(write)
+    writer.start()
+    position = CommandType.POSITION_CTRL
+    writer.submit(b'first', position)
+    while writer.get_stats()['queue_depth']:
+        time.sleep(0.001)
+    # 队尾尚未发送的同类设定值被替换，使能/置零等命令不参与合并且不被越过
+    for data, key in ((b'p1', position), (b'p2', position), (b'enable', None), (b'p3', position),
+                      (b'p4', position), (b'zero', None), (b'disable', None), (b'p5', position)):
+        writer.submit(data, key)
+    gate.set()
+    writer.stop()
+    assert written == [b'first', b'p2', b'enable', b'p4', b'zero', b'disable', b'p5']
+    stats = writer.get_stats()
+    assert (stats['submitted'], stats['coalesced'], stats['written']) == (9, 2, 7)
+    print("✓ 设定值在队尾合并，其余命令严格保序")
+    return True
+
+def test_auto_reconnect():
+    """测试串口链路断开后自动重连"""
+    print("\n测试自动重连...")
+    import os
+    import tempfile
+    from pika.serial_comm import ConnectionEvent
+    from pika.gripper import Gripper
+    from pika.emulator import GripperEmulator
+    
+    with tempfile.TemporaryDirectory() as root:
+        with GripperEmulator(rate=200, link=os.path.join(root, 'pika_gripper')) as emulator:
+            gripper = Gripper(emulator.port, auto_reconnect=True)
+            events = []
+            gripper.add_connection_listener(lambda event, info: events.append(event))
+            assert gripper.connect()
+            emulator.unplug()
+            deadline = time.monotonic() + 2.0
+            while gripper.is_link_up() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not gripper.is_link_up()
+            seq = gripper.frame_seq
+            emulator.replug()
+            deadline = time.monotonic() + 3.0
+            while ConnectionEvent.RESUMED not in events and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            gripper.disconnect()
+    assert events == [ConnectionEvent.LOST, ConnectionEvent.RECONNECTED, ConnectionEvent.RESUMED]
+    assert gripper.frame_seq > seq
+    print("✓ 设备重新插入后自动重连并恢复数据")
+    return True
+
+def test_aio():
+    """测试asyncio异步接口"""
+    print("\n测试asyncio异步接口...")
+    import os
+    import asyncio
+    import tempfile
+    from pika.aio import AsyncGripper, AsyncSense
+    from pika.serial_comm import ConnectionEvent
+    from pika.emulator import GripperEmulator, SenseEmulator
+    
+    async def run(gripper_emulator, sense_emulator):
+        # 串口没有可监听的文件描述符时连接失败，不抛出异常
+        broken = AsyncGripper(gripper_emulator.port)
+        broken.serial_comm._get_fileno = lambda: None
+        assert not await broken.connect(timeout=0) and not broken.serial_comm.is_connected
+        gripper = AsyncGripper(gripper_emulator.port, auto_reconnect=True)
+        sense = AsyncSense(sense_emulator.port)
+        events = []
+        gripper.add_connection_listener(lambda event, info: events.append(event))
+        assert await gripper.connect() and await sense.connect()
+        assert await gripper.enable() and await gripper.set_motor_angle(0.5)
+        
+        async def reach_position():
+            async for frame in gripper.stream():
+                if frame['motor']['Position'] == 0.5:
+                    return frame
+        await asyncio.wait_for(reach_position(), 2.0)
+        frame = await sense.wait_for_update(1.0)
+        assert frame['AS5047']['rad'] == 0.8
+        # 读取出错时通知LOST事件，并在事件循环中自动重连
+        gripper_emulator.unplug()
+        gripper_emulator.replug()
+        for _ in range(300):
+            if ConnectionEvent.RESUMED in events:
+                break
+            await asyncio.sleep(0.01)
+        frame = await gripper.wait_for_update(1.0)
+        gripper.disconnect()
+        sense.disconnect()
+        return events, frame
+    
+    with tempfile.TemporaryDirectory() as root:
+        with GripperEmulator(rate=200, link=os.path.join(root, 'pika_gripper')) as gripper_emulator, \
+                SenseEmulator(rate=200) as sense_emulator:
+            sense_emulator.set_encoder(0.8)
+            events, frame = asyncio.run(run(gripper_emulator, sense_emulator))
+    assert events == [ConnectionEvent.LOST, ConnectionEvent.RECONNECTED, ConnectionEvent.RESUMED]
+    assert frame['motor']['Position'] == 0.5
+    print("✓ 异步读写正常，链路断开后自动重连")
+    return True
+
+def test_sense_commands():
+    """测试Sense批量发送命令"""
+    print("\n测试Sense批量命令...")
+    from pika.sense import Sense, CommandType
+    from pika.emulator import SenseEmulator
+    
+    with SenseEmulator(rate=200) as emulator:
+        sense = Sense(emulator.port)
+        commands = [(CommandType.LIGHT_CTRL, 1), (CommandType.VIBRATE_CTRL, 3)]
+        # 未连接时不写入串口
+        assert not sense.send_commands(commands)
+        assert sense.connect()
+        assert sense.send_commands(commands)
+        deadline = time.monotonic() + 2.0
+        while (emulator.light, emulator.vibrate) != (1, 3) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sense.disconnect()
+    assert (emulator.light, emulator.vibrate) == (1, 3)
+    assert emulator.commands_invalid == 0
+    print("✓ 多条命令按大端序打包后一次写入")
+    return True
+
+def test_record_replay():
+    """测试录制虚拟设备的数据流并在两种读取模式下回放"""
+    print("\n测试录制与回放...")
+    import os
+    import tempfile
+    from pika.serial_comm import ReadMode
+    from pika.capture import ReplaySerialComm
+    from pika.gripper import Gripper
+    from pika.emulator import GripperEmulator
+    
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'gripper.cap')
+        with GripperEmulator(rate=500, embed_counter=True) as emulator:
+            gripper = Gripper(emulator.port)
+            assert gripper.connect()
+            assert gripper.serial_comm.start_recording(path)
+            seq = gripper.frame_seq
+            deadline = time.monotonic() + 2.0
+            while gripper.frame_seq < seq + 50 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            gripper.serial_comm.stop_recording()
+            live = set(gripper.get_history()['BusCurrent'].astype(int).tolist())
+            gripper.disconnect()
+        
+        replayed = {}
+        for mode in (ReadMode.EVENT, ReadMode.POLLING):
+            replay = ReplaySerialComm(path, speed=0, read_mode=mode)
+            gripper = Gripper(serial_comm=replay)
+            assert gripper.connect() and replay.wait_finished(2.0)
+            time.sleep(0.05)
+            gripper.disconnect()
+            replayed[mode] = gripper.get_history()['BusCurrent'].astype(int).tolist()
+    # 两种模式交付相同的连续帧，且都是录制期间实际收到的帧
+    counters = replayed[ReadMode.EVENT]
+    assert counters == replayed[ReadMode.POLLING]
+    assert len(counters) >= 49 and counters == list(range(counters[0], counters[0] + len(counters)))
+    assert set(counters) <= live
+    print("✓ 录制文件在事件和轮询模式下回放结果一致")
+    return True
+
+def test_reactor():
+    """测试多个串口共用一个反应器线程"""
+    print("\n测试串口反应器...")
+    import os
+    import tempfile
+    import threading
+    from pika.reactor import SerialReactor
+    from pika.gripper import Gripper
+    from pika.emulator import GripperEmulator
+    
+    def wait_frames(grippers, count=10, timeout=2.0):
+        # 等待每个夹爪都收到count个新帧
+        start = [g.frame_seq for g in grippers]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(g.frame_seq >= s + count for g, s in zip(grippers, start)):
+                return True
+            time.sleep(0.01)
+        return False
+    
+    reactor = SerialReactor()
+    with tempfile.TemporaryDirectory() as root:
+        with GripperEmulator(rate=200) as first, GripperEmulator(rate=200) as second, \
+                GripperEmulator(rate=200, link=os.path.join(root, 'pika_gripper')) as third:
+            threads = threading.active_count()
+            grippers = [Gripper(first.port, reactor=reactor), Gripper(second.port, reactor=reactor),
+                        Gripper(third.port, reactor=reactor, auto_reconnect=True)]
+            for gripper in grippers:
+                assert gripper.connect()
+            # 三个串口由同一个反应器线程读取，不创建各自的读取线程
+            assert reactor.is_running() and threading.active_count() == threads + 1
+            assert all(g.serial_comm.reading_thread is None for g in grippers)
+            assert wait_frames(grippers) and reactor.get_stats()['ports'] == 3
+            
+            # 注销一个串口后反应器继续服务其余串口
+            grippers[0].disconnect()
+            seq = grippers[0].frame_seq
+            assert reactor.get_stats()['ports'] == 2
+            assert wait_frames(grippers[1:]) and grippers[0].frame_seq == seq
+            
+            # 拔出设备后反应器等待重连，其余串口不受影响
+            third.unplug()
+            deadline = time.monotonic() + 2.0
+            while grippers[2].is_link_up() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not grippers[2].is_link_up()
+            stats = reactor.get_stats()
+            assert (stats['ports'], stats['reconnecting']) == (1, 1)
+            assert wait_frames(grippers[1:2]) and reactor.is_running()
+            third.replug()
+            assert wait_frames(grippers[1:], timeout=3.0)
+            stats = reactor.get_stats()
+            assert (stats['ports'], stats['reconnecting']) == (2, 0)
+            assert stats['reads'] > 0 and stats['bytes_read'] > 0
+            for gripper in grippers[1:]:
+                gripper.disconnect()
+    assert reactor.get_stats()['ports'] == 0
+    # 没有文件描述符的串口无法注册
+    from pika.serial_comm import SerialComm
+    try:
+        reactor.register(SerialComm(port=None))
+        assert False, "未打开的串口不应注册成功"
+    except OSError:
+        pass
+    reactor.close()
+    print("✓ 反应器在单个线程中服务多个串口，注销和断开不影响其余串口")
+    return True
+
+def test_history():
+    """测试遥测历史环形缓冲区"""
+    print("\n测试遥测历史...")
+    from pika.history import TelemetryHistory, GRIPPER_HISTORY_DTYPE
+    from pika.gripper import Gripper
+    from pika.snapshot import GRIPPER_SNAPSHOT_DEFAULT
+    
+    history = TelemetryHistory(GRIPPER_HISTORY_DTYPE, capacity=8)
+    assert len(history.get_history()) == 0 and history.get_history().dtype == GRIPPER_HISTORY_DTYPE
+    # 第seq帧在(12 - seq)秒前到达
+    base = time.monotonic_ns() - 12 * 10**9
+    
+    def append(seqs):
+        for seq in seqs:
+            history.append(Gripper._history_record(GRIPPER_SNAPSHOT_DEFAULT._replace(
+                seq=seq, recv_ns=base + seq * 10**9, Position=seq * 0.5)))
+    
+    append(range(5))
+    assert history.get_history()['seq'].tolist() == [0, 1, 2, 3, 4]
+    assert history.get_history(seconds=10.5)['seq'].tolist() == [2, 3, 4]
+    assert history.get_since(2)['Position'].tolist() == [1.5, 2.0]
+    assert len(history.get_since(4)) == 0
+    
+    # 写满后覆盖最旧的记录，跨越缓冲区末尾的查询结果仍按时间顺序排列
+    append(range(5, 13))
+    assert len(history) == 8
+    assert history.get_history()['seq'].tolist() == list(range(5, 13))
+    assert history.get_since(6)['seq'].tolist() == list(range(7, 13))
+    assert history.get_since(9)['Position'].tolist() == [5.0, 5.5, 6.0]
+    window = history.get_history(seconds=3.5)
+    assert window['seq'].tolist() == [9, 10, 11, 12] and (window['recv_ns'] == base + window['seq'] * 10**9).all()
+    # 查询结果是拷贝，修改后不影响缓冲区
+    window['Position'] = 0.0
+    assert history.get_since(8)['Position'][0] == 4.5
+    history.clear()
+    assert len(history) == 0 and len(history.get_since(-1)) == 0
+    print("✓ 时间窗口、增量读取和环形覆盖正确")
+    return True
+
+def test_latest_only():
+    """测试LATEST_ONLY交付模式合并突发帧"""
+    print("\n测试LATEST_ONLY交付模式...")
+    from pika.serial_comm import SerialComm, DeliveryMode
+    
+    burst = b'{"a":1,"n":1}{"n":2}{"b":3,"n":3}'
+    comm = SerialComm(port=None, delivery_mode=DeliveryMode.LATEST_ONLY)
+    received = []
+    comm.callback = received.append
+    # 同一次读取中的三帧按到达顺序合并为一帧，后到的字段覆盖先到的
+    comm._process_data(burst)
+    comm._process_data(b'{"n":4}')
+    assert [{k: v for k, v in frame.items() if k != 'recv_ns'} for frame in received] == \
+        [{'a': 1, 'b': 3, 'n': 3, 'seq': 2}, {'n': 4, 'seq': 3}]
+    assert comm.get_latest_data()['n'] == 4
+    stats = comm.get_stats()
+    delivery = stats['delivery']
+    assert (delivery['frames_received'], delivery['frames_delivered'], delivery['frames_collapsed'],
+            delivery['frames_superseded'], delivery['burst_reads'], delivery['max_burst']) == (4, 2, 2, 2, 1, 3)
+    # 被合并的帧不计为序号缺口
+    assert stats['timing']['frames_collapsed'] == 2 and stats['timing']['frames_missing'] == 0
+    
+    # 逐帧交付模式下同样的突发只统计被覆盖的帧，不合并
+    comm = SerialComm(port=None)
+    received = []
+    comm.callback = received.append
+    comm._process_data(burst)
+    assert [frame['n'] for frame in received] == [1, 2, 3]
+    delivery = comm.get_stats()['delivery']
+    assert (delivery['frames_collapsed'], delivery['frames_superseded'], delivery['burst_reads']) == (0, 2, 1)
+    print("✓ 突发帧合并为最新状态，合并计数正确")
+    return True
+
 def main():
     """主函数"""
     print("===== Pika SDK 测试 =====")
@@ -139,6 +908,78 @@ def main():
     # 测试相机模块
     test_camera_modules()
     
+    # 测试帧扫描器
+    test_frame_scanner()
+    
+    # 测试快速解码器
+    test_fast_decoder()
+    
+    # 测试虚拟设备
+    test_emulator()
+    
+    # 测试数据帧订阅
+    test_subscription()
+    
+    # 测试回调分发
+    test_dispatcher()
+    
+    # 测试遥测快照
+    test_snapshot()
+    
+    # 测试共享内存遥测历史
+    test_shared_history()
+    
+    # 测试USB转串口低延迟设置
+    test_usb_latency()
+    
+    # 测试二进制遥测协议
+    test_binary_protocol()
+    
+    # 测试损坏数据流的重新同步
+    test_resync()
+    
+    # 测试夹爪开合距离换算
+    test_kinematics()
+    
+    # 测试遥操作桥接
+    test_teleop()
+    
+    # 测试夹爪轨迹执行
+    test_trajectory()
+    
+    # 测试轮询模式回放
+    test_replay_polling()
+    
+    # 测试子进程读取模式
+    test_process_reader()
+    
+    # 测试帧序号间断统计
+    test_timing_stats()
+    
+    # 测试命令写线程
+    test_command_writer()
+    
+    # 测试自动重连
+    test_auto_reconnect()
+    
+    # 测试asyncio异步接口
+    test_aio()
+    
+    # 测试Sense批量命令
+    test_sense_commands()
+    
+    # 测试录制与回放
+    test_record_replay()
+    
+    # 测试串口反应器
+    test_reactor()
+    
+    # 测试遥测历史
+    test_history()
+    
+    # 测试LATEST_ONLY交付模式
+    test_latest_only()
+    
     print("\n===== 测试完成 =====")
     print("注意：这只是基本功能测试，未实际连接设备进行测试")
     print("要进行实际设备测试，请运行 examples 目录中的示例程序")
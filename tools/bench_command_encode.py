@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+命令编码与写入微基准测试工具
+作用：对比逐条构建bytearray的旧编码方式与预编译struct.Struct编码的耗时，
+      以及逐条发送与send_commands批量发送经伪终端(pty)写入的耗时
+使用方法：python3 tools/bench_command_encode.py --count 20000
+"""
+
+import os
+import sys
+import time
+import tty
+import struct
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm, encode_command
+
+ENABLE = 11
+POSITION_CTRL = 22
+
+
+def legacy_encode(command_type, value=0, big_endian=False):
+    """
+    旧版send_command中的编码方式
+    """
+    data = bytearray()
+    data.append(command_type)
+    if big_endian:
+        data.extend(bytearray(struct.pack('>i', value)))
+    else:
+        data.extend(bytearray(struct.pack('<f', value)))
+    data.extend(b'\r\n')
+    return data
+
+
+def time_per_call(func, count):
+    """
+    返回func每次调用的平均耗时（微秒）
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令编码与写入微基准测试")
+    parser.add_argument('--count', type=int, default=20000, help="每项测试的调用次数")
+    args = parser.parse_args()
+    count = args.count
+
+    print("编码耗时（微秒/条）")
+    print(f"  旧版bytearray拼接: {time_per_call(lambda i: legacy_encode(POSITION_CTRL, i * 1e-4), count):.3f}")
+    print(f"  预编译struct.Struct: {time_per_call(lambda i: encode_command(POSITION_CTRL, i * 1e-4), count):.3f}")
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    comm = SerialComm(port=os.ttyname(slave))
+    if not comm.connect():
+        raise RuntimeError("无法打开伪终端")
+
+    def drain():
+        try:
+            while os.read(master, 65536):
+                pass
+        except BlockingIOError:
+            pass
+    os.set_blocking(master, False)
+
+    def single(i):
+        comm.send_command(ENABLE)
+        comm.send_command(POSITION_CTRL, i * 1e-4)
+        if i % 256 == 0:
+            drain()
+
+    def batched(i):
+        comm.send_commands([(ENABLE, 0), (POSITION_CTRL, i * 1e-4)])
+        if i % 256 == 0:
+            drain()
+
+    write_count = max(1, count // 4)
+    print("编码+写入耗时（微秒/组，每组ENABLE+POSITION_CTRL）")
+    print(f"  逐条send_command: {time_per_call(single, write_count):.3f}")
+    print(f"  批量send_commands: {time_per_call(batched, write_count):.3f}")
+
+    comm.disconnect()
+    os.close(master)
+    os.close(slave)
+
+
+if __name__ == "__main__":
+    main()
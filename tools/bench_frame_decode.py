@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+遥测帧解析吞吐量基准测试工具
+作用：对比通用JSON解析路径、Sense/Gripper快速解码器与二进制协议(pika.binary_protocol)的每秒解析帧数
+使用方法：python3 tools/bench_frame_decode.py --frames 50000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm
+from pika.telemetry import decode_gripper_frame, decode_sense_frame
+from pika.binary_protocol import encode_gripper_frame, encode_sense_frame
+
+GRIPPER_FRAME = (b'{\r\n"motor":{\r\n"Speed":%.3f,\r\n"Current":%d,\r\n"Position":%.4f\r\n}\r\n,\r\n'
+                 b'"motorstatus":{\r\n"Voltage":24.12,\r\n"DriverTemp":35,\r\n"MotorTemp":37,\r\n'
+                 b'"Status":"0x00",\r\n"BusCurrent":120\r\n}\r\n\r\n}\r\n')
+SENSE_FRAME = (b'{\r\n"Command":0,\r\n"AS5047":{\r\n"angle":%.2f,\r\n"rad":%.4f\r\n},\r\n\r\n'
+               b'"IMU":{\r\n"acc":[0.01,-0.02,9.81],\r\n"gyr":[0.001,0.002,-0.003],\r\n'
+               b'"pitch":1.20,\r\n"roll":-0.50,\r\n"yaw":88.00\r\n}\r\n\r\n}\r\n')
+
+
+def build_stream(device, count, binary=False):
+    """
+    构造包含count个帧的字节流
+    """
+    if binary and device == 'gripper':
+        return b''.join(encode_gripper_frame(i * 0.001, -i % 500, i * 0.0001, 24.12, 35, 37, 0, 120)
+                        for i in range(count))
+    if binary:
+        return b''.join(encode_sense_frame(0, i * 0.01, i * 0.0002, (0.01, -0.02, 9.81), (0.001, 0.002, -0.003),
+                                           1.2, -0.5, 88.0) for i in range(count))
+    if device == 'gripper':
+        return b''.join(GRIPPER_FRAME % (i * 0.001, -i % 500, i * 0.0001) for i in range(count))
+    return b''.join(SENSE_FRAME % (i * 0.01, i * 0.0002) for i in range(count))
+
+
+def run(device, decoder, stream, count, chunk):
+    """
+    以chunk字节为单位将数据流喂给SerialComm，返回每秒解析帧数
+    """
+    comm = SerialComm(port=None, decoder=decoder)
+    received = []
+    comm.callback = received.append
+    start = time.perf_counter()
+    for offset in range(0, len(stream), chunk):
+        comm._process_data(stream[offset:offset + chunk])
+    elapsed = time.perf_counter() - start
+    if len(received) != count:
+        raise RuntimeError(f"解析帧数不一致: {len(received)} != {count}")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比通用JSON解析、快速解码器与二进制协议的吞吐量")
+    parser.add_argument('--frames', type=int, default=50000, help="每项测试的帧数")
+    parser.add_argument('--chunk', type=int, default=256, help="每次读取的字节数")
+    args = parser.parse_args()
+
+    decoders = {'gripper': decode_gripper_frame, 'sense': decode_sense_frame}
+    print(f"{'设备':<10}{'通用JSON(帧/s)':>18}{'快速解码(帧/s)':>18}{'加速比':>10}"
+          f"{'二进制(帧/s)':>16}{'加速比':>10}{'帧长(JSON/二进制)':>20}")
+    for device, decoder in decoders.items():
+        stream = build_stream(device, args.frames)
+        binary_stream = build_stream(device, args.frames, binary=True)
+        generic = run(device, None, stream, args.frames, args.chunk)
+        fast = run(device, decoder, stream, args.frames, args.chunk)
+        binary = run(device, None, binary_stream, args.frames, args.chunk)
+        sizes = f"{len(stream) // args.frames}/{len(binary_stream) // args.frames}"
+        print(f"{device:<10}{generic:>18.0f}{fast:>18.0f}{fast / generic:>10.2f}x"
+              f"{binary:>16.0f}{binary / generic:>10.2f}x{sizes:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+夹爪开合距离换算微基准测试工具
+作用：1. 对比旧版get_gripper_distance（每次两次连杆公式计算）、查找表插值与NumPy向量化换算的耗时，
+         以及查找表插值相对连杆公式的最大误差
+      2. 对比旧版set_gripper_distance中的逐次二分查找与逆查找表（标量/向量化）的耗时和误差
+使用方法：python3 tools/bench_kinematics.py --count 200000 --history 100000 --json result.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.kinematics import get_kinematics, GRIPPER_LINKAGE
+
+
+def legacy_get_distance(angle):
+    """
+    旧版Gripper/Sense中的get_distance
+    """
+    angle = (180.0 - 43.99) / 180.0 * math.pi - angle
+    height = 0.0325 * math.sin(angle)
+    width_d = 0.0325 * math.cos(angle)
+    width = math.sqrt(0.058**2 - (height - 0.01456)**2) + width_d
+    return width*1000
+
+
+def legacy_gripper_distance(angle):
+    """
+    旧版get_gripper_distance中的换算
+    """
+    return (legacy_get_distance(angle) - legacy_get_distance(0)) * 2
+
+
+def legacy_bisect(target_gripper_distance_mm):
+    """
+    旧版set_gripper_distance中的二分查找（每次调用重新计算零点和范围）
+    """
+    get_distance_0 = legacy_get_distance(0)
+    target_width_mm = target_gripper_distance_mm / 2 + get_distance_0
+    low_angle = 0.0
+    high_angle = (180.0 - 43.99) / 180.0 * math.pi
+    min_distance = (legacy_get_distance(low_angle) - get_distance_0) * 2
+    max_distance = (legacy_get_distance(high_angle) - get_distance_0) * 2
+    if not (min_distance <= target_gripper_distance_mm <= max_distance):
+        return None
+    for _ in range(1000):
+        mid_angle = (low_angle + high_angle) / 2
+        current_width_mm = legacy_get_distance(mid_angle)
+        if abs(current_width_mm - target_width_mm) < 0.01:
+            return mid_angle
+        if current_width_mm < target_width_mm:
+            low_angle = mid_angle
+        else:
+            high_angle = mid_angle
+        if (high_angle - low_angle) < 0.00001:
+            return mid_angle
+    return None
+
+
+def time_per_call(func, angles):
+    """
+    返回func每次调用的平均耗时（微秒）
+    """
+    start = time.perf_counter()
+    for angle in angles:
+        func(angle)
+    return (time.perf_counter() - start) / len(angles) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="夹爪开合距离换算微基准测试")
+    parser.add_argument('--count', type=int, default=200000, help="标量换算的调用次数")
+    parser.add_argument('--history', type=int, default=100000, help="历史数据换算的记录数")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+
+    kinematics = get_kinematics(GRIPPER_LINKAGE)
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(0.0, kinematics.max_angle, args.count).tolist()
+
+    scalar = {
+        'legacy_us': time_per_call(legacy_gripper_distance, angles),
+        'exact_us': time_per_call(kinematics.angle_to_distance_exact, angles),
+        'table_us': time_per_call(kinematics.angle_to_distance, angles),
+    }
+
+    # 误差：在查找表相邻两点之间密集取样
+    dense = np.linspace(0.0, kinematics.max_angle, 1000003)
+    exact = np.array([legacy_gripper_distance(a) for a in dense[::97]])
+    table = np.array([kinematics.angle_to_distance(a) for a in dense[::97]])
+    vector = kinematics.angles_to_distances(dense[::97])
+    error = {
+        'table_max_mm': float(np.max(np.abs(table - exact))),
+        'vectorised_max_mm': float(np.max(np.abs(vector - exact))),
+    }
+
+    history = rng.uniform(0.0, kinematics.max_angle, args.history)
+    start = time.perf_counter()
+    [legacy_gripper_distance(a) for a in history.tolist()]
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    kinematics.angles_to_distances(history)
+    vector_s = time.perf_counter() - start
+    batch = {
+        'records': args.history,
+        'loop_ms': loop_s * 1e3,
+        'vectorised_ms': vector_s * 1e3,
+    }
+
+    targets = rng.uniform(0.0, kinematics.max_distance, args.count // 10).tolist()
+    inverse = {
+        'bisect_us': time_per_call(legacy_bisect, targets),
+        'table_us': time_per_call(kinematics.distance_to_angle, targets),
+    }
+    checks = np.linspace(0.0, kinematics.max_distance, 20001)
+    legacy_angles = np.array([legacy_bisect(d) for d in checks])
+    table_angles = np.array([kinematics.distance_to_angle(d) for d in checks])
+    vector_angles = kinematics.distances_to_angles(checks)
+    inverse.update(
+        bisect_distance_error_mm=float(np.max(np.abs(kinematics.angles_to_distances(legacy_angles) - checks))),
+        table_distance_error_mm=float(np.max(np.abs(kinematics.angles_to_distances(table_angles) - checks))),
+        vectorised_distance_error_mm=float(np.max(np.abs(kinematics.angles_to_distances(vector_angles) - checks))),
+        table_vs_bisect_rad=float(np.max(np.abs(table_angles - legacy_angles))),
+    )
+    trajectory = rng.uniform(0.0, kinematics.max_distance, args.history)
+    start = time.perf_counter()
+    [legacy_bisect(d) for d in trajectory[:max(1, args.history // 10)].tolist()]
+    inverse['bisect_loop_ms'] = (time.perf_counter() - start) * 1e3 * 10
+    start = time.perf_counter()
+    kinematics.distances_to_angles(trajectory)
+    inverse['vectorised_ms'] = (time.perf_counter() - start) * 1e3
+
+    print("标量换算耗时（微秒/次）")
+    print(f"  旧版（两次连杆公式）: {scalar['legacy_us']:.3f}")
+    print(f"  连杆公式（缓存零点）: {scalar['exact_us']:.3f}")
+    print(f"  查找表插值:           {scalar['table_us']:.3f}")
+    print(f"最大误差(mm): 查找表 {error['table_max_mm']:.2e}  向量化 {error['vectorised_max_mm']:.2e}")
+    print(f"历史数据换算（{args.history}条）: 逐条 {batch['loop_ms']:.2f} ms  向量化 {batch['vectorised_ms']:.2f} ms")
+    print("\n逆换算耗时（微秒/次）")
+    print(f"  旧版二分查找: {inverse['bisect_us']:.3f}")
+    print(f"  逆查找表插值: {inverse['table_us']:.3f}")
+    print(f"开合距离误差(mm): 二分查找 {inverse['bisect_distance_error_mm']:.2e}  "
+          f"查找表 {inverse['table_distance_error_mm']:.2e}  向量化 {inverse['vectorised_distance_error_mm']:.2e}")
+    print(f"查找表与二分查找的最大弧度差(rad): {inverse['table_vs_bisect_rad']:.2e}")
+    print(f"轨迹换算（{args.history}点）: 逐点二分（按1/10估算） {inverse['bisect_loop_ms']:.2f} ms  "
+          f"向量化 {inverse['vectorised_ms']:.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'kinematics',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'scalar': scalar,
+                'error': error,
+                'batch': batch,
+                'inverse': inverse,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
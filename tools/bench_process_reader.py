@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+子进程读取基准测试工具
+作用：在主进程存在占用GIL的纯Python计算负载时，对比进程内读取线程与子进程读取(pika.process_reader)
+      的帧时间戳延迟和控制回路读到的数据年龄；虚拟设备(pika.emulator)运行在独立进程中
+使用方法：python3 tools/bench_process_reader.py --load-threads 0,2,4 --rate 500 --duration 3 --json result.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.gripper import Gripper
+from pika.emulator import GripperEmulator
+from pika.process_reader import ProcessSerialComm, DeviceType
+from pika.metrics import percentile
+
+MODES = ('thread', 'process')
+
+
+def emulator_process(conn, rate):
+    """
+    虚拟设备子进程：收到开始信号后运行指定时长并回传发送时间戳
+    """
+    emulator = GripperEmulator(rate=rate, embed_counter=True)
+    conn.send(emulator.start())
+    duration = conn.recv()
+    first = emulator.frames_sent
+    time.sleep(duration)
+    last = emulator.frames_sent
+    conn.send((first, last, [emulator.get_send_ns(c) for c in range(first, last)]))
+    conn.recv()
+    emulator.stop()
+
+
+def gil_load(stop_event):
+    """
+    纯Python计算负载，持续占用GIL
+    """
+    while not stop_event.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i
+
+
+def control_loop(gripper, period, stop_event, samples):
+    """
+    模拟控制回路：按固定周期读取快照，记录读到的帧计数和读取时间
+    """
+    next_time = time.monotonic()
+    while not stop_event.is_set():
+        snapshot = gripper.snapshot()
+        if snapshot.seq is not None:
+            samples.append((int(snapshot.BusCurrent), time.monotonic_ns()))
+        next_time += period
+        delay = next_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_once(mode, load_threads, rate, duration, control_hz):
+    """
+    在指定读取模式和负载线程数下运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=emulator_process, args=(child_conn, rate))
+    process.daemon = True
+    process.start()
+    port = conn.recv()
+
+    serial_comm = ProcessSerialComm(port, DeviceType.GRIPPER) if mode == 'process' else None
+    gripper = Gripper(port, serial_comm=serial_comm)
+    if not gripper.connect():
+        raise RuntimeError(f"无法打开虚拟设备: {port}")
+    time.sleep(0.2)
+
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=gil_load, args=(stop_event,)) for _ in range(load_threads)]
+    samples = []
+    threads.append(threading.Thread(target=control_loop, args=(gripper, 1.0 / control_hz, stop_event, samples)))
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    conn.send(duration)
+    first, last, send_ns = conn.recv()
+    time.sleep(0.2)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    history = gripper.get_history()
+    gripper.disconnect()
+    conn.send(None)
+    process.join(timeout=2.0)
+
+    # 帧时间戳延迟：读取端打上recv_ns的时间减去设备发送时间
+    stamp_latencies = []
+    seen = set()
+    for counter, recv_ns in zip(history['BusCurrent'].astype(int).tolist(), history['recv_ns'].tolist()):
+        if first <= counter < last and counter not in seen:
+            seen.add(counter)
+            sent = send_ns[counter - first]
+            if sent is not None:
+                stamp_latencies.append((recv_ns - sent) / 1e6)
+    stamp_latencies.sort()
+
+    # 数据年龄：控制回路读取时刻减去所读帧的发送时间
+    ages = []
+    for counter, read_ns in samples:
+        if first <= counter < last:
+            sent = send_ns[counter - first]
+            if sent is not None:
+                ages.append((read_ns - sent) / 1e6)
+    ages.sort()
+
+    return {
+        'mode': mode,
+        'load_threads': load_threads,
+        'rate_hz': rate,
+        'frames_sent': last - first,
+        'frames_received': len(seen),
+        'control_samples': len(ages),
+        'stamp_ms_p50': percentile(stamp_latencies, 50),
+        'stamp_ms_p99': percentile(stamp_latencies, 99),
+        'stamp_ms_max': stamp_latencies[-1] if stamp_latencies else float('nan'),
+        'age_ms_p50': percentile(ages, 50),
+        'age_ms_p99': percentile(ages, 99),
+        'age_ms_max': ages[-1] if ages else float('nan'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比进程内读取线程与子进程读取在GIL负载下的延迟")
+    parser.add_argument('--load-threads', default='0,2,4', help="GIL负载线程数列表，逗号分隔")
+    parser.add_argument('--modes', default=','.join(MODES), help="读取模式，逗号分隔: thread,process")
+    parser.add_argument('--rate', type=float, default=500.0, help="设备帧率(Hz)")
+    parser.add_argument('--control-hz', type=float, default=200.0, help="控制回路频率(Hz)")
+    parser.add_argument('--duration', type=float, default=3.0, help="每项测试时长(秒)")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"未知的读取模式: {mode}")
+    loads = [int(n) for n in args.load_threads.split(',') if n.strip()]
+
+    results = []
+    print(f"{'模式':<9}{'负载线程':>8}{'收/发':>16}{'时间戳p50':>11}{'时间戳p99':>11}{'时间戳max':>11}"
+          f"{'年龄p50':>9}{'年龄p99':>9}{'年龄max':>9}")
+    for load_threads in loads:
+        for mode in modes:
+            r = run_once(mode, load_threads, args.rate, args.duration, args.control_hz)
+            results.append(r)
+            print(f"{r['mode']:<9}{r['load_threads']:>8}{r['frames_received']:>8}/{r['frames_sent']:<7}"
+                  f"{r['stamp_ms_p50']:>11.3f}{r['stamp_ms_p99']:>11.3f}{r['stamp_ms_max']:>11.3f}"
+                  f"{r['age_ms_p50']:>9.3f}{r['age_ms_p99']:>9.3f}{r['age_ms_max']:>9.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'process_reader',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'rate_hz': args.rate,
+                'control_hz': args.control_hz,
+                'duration': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多设备读取模型基准测试工具
+作用：随设备数量增加，对比每台设备独立读取线程（轮询/事件驱动）与共享串口反应器(pika.reactor)
+      的CPU占用和帧延迟；虚拟设备(pika.emulator)运行在独立进程中
+使用方法：python3 tools/bench_reactor.py --devices 1,2,4,8 --rate 500 --duration 3 --json result.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.gripper import Gripper
+from pika.serial_comm import ReadMode
+from pika.reactor import SerialReactor
+from pika.emulator import GripperEmulator
+from pika.metrics import percentile
+
+MODELS = ('polling', 'event', 'reactor')
+
+
+def emulator_process(conn, count, rate):
+    """
+    虚拟设备子进程：启动count台虚拟Gripper，收到开始信号后运行指定时长并回传发送时间戳
+    """
+    emulators = [GripperEmulator(rate=rate, embed_counter=True) for _ in range(count)]
+    conn.send([emulator.start() for emulator in emulators])
+    duration = conn.recv()
+    first = [emulator.frames_sent for emulator in emulators]
+    time.sleep(duration)
+    last = [emulator.frames_sent for emulator in emulators]
+    send_ns = [[emulator.get_send_ns(c) for c in range(first[i], last[i])] for i, emulator in enumerate(emulators)]
+    conn.send((first, last, send_ns))
+    conn.recv()
+    for emulator in emulators:
+        emulator.stop()
+
+
+def run_once(model, count, rate, duration):
+    """
+    在指定读取模型和设备数量下运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=emulator_process, args=(child_conn, count, rate))
+    process.daemon = True
+    process.start()
+    ports = conn.recv()
+
+    baseline_threads = threading.active_count()
+    reactor = SerialReactor() if model == 'reactor' else None
+    devices = []
+    visible = [[] for _ in range(count)]
+    for index, port in enumerate(ports):
+        device = Gripper(port, history_capacity=0, reactor=reactor)
+        if model == 'polling':
+            device.serial_comm.read_mode = ReadMode.POLLING
+        devices.append(device)
+    for index, device in enumerate(devices):
+        if not device.serial_comm.connect():
+            raise RuntimeError(f"无法打开虚拟设备: {ports[index]}")
+        records = visible[index]
+
+        def on_frame(frame, device=device, records=records):
+            device._data_callback(frame)
+            records.append((frame['motorstatus']['BusCurrent'], time.monotonic_ns()))
+
+        device.serial_comm.start_reading_thread(callback=on_frame)
+        device.is_connected = True
+    time.sleep(0.2)
+    for records in visible:
+        records.clear()
+
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    conn.send(duration)
+    first, last, send_ns = conn.recv()
+    time.sleep(0.2)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    threads = threading.active_count() - baseline_threads
+
+    for device in devices:
+        device.disconnect()
+    if reactor is not None:
+        reactor.close()
+    conn.send(None)
+    process.join(timeout=2.0)
+
+    latencies = []
+    frames_sent = frames_received = 0
+    for index in range(count):
+        seen = set()
+        for counter, visible_ns in visible[index]:
+            if not first[index] <= counter < last[index] or counter in seen:
+                continue
+            seen.add(counter)
+            sent = send_ns[index][counter - first[index]]
+            if sent is not None:
+                latencies.append((visible_ns - sent) / 1e6)
+        frames_sent += last[index] - first[index]
+        frames_received += len(seen)
+    latencies.sort()
+    processed = sum(len(records) for records in visible)
+
+    return {
+        'model': model,
+        'devices': count,
+        'rate_hz': rate,
+        'reader_threads': threads,
+        'frames_sent': frames_sent,
+        'frames_received': frames_received,
+        'cpu_percent': cpu / wall * 100.0,
+        'cpu_us_per_frame': cpu / processed * 1e6 if processed else float('nan'),
+        'latency_ms_p50': percentile(latencies, 50),
+        'latency_ms_p99': percentile(latencies, 99),
+        'latency_ms_p999': percentile(latencies, 99.9),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比独立读取线程与共享串口反应器")
+    parser.add_argument('--devices', default='1,2,4,8', help="设备数量列表，逗号分隔")
+    parser.add_argument('--models', default=','.join(MODELS), help="读取模型，逗号分隔: polling,event,reactor")
+    parser.add_argument('--rate', type=float, default=500.0, help="每台设备的帧率(Hz)")
+    parser.add_argument('--duration', type=float, default=3.0, help="每项测试时长(秒)")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    for model in models:
+        if model not in MODELS:
+            parser.error(f"未知的读取模型: {model}")
+    counts = [int(c) for c in args.devices.split(',') if c.strip()]
+
+    results = []
+    print(f"{'模型':<9}{'设备数':>6}{'线程':>6}{'收/发':>16}{'CPU%':>8}{'us/帧':>8}"
+          f"{'p50(ms)':>9}{'p99(ms)':>9}{'p999(ms)':>10}")
+    for count in counts:
+        for model in models:
+            r = run_once(model, count, args.rate, args.duration)
+            results.append(r)
+            print(f"{r['model']:<9}{r['devices']:>6}{r['reader_threads']:>6}"
+                  f"{r['frames_received']:>8}/{r['frames_sent']:<7}{r['cpu_percent']:>8.1f}"
+                  f"{r['cpu_us_per_frame']:>8.1f}{r['latency_ms_p50']:>9.3f}{r['latency_ms_p99']:>9.3f}"
+                  f"{r['latency_ms_p999']:>10.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'reactor',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'rate_hz': args.rate,
+                'duration': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
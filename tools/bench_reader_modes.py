@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口读取线程模式基准测试工具
+作用：通过伪终端(pty)模拟设备，对比事件驱动模式与1ms轮询模式的CPU占用和帧延迟
+使用方法：python3 tools/bench_reader_modes.py --rate 200 --duration 5
+"""
+
+import os
+import sys
+import time
+import tty
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm, ReadMode
+from pika.metrics import percentile
+
+FRAME_TEMPLATE = (b'{\r\n"motor":{\r\n"Speed":%d,\r\n"Current":0,\r\n"Position":0.0\r\n}\r\n,\r\n'
+                  b'"motorstatus":{\r\n"Voltage":24.0,\r\n"DriverTemp":30,\r\n"MotorTemp":30,\r\n'
+                  b'"Status":"0x00",\r\n"BusCurrent":0\r\n}\r\n\r\n}\r\n')
+
+
+def run_mode(read_mode, rate, duration, idle):
+    """
+    在指定读取模式下运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    master, slave = os.openpty()
+    tty.setraw(master)
+    comm = SerialComm(port=os.ttyname(slave), read_mode=read_mode)
+    if not comm.connect():
+        raise RuntimeError("无法打开伪终端")
+
+    write_times = {}
+    latencies = []
+
+    def on_frame(frame):
+        now = time.monotonic_ns()
+        sent = write_times.get(frame['motor']['Speed'])
+        if sent is not None:
+            latencies.append((now - sent) / 1e6)
+
+    comm.start_reading_thread(callback=on_frame)
+    time.sleep(0.2)
+
+    # 空闲阶段：无数据时读取线程的CPU占用
+    cpu_start = time.process_time()
+    time.sleep(idle)
+    idle_cpu = (time.process_time() - cpu_start) / idle * 100.0
+
+    # 负载阶段：按固定速率发送数据帧
+    period = 1.0 / rate
+    count = int(rate * duration)
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    for i in range(count):
+        deadline = start + i * period
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        write_times[i] = time.monotonic_ns()
+        os.write(master, FRAME_TEMPLATE % i)
+    time.sleep(0.2)
+    load_cpu = (time.process_time() - cpu_start) / (time.monotonic() - start) * 100.0
+
+    comm.disconnect()
+    os.close(master)
+    os.close(slave)
+
+    latencies.sort()
+    return {
+        'mode': read_mode,
+        'frames_sent': count,
+        'frames_received': len(latencies),
+        'idle_cpu_percent': idle_cpu,
+        'load_cpu_percent': load_cpu,
+        'latency_ms_p50': percentile(latencies, 50),
+        'latency_ms_p99': percentile(latencies, 99),
+        'latency_ms_max': latencies[-1] if latencies else float('nan'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比串口读取线程的事件驱动模式与轮询模式")
+    parser.add_argument('--rate', type=float, default=200.0, help="发送帧率(Hz)")
+    parser.add_argument('--duration', type=float, default=5.0, help="负载阶段时长(秒)")
+    parser.add_argument('--idle', type=float, default=2.0, help="空闲阶段时长(秒)")
+    args = parser.parse_args()
+
+    print(f"{'模式':<10}{'收/发':>12}{'空闲CPU%':>10}{'负载CPU%':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for read_mode in (ReadMode.POLLING, ReadMode.EVENT):
+        r = run_mode(read_mode, args.rate, args.duration, args.idle)
+        print(f"{r['mode']:<10}{r['frames_received']:>6}/{r['frames_sent']:<5}"
+              f"{r['idle_cpu_percent']:>10.2f}{r['load_cpu_percent']:>10.2f}"
+              f"{r['latency_ms_p50']:>10.3f}{r['latency_ms_p99']:>10.3f}{r['latency_ms_max']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+损坏数据流重新同步基准测试工具
+作用：1. 以虚拟设备(pika.emulator)生成按比例注入损坏的Gripper数据流，对比不检查/检查首个键名时
+         未损坏帧的恢复比例、吞吐量和各类损坏计数
+      2. 以大量花括号组成的噪声行测试扫描耗时随噪声长度的增长，耗时/KB保持不变即为线性
+使用方法：python3 tools/bench_resync.py --frames 20000 --rates 0,0.01,0.05,0.2 --json result.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm
+from pika.emulator import GripperEmulator
+from pika.telemetry import decode_gripper_frame, GRIPPER_FRAME_KEYS
+
+# 噪声行模式
+NOISE_PATTERNS = {
+    'braces': b'{',
+    'key_starts': b'{"',
+    'nested': b'{"a":',
+}
+
+
+def make_comm(use_keys):
+    comm = SerialComm(port=None, decoder=decode_gripper_frame, protocol='json')
+    if use_keys:
+        comm.set_frame_keys(GRIPPER_FRAME_KEYS)
+    return comm
+
+
+def feed(comm, stream, seed):
+    """
+    以随机长度分块喂入数据流，模拟串口读取
+    """
+    rng = random.Random(seed)
+    offset = 0
+    start = time.perf_counter()
+    while offset < len(stream):
+        size = rng.randrange(1, 512)
+        comm._process_data(stream[offset:offset + size])
+        offset += size
+    return time.perf_counter() - start
+
+
+def run_corruption(rate, frames, use_keys, seed):
+    """
+    在指定损坏比例下测试一次
+
+    返回:
+        dict: 测试结果
+    """
+    emulator = GripperEmulator(embed_counter=True, corruption_rate=rate, noise=0.01, seed=seed)
+    stream, corrupted = emulator.generate(frames)
+    comm = make_comm(use_keys)
+    received = set()
+    comm.callback = lambda frame: received.add(frame.get('motorstatus', {}).get('BusCurrent'))
+    elapsed = feed(comm, stream, seed)
+    intact = set(range(frames)) - corrupted
+    result = {
+        'corruption_rate': rate,
+        'start_keys': use_keys,
+        'frames': frames,
+        'frames_corrupted': len(corrupted),
+        'intact_recovered_percent': len(intact & received) / len(intact) * 100.0 if intact else float('nan'),
+        'mb_per_s': len(stream) / elapsed / 1e6,
+    }
+    result.update(comm.get_corruption_stats())
+    return result
+
+
+def run_noise(name, length, use_keys):
+    """
+    以指定噪声行（后接一个正常帧）测试扫描耗时
+
+    返回:
+        dict: 测试结果
+    """
+    pattern = NOISE_PATTERNS[name]
+    emulator = GripperEmulator(embed_counter=True)
+    frame, _ = emulator.generate(1)
+    stream = (pattern * (length // len(pattern) + 1))[:length] + b'\r\n' + frame
+    comm = make_comm(use_keys)
+    received = []
+    comm.callback = received.append
+    start = time.perf_counter()
+    for offset in range(0, len(stream), 64):
+        comm._process_data(stream[offset:offset + 64])
+    elapsed = time.perf_counter() - start
+    return {
+        'pattern': name,
+        'start_keys': use_keys,
+        'noise_bytes': length,
+        'us_per_kb': elapsed / length * 1024 * 1e6,
+        'recovered': len(received) == 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测试损坏数据流的重新同步")
+    parser.add_argument('--frames', type=int, default=20000, help="每项测试的帧数")
+    parser.add_argument('--rates', default='0,0.01,0.05,0.2', help="帧损坏比例列表，逗号分隔")
+    parser.add_argument('--noise', default='1024,4096,16384,65536', help="噪声行长度列表（字节），逗号分隔")
+    parser.add_argument('--seed', type=int, default=1, help="随机数种子")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+    # 损坏帧的JSON解析错误日志不计入测试
+    logging.getLogger("pika.serial_comm").setLevel(logging.CRITICAL)
+
+    corruption_results = []
+    print(f"{'损坏比例':<8}{'首键检查':>8}{'完好帧恢复%':>12}{'MB/s':>8}{'丢弃字节':>10}{'拒绝起始':>9}"
+          f"{'截断重同步':>10}{'字符串损坏':>10}{'超长':>6}{'解析失败':>9}")
+    for rate in [float(r) for r in args.rates.split(',') if r.strip()]:
+        for use_keys in (False, True):
+            r = run_corruption(rate, args.frames, use_keys, args.seed)
+            corruption_results.append(r)
+            print(f"{r['corruption_rate']:<8.2f}{'是' if use_keys else '否':>8}"
+                  f"{r['intact_recovered_percent']:>12.2f}{r['mb_per_s']:>8.2f}{r['bytes_discarded']:>10}"
+                  f"{r['starts_rejected']:>9}{r['frames_resynced']:>10}{r['frames_invalid']:>10}"
+                  f"{r['frames_oversize']:>6}{r['frames_rejected']:>9}")
+
+    noise_results = []
+    print(f"\n{'噪声模式':<12}{'首键检查':>8}{'噪声字节':>10}{'us/KB':>10}{'恢复':>6}")
+    for name in NOISE_PATTERNS:
+        for use_keys in (False, True):
+            for length in [int(n) for n in args.noise.split(',') if n.strip()]:
+                r = run_noise(name, length, use_keys)
+                noise_results.append(r)
+                print(f"{name:<12}{'是' if use_keys else '否':>8}{length:>10}{r['us_per_kb']:>10.1f}"
+                      f"{'是' if r['recovered'] else '否':>6}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'resync',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'frames': args.frames,
+                'corruption': corruption_results,
+                'noise': noise_results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
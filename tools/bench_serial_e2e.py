@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+串口端到端吞吐量与延迟基准测试工具
+作用：通过伪终端虚拟设备(pika.emulator)以逐级提高的帧率驱动SerialComm、Sense和Gripper，
+      统计持续帧率、每帧CPU耗时、丢失/合并帧数，以及从数据写入串口到可通过
+      get_latest_data()等接口读取之间的p50/p99/p999延迟；结果可输出为JSON用于回归对比
+使用方法：python3 tools/bench_serial_e2e.py --rates 100,500,1000,2000 --duration 3 --json result.json
+
+虚拟设备运行在独立进程中，避免其输出线程占用被测进程的CPU和GIL；
+延迟基于两端共享的time.monotonic_ns()时钟计算。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm, DeliveryMode, ReadMode
+from pika.telemetry import decode_gripper_frame
+from pika.emulator import GripperEmulator, SenseEmulator
+from pika.metrics import percentile
+from pika.gripper import Gripper
+from pika.sense import Sense
+
+TARGETS = ('serial', 'gripper', 'sense')
+
+
+def emulator_process(conn, target, rate, noise, corruption_rate):
+    """
+    虚拟设备子进程：返回从端路径，收到开始信号后运行指定时长，再回传发送时间戳
+    """
+    emulator_class = SenseEmulator if target == 'sense' else GripperEmulator
+    emulator = emulator_class(rate=rate, noise=noise, corruption_rate=corruption_rate, embed_counter=True)
+    conn.send(emulator.start())
+    duration = conn.recv()
+    first = emulator.frames_sent
+    time.sleep(duration)
+    last = emulator.frames_sent
+    send_ns = [emulator.get_send_ns(counter) for counter in range(first, last)]
+    conn.send((first, last, send_ns, emulator.get_stats()))
+    conn.recv()
+    emulator.stop()
+
+
+def frame_counter(target, frame):
+    """
+    取出虚拟设备写入帧中的帧计数
+    """
+    if target == 'sense':
+        return frame.get('Command')
+    motorstatus = frame.get('motorstatus')
+    return motorstatus.get('BusCurrent') if motorstatus else None
+
+
+def open_target(target, port, delivery_mode, read_mode):
+    """
+    创建并连接被测对象
+
+    返回:
+        tuple: (被测对象, SerialComm对象)
+    """
+    if target == 'serial':
+        comm = SerialComm(port=port, delivery_mode=delivery_mode, read_mode=read_mode,
+                          decoder=decode_gripper_frame)
+        if not comm.connect():
+            raise RuntimeError(f"无法打开虚拟设备: {port}")
+        comm.start_reading_thread()
+        return comm, comm
+    device_class = Sense if target == 'sense' else Gripper
+    device = device_class(port, delivery_mode=delivery_mode)
+    device.serial_comm.read_mode = read_mode
+    if not device.connect():
+        raise RuntimeError(f"无法打开虚拟设备: {port}")
+    return device, device.serial_comm
+
+
+def run_once(target, rate, duration, delivery_mode, read_mode, noise, corruption_rate):
+    """
+    在指定帧率下运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=emulator_process,
+                                      args=(child_conn, target, rate, noise, corruption_rate))
+    process.daemon = True
+    process.start()
+    port = conn.recv()
+    device, comm = open_target(target, port, delivery_mode, read_mode)
+
+    # 在设备自身的回调处理完成（数据已对getter可见）之后记录时间
+    visible = []
+    inner_callback = comm.callback
+
+    def on_frame(frame):
+        if inner_callback:
+            inner_callback(frame)
+        visible.append((frame_counter(target, frame), time.monotonic_ns()))
+
+    comm.callback = on_frame
+    time.sleep(0.1)
+    visible.clear()
+    collapsed_start = comm.frames_collapsed
+
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    conn.send(duration)
+    first, last, send_ns, emulator_stats = conn.recv()
+    # 等待尾部数据处理完毕
+    time.sleep(0.2)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    frames_processed = len(visible)
+    frames_collapsed = comm.frames_collapsed - collapsed_start
+
+    if target == 'serial':
+        comm.disconnect()
+    else:
+        device.disconnect()
+    conn.send(None)
+    process.join(timeout=2.0)
+
+    latencies = []
+    seen = set()
+    for counter, visible_ns in visible:
+        if counter is None or not first <= counter < last or counter in seen:
+            continue
+        seen.add(counter)
+        sent = send_ns[counter - first]
+        if sent is not None:
+            latencies.append((visible_ns - sent) / 1e6)
+    latencies.sort()
+    frames_sent = last - first
+    received = len(seen)
+
+    return {
+        'target': target,
+        'rate_hz': rate,
+        'delivery_mode': delivery_mode,
+        'read_mode': read_mode,
+        'frames_sent': frames_sent,
+        'frames_received': received,
+        'frames_lost': max(0, frames_sent - received - frames_collapsed),
+        'frames_merged': frames_collapsed,
+        'frames_corrupted': emulator_stats['frames_corrupted'],
+        'frames_per_second': received / duration,
+        'cpu_percent': cpu / wall * 100.0,
+        'cpu_us_per_frame': cpu / frames_processed * 1e6 if frames_processed else float('nan'),
+        'latency_ms_p50': percentile(latencies, 50),
+        'latency_ms_p99': percentile(latencies, 99),
+        'latency_ms_p999': percentile(latencies, 99.9),
+        'latency_ms_max': latencies[-1] if latencies else float('nan'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="串口端到端吞吐量与延迟基准测试")
+    parser.add_argument('--targets', default=','.join(TARGETS), help="被测对象，逗号分隔: serial,gripper,sense")
+    parser.add_argument('--rates', default='100,250,500,1000,2000', help="帧率列表(Hz)，逗号分隔")
+    parser.add_argument('--duration', type=float, default=3.0, help="每个帧率的测试时长(秒)")
+    parser.add_argument('--delivery-mode', default=DeliveryMode.EVERY_FRAME,
+                        choices=(DeliveryMode.EVERY_FRAME, DeliveryMode.LATEST_ONLY), help="数据帧交付模式")
+    parser.add_argument('--read-mode', default=ReadMode.EVENT,
+                        choices=(ReadMode.EVENT, ReadMode.POLLING), help="读取线程模式")
+    parser.add_argument('--noise', type=float, default=0.0, help="虚拟设备数值噪声标准差")
+    parser.add_argument('--corruption', type=float, default=0.0, help="虚拟设备帧损坏概率")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件，'-'表示输出到标准输出")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+    for target in targets:
+        if target not in TARGETS:
+            parser.error(f"未知的被测对象: {target}")
+    rates = [float(r) for r in args.rates.split(',') if r.strip()]
+
+    results = []
+    if args.json != '-':
+        print(f"{'对象':<9}{'帧率':>7}{'收/发':>14}{'丢失':>6}{'合并':>6}{'帧/s':>9}{'CPU%':>7}"
+              f"{'us/帧':>8}{'p50(ms)':>9}{'p99(ms)':>9}{'p999(ms)':>10}")
+    for target in targets:
+        for rate in rates:
+            r = run_once(target, rate, args.duration, args.delivery_mode, args.read_mode,
+                         args.noise, args.corruption)
+            results.append(r)
+            if args.json != '-':
+                print(f"{r['target']:<9}{r['rate_hz']:>7.0f}{r['frames_received']:>7}/{r['frames_sent']:<6}"
+                      f"{r['frames_lost']:>6}{r['frames_merged']:>6}{r['frames_per_second']:>9.1f}"
+                      f"{r['cpu_percent']:>7.1f}{r['cpu_us_per_frame']:>8.1f}{r['latency_ms_p50']:>9.3f}"
+                      f"{r['latency_ms_p99']:>9.3f}{r['latency_ms_p999']:>10.3f}")
+
+    if args.json:
+        report = {
+            'benchmark': 'serial_e2e',
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'duration': args.duration,
+            'results': results,
+        }
+        if args.json == '-':
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
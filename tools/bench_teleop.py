@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+遥操作桥接基准测试工具
+作用：以虚拟Sense/Gripper(pika.emulator)对比旧示例的固定周期轮询方式与遥操作桥接(pika.teleop)
+      从每个Sense帧到达到Gripper发出反映该帧（或更新帧）的命令的延迟、发送抖动和重复命令比例，
+      可同时运行多组
+使用方法：python3 tools/bench_teleop.py --pairs 1,4 --rate 200 --duration 5 --json result.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.sense import Sense
+from pika.gripper import Gripper
+from pika.teleop import TeleopGroup
+from pika.emulator import SenseEmulator, GripperEmulator
+from pika.metrics import percentile
+
+# 旧示例中的轮询周期（秒）
+POLL_PERIOD = 0.03
+
+
+def record_sends(gripper):
+    """
+    记录gripper每次发送设定值命令的时间，返回时间戳列表
+    """
+    sends = []
+    set_motor_angle = gripper.set_motor_angle
+
+    def recording(rad):
+        result = set_motor_angle(rad)
+        sends.append(time.monotonic_ns())
+        return result
+    gripper.set_motor_angle = recording
+    return sends
+
+
+def poll_loop(sense, gripper, stop, counts):
+    """
+    旧示例的轮询方式：每POLL_PERIOD秒读取一次编码器并发送
+    """
+    last_seq = None
+    while not stop.is_set():
+        snapshot = sense.snapshot()
+        gripper.set_motor_angle(snapshot.rad)
+        counts['commands'] += 1
+        if snapshot.seq == last_seq:
+            counts['duplicates'] += 1
+        last_seq = snapshot.seq
+        time.sleep(POLL_PERIOD)
+
+
+def frame_latencies(recv_ns, sends):
+    """
+    计算每个Sense帧到达后第一次发送命令的延迟(ms)，测试结束前未被反映的帧不计入
+    """
+    sends = np.asarray(sends, dtype=np.int64)
+    index = np.searchsorted(sends, recv_ns)
+    valid = index < len(sends)
+    return ((sends[index[valid]] - recv_ns[valid]) / 1e6).tolist()
+
+
+def run_once(method, pairs, rate, duration):
+    """
+    以指定方式和组数运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    emulators = []
+    devices = []
+    for index in range(pairs):
+        sense_emulator = SenseEmulator(rate=rate, sweep_period=2.0 + index * 0.1, sweep_amplitude=1.5)
+        gripper_emulator = GripperEmulator(rate=rate)
+        emulators += [sense_emulator, gripper_emulator]
+        sense = Sense(sense_emulator.start(), history_capacity=int(rate * (duration + 2)) + 1024)
+        gripper = Gripper(gripper_emulator.start(), history_capacity=0)
+        if not sense.connect() or not gripper.connect():
+            raise RuntimeError("无法连接虚拟设备")
+        devices.append((sense, gripper))
+
+    sends = [record_sends(gripper) for _, gripper in devices]
+    latencies = []
+    jitter = 0.0
+    commands = duplicates = frames = 0
+    try:
+        start_ns = time.monotonic_ns()
+        if method == 'polling':
+            stop = threading.Event()
+            counts = [{'commands': 0, 'duplicates': 0} for _ in devices]
+            threads = [threading.Thread(target=poll_loop, args=(sense, gripper, stop, counts[i]), daemon=True)
+                       for i, (sense, gripper) in enumerate(devices)]
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            commands = sum(c['commands'] for c in counts)
+            duplicates = sum(c['duplicates'] for c in counts)
+        else:
+            group = TeleopGroup()
+            for sense, gripper in devices:
+                group.add(sense, gripper)
+            group.start()
+            time.sleep(duration)
+            group.stop()
+            commands = sum(bridge.commands for bridge in group.bridges)
+            # 桥接只在收到新帧且设定值变化时发送，变化不超过死区的帧计入suppressed而不发送
+            duplicates = 0
+        for (sense, _), times in zip(devices, sends):
+            recv_ns = sense.get_history()['recv_ns']
+            recv_ns = recv_ns[recv_ns >= start_ns]
+            frames += len(recv_ns)
+            latencies += frame_latencies(recv_ns, times)
+            # 多组时取各组发送间隔标准差的最大值
+            intervals = np.diff(np.asarray(times, dtype=np.int64)) / 1e6
+            if len(intervals) > 1:
+                jitter = max(jitter, float(np.std(intervals)))
+        interval_mean = duration * 1e3 * len(devices) / max(1, commands)
+    finally:
+        for sense, gripper in devices:
+            sense.disconnect()
+            gripper.disconnect()
+        for emulator in emulators:
+            emulator.stop()
+
+    latencies.sort()
+    return {
+        'method': method,
+        'pairs': pairs,
+        'rate': rate,
+        'sense_frames': frames,
+        'commands': commands,
+        'duplicate_percent': duplicates / max(1, commands) * 100.0,
+        'latency_ms_p50': percentile(latencies, 50),
+        'latency_ms_p99': percentile(latencies, 99),
+        'latency_ms_max': latencies[-1] if latencies else float('nan'),
+        'interval_ms_mean': interval_mean,
+        'interval_ms_std': jitter,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比轮询与遥操作桥接的延迟和抖动")
+    parser.add_argument('--pairs', default='1,4', help="Sense/Gripper组数列表，逗号分隔")
+    parser.add_argument('--rate', type=float, default=200.0, help="虚拟Sense帧率(Hz)")
+    parser.add_argument('--duration', type=float, default=5.0, help="每项测试时长(秒)")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+    logging.getLogger("pika").setLevel(logging.WARNING)
+
+    results = []
+    print(f"{'方式':<10}{'组数':>6}{'Sense帧':>9}{'命令数':>8}{'重复%':>8}{'延迟p50':>10}{'延迟p99':>10}"
+          f"{'延迟max':>10}{'间隔均值':>10}{'间隔std':>10}")
+    for pairs in [int(p) for p in args.pairs.split(',') if p.strip()]:
+        for method in ('polling', 'bridge'):
+            r = run_once(method, pairs, args.rate, args.duration)
+            results.append(r)
+            print(f"{r['method']:<10}{r['pairs']:>6}{r['sense_frames']:>9}{r['commands']:>8}"
+                  f"{r['duplicate_percent']:>8.1f}{r['latency_ms_p50']:>10.3f}{r['latency_ms_p99']:>10.3f}"
+                  f"{r['latency_ms_max']:>10.3f}{r['interval_ms_mean']:>10.3f}{r['interval_ms_std']:>10.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'teleop',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'duration': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
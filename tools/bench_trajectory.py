@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+夹爪轨迹执行基准测试工具
+作用：以虚拟Gripper(pika.emulator)对比逐点set_motor_angle + time.sleep的回放方式与
+      Gripper.follow_trajectory（pika.trajectory，按截止时间调度）的实际命令频率、累计漂移、
+      发送间隔抖动和基于Position遥测的跟踪误差
+使用方法：python3 tools/bench_trajectory.py --rates 100,500 --duration 5 --json result.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import platform
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.gripper import Gripper
+from pika.emulator import GripperEmulator
+from pika.trajectory import TrajectoryUnit
+from pika.metrics import percentile
+
+
+def make_trajectory(duration):
+    """
+    生成演示轨迹：每秒一个关键点的开合距离(mm)正弦曲线
+    """
+    times = np.linspace(0.0, duration, int(duration) * 10 + 1)
+    distances = 45.0 + 35.0 * np.sin(times * math.pi)
+    return times, distances
+
+
+def record_sends(gripper):
+    """
+    记录gripper每次发送设定值命令的时间，返回时间戳列表
+    """
+    sends = []
+    set_motor_angle = gripper.set_motor_angle
+
+    def recording(rad):
+        result = set_motor_angle(rad)
+        sends.append(time.monotonic_ns())
+        return result
+    gripper.set_motor_angle = recording
+    return sends
+
+
+def sleep_loop(gripper, times, angles, rate):
+    """
+    旧的回放方式：按命令频率插值后逐点发送，每次发送后time.sleep一个周期
+    """
+    period = 1.0 / rate
+    ticks = np.arange(int(times[-1] * rate) + 1) / rate
+    for angle in np.interp(ticks, times, angles).tolist():
+        gripper.set_motor_angle(angle)
+        time.sleep(period)
+
+
+def tracking_error(gripper, start_ns, times, angles):
+    """
+    以Position历史计算跟踪误差(rad)，参考值取轨迹在每帧接收时刻的插值
+    """
+    history = gripper.get_history()
+    history = history[(history['recv_ns'] >= start_ns) & (history['recv_ns'] <= start_ns + int(times[-1] * 1e9))]
+    reference = np.interp((history['recv_ns'] - start_ns) / 1e9, times, angles)
+    return np.abs(history['Position'] - reference)
+
+
+def run_once(method, rate, duration, telemetry_rate):
+    """
+    以指定方式和命令频率运行一次测试
+
+    返回:
+        dict: 测试结果
+    """
+    times, distances = make_trajectory(duration)
+    with GripperEmulator(rate=telemetry_rate) as emulator:
+        gripper = Gripper(emulator.port, history_capacity=int(telemetry_rate * (duration + 2)) + 1024)
+        if not gripper.connect():
+            raise RuntimeError("无法连接虚拟设备")
+        try:
+            gripper.enable()
+            angles = gripper.distances_to_angles(distances)
+            # 先移动到轨迹起点，避免起始阶段的误差计入跟踪误差
+            gripper.set_motor_angle(float(angles[0]))
+            time.sleep(0.3)
+            sends = record_sends(gripper)
+            start_ns = time.monotonic_ns()
+            missed = 0
+            if method == 'sleep':
+                sleep_loop(gripper, times, angles, rate)
+            else:
+                run = gripper.follow_trajectory(times, distances, unit=TrajectoryUnit.DISTANCE, rate=rate)
+                run.wait()
+                missed = run.get_stats()['missed_deadlines']
+                start_ns = run.start_ns
+            end_ns = sends[-1]
+            errors = tracking_error(gripper, start_ns, times, angles)
+        finally:
+            gripper.disconnect()
+
+    intervals = np.diff(np.asarray(sends, dtype=np.int64)) / 1e6
+    elapsed = (end_ns - start_ns) / 1e9
+    return {
+        'method': method,
+        'rate': rate,
+        'commands': len(sends),
+        'achieved_rate_hz': (len(sends) - 1) / elapsed if elapsed > 0 else float('nan'),
+        # 最后一个设定值的实际发送时刻相对轨迹终点的偏差
+        'drift_ms': (elapsed - times[-1]) * 1e3,
+        'interval_ms_std': float(np.std(intervals)) if len(intervals) else float('nan'),
+        'interval_ms_p99': percentile(sorted(intervals.tolist()), 99),
+        'missed_deadlines': missed,
+        'tracking_rms_rad': float(np.sqrt(np.mean(errors ** 2))) if len(errors) else float('nan'),
+        'tracking_max_rad': float(np.max(errors)) if len(errors) else float('nan'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比time.sleep回放与截止时间调度的轨迹执行")
+    parser.add_argument('--rates', default='100,500', help="命令频率列表(Hz)，逗号分隔")
+    parser.add_argument('--duration', type=float, default=5.0, help="轨迹时长(秒)")
+    parser.add_argument('--telemetry-rate', type=float, default=200.0, help="虚拟Gripper遥测帧率(Hz)")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+    logging.getLogger("pika").setLevel(logging.WARNING)
+
+    results = []
+    print(f"{'方式':<10}{'频率':>6}{'命令数':>8}{'实际频率':>10}{'漂移ms':>10}{'间隔std':>10}"
+          f"{'间隔p99':>10}{'错过':>6}{'跟踪RMS':>10}{'跟踪max':>10}")
+    for rate in [float(r) for r in args.rates.split(',') if r.strip()]:
+        for method in ('sleep', 'scheduler'):
+            r = run_once(method, rate, args.duration, args.telemetry_rate)
+            results.append(r)
+            print(f"{r['method']:<10}{r['rate']:>6.0f}{r['commands']:>8}{r['achieved_rate_hz']:>10.1f}"
+                  f"{r['drift_ms']:>10.2f}{r['interval_ms_std']:>10.3f}{r['interval_ms_p99']:>10.3f}"
+                  f"{r['missed_deadlines']:>6}{r['tracking_rms_rad']:>10.4f}{r['tracking_max_rad']:>10.4f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'trajectory',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'duration': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
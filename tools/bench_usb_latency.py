@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+USB转串口低延迟设置测试工具
+作用：显示串口对应的USB转串口适配器及当前latency_timer/ASYNC_LOW_LATENCY设置，
+      分别在默认设置和低延迟设置(pika.usb_latency)下测量帧到达间隔，对比批量到达的程度
+使用方法：sudo python3 tools/bench_usb_latency.py --port /dev/ttyUSB0 --duration 5 --json result.json
+      无硬件时可使用 --emulate 以虚拟设备(pika.emulator)演示流程（伪终端没有latency_timer）
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pika.serial_comm import SerialComm
+from pika.metrics import percentile
+
+# 到达间隔小于该值的帧视为与上一帧在同一批中到达（ms）
+BATCH_GAP_MS = 0.5
+
+
+def measure(port, duration, low_latency, latency_timer_ms, restore=True):
+    """
+    在当前设置（low_latency为False）或低延迟设置下测量帧到达间隔，restore为True时结束后恢复原设置
+
+    返回:
+        dict: 生效的设置及到达间隔统计
+    """
+    comm = SerialComm(port=port, low_latency=low_latency)
+    comm.latency_timer_ms = latency_timer_ms
+    if not comm.connect():
+        raise RuntimeError(f"无法打开串口: {port}")
+    settings = comm.get_usb_settings()
+    arrivals = []
+    comm.start_reading_thread(callback=lambda frame: arrivals.append(frame['recv_ns']))
+    time.sleep(0.3)
+    arrivals.clear()
+    time.sleep(duration)
+    comm.stop_reading_thread()
+    stats = comm.get_stats()['delivery']
+    if low_latency and restore:
+        comm.set_low_latency(False)
+    comm.disconnect()
+
+    intervals = sorted((b - a) / 1e6 for a, b in zip(arrivals, arrivals[1:]))
+    batched = sum(1 for interval in intervals if interval < BATCH_GAP_MS)
+    return {
+        'low_latency': low_latency,
+        'adapter': settings['adapter'],
+        'latency_timer_ms': settings['latency_timer_ms'],
+        'async_low_latency': settings['async_low_latency'],
+        'frames': len(arrivals),
+        'rate_hz': len(arrivals) / duration,
+        'interval_ms_p50': percentile(intervals, 50),
+        'interval_ms_p99': percentile(intervals, 99),
+        'interval_ms_max': intervals[-1] if intervals else float('nan'),
+        'batched_percent': batched / len(intervals) * 100.0 if intervals else float('nan'),
+        'max_burst': stats['max_burst'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比默认设置与低延迟设置下的帧到达间隔")
+    parser.add_argument('--port', default='/dev/ttyUSB0', help="串口设备路径")
+    parser.add_argument('--duration', type=float, default=5.0, help="每项测试时长(秒)")
+    parser.add_argument('--latency-timer', type=int, default=SerialComm.LOW_LATENCY_TIMER_MS,
+                        help="低延迟设置下的latency_timer(ms)")
+    parser.add_argument('--keep', action='store_true', help="测试结束后保留低延迟设置，默认恢复原设置")
+    parser.add_argument('--emulate', action='store_true', help="使用虚拟Gripper代替真实设备")
+    parser.add_argument('--json', help="将结果以JSON格式写入指定文件")
+    args = parser.parse_args()
+
+    emulator = None
+    port = args.port
+    if args.emulate:
+        from pika.emulator import GripperEmulator
+        emulator = GripperEmulator(rate=500)
+        port = emulator.start()
+
+    results = []
+    try:
+        for low_latency in (False, True):
+            results.append(measure(port, args.duration, low_latency, args.latency_timer, not args.keep))
+    finally:
+        if emulator is not None:
+            emulator.stop()
+
+    adapter = results[0]['adapter']
+    if adapter is None:
+        print(f"{port} 不是USB转串口设备，无法调整latency_timer")
+    else:
+        print(f"适配器: {adapter['tty']} 驱动={adapter['driver']} "
+              f"VID:PID={adapter['vendor_id']}:{adapter['product_id']} "
+              f"latency_timer={'支持' if adapter['latency_timer_path'] else '不支持'}")
+    print(f"{'设置':<8}{'latency_timer':>14}{'LOW_LATENCY':>12}{'帧率(Hz)':>10}{'间隔p50':>9}"
+          f"{'间隔p99':>9}{'间隔max':>9}{'批量到达%':>10}{'最大批量':>8}")
+    for r in results:
+        print(f"{'低延迟' if r['low_latency'] else '默认':<8}{str(r['latency_timer_ms']):>14}"
+              f"{str(r['async_low_latency']):>12}{r['rate_hz']:>10.1f}{r['interval_ms_p50']:>9.3f}"
+              f"{r['interval_ms_p99']:>9.3f}{r['interval_ms_max']:>9.3f}{r['batched_percent']:>10.1f}"
+              f"{r['max_burst']:>8}")
+    if not args.keep:
+        print("已恢复原设置（使用 --keep 保留低延迟设置）")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'benchmark': 'usb_latency',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'port': port,
+                'duration': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()